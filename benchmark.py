@@ -0,0 +1,287 @@
+# benchmark.py
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# Sama seperti main.py: pastikan impor 'from src...' berfungsi
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import numpy as np
+from settings import *
+from terrain import Terrain
+from grass import Grass
+from neural_network import NeuralNetwork, breed_genomes
+from src.entity.cell import Cell
+from src.simulation.base_simulation import BaseSimulation
+from src.simulation.population import Population
+from src.simulation.food import FoodField
+from src.entity.sensors import ray_directions, ray_points, march_terrain, march_cells
+
+BENCH_SEED = 1234
+# Kolom yang dipakai untuk mencocokkan hasil dengan baseline
+RESULT_KEY = ('name', 'cells', 'grass')
+CSV_FIELDS = ('name', 'cells', 'grass', 'median_ms', 'min_ms', 'per_cell_us', 'repeat')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mengukur jalur panas simulasi (headless) pada beberapa ukuran populasi.")
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="Daftar jumlah sel, dipisah koma.")
+    parser.add_argument("--grass", default=str(JUMLAH_RUMPUT), help="Daftar jumlah rumput, dipisah koma.")
+    parser.add_argument("--repeat", type=int, default=5, help="Pengulangan setiap pengukuran (dilaporkan median dan minimum).")
+    parser.add_argument("--only", default=None, help="Hanya jalankan benchmark yang namanya diawali teks ini (mis. 'cell.').")
+    parser.add_argument("--json", dest="json_file", default=None, help="Simpan hasil ke file JSON.")
+    parser.add_argument("--csv", dest="csv_file", default=None, help="Simpan hasil ke file CSV.")
+    parser.add_argument("--baseline", default=None, help="Bandingkan dengan hasil JSON sebelumnya; keluar dengan kode 1 jika ada yang melambat.")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Batas perlambatan relatif terhadap baseline sebelum dianggap regresi.")
+    return parser.parse_args()
+
+def measure(function, repeat, setup=None):
+    """Menjalankan function sebanyak repeat kali; setup (tidak ikut diukur) dipanggil sebelum setiap putaran."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, min(times) * 1000
+
+class Scenario:
+    """Dunia, sel, dan rumput yang sama untuk semua benchmark pada satu ukuran populasi."""
+    def __init__(self, terrain, num_cells, num_grass):
+        self.terrain = terrain
+        self.rng = random.Random(BENCH_SEED)
+        self.simulation = BaseSimulation(headless=True, seed=BENCH_SEED)
+        self.simulation.terrain = terrain
+        self.cells = [Cell(rng=self.rng) for _ in range(num_cells)]
+        self.simulation.cells = list(self.cells)
+        while len(self.simulation.grass_patches) < num_grass:
+            grass = Grass(terrain, self.rng)
+            if grass.alive:
+                self.simulation.grass_patches.add(grass)
+        self.grass_patches = self.simulation.grass_patches
+        self.saved = [(c.x, c.y, c.angle, c.energy, c.fitness, c.current_speed) for c in self.cells]
+        # Keluaran yang sudah dihitung sekali, agar setiap fase bisa diukur sendiri
+        xs, ys = [c.x for c in self.cells], [c.y for c in self.cells]
+        self.simulation.sensor_grid.rebuild(xs, ys, self.cells)
+        self.simulation.social_grid.rebuild(xs, ys, self.cells)
+        self.targets = [c._find_nearest_grass(self.grass_patches) for c in self.cells]
+        self.inputs = [np.array(c._get_brain_inputs(t, terrain, self.cells, self.simulation.sensor_grid))
+                       for c, t in zip(self.cells, self.targets)]
+        self.outputs = [c.brain.predict(i) for c, i in zip(self.cells, self.inputs)]
+        self.biomes = [terrain.get_biome_id_at(c.x, c.y) for c in self.cells]
+
+    def restore(self):
+        """Mengembalikan keadaan sel agar setiap putaran mengukur keadaan awal yang sama."""
+        for cell, (x, y, angle, energy, fitness, speed) in zip(self.cells, self.saved):
+            cell.x, cell.y, cell.angle, cell.energy, cell.fitness, cell.current_speed = x, y, angle, energy, fitness, speed
+        self.simulation.cells = list(self.cells)
+        self.simulation.population = None
+
+def cell_benchmarks(s):
+    """Cell.update per sel (GUNAKAN_MESIN_VEKTOR = False), total dan per fase."""
+    sim, terrain, cells = s.simulation, s.terrain, s.cells
+
+    def update():
+        xs, ys = [c.x for c in cells], [c.y for c in cells]
+        sim.sensor_grid.rebuild(xs, ys, cells)
+        sim.social_grid.rebuild(xs, ys, cells)
+        for cell in cells:
+            cell.update(s.grass_patches, cells, terrain, sim.sensor_grid, sim.social_grid)
+
+    def sensors():
+        for cell in cells:
+            cell._get_brain_inputs(cell._find_nearest_grass(s.grass_patches), terrain, cells, sim.sensor_grid)
+
+    def predict():
+        for cell, inputs in zip(cells, s.inputs):
+            cell.brain.predict(inputs)
+
+    def move():
+        for cell, outputs, biome in zip(cells, s.outputs, s.biomes):
+            cell._update_state_from_brain(outputs)
+            cell._process_brain_outputs(outputs, biome)
+            cell._move()
+
+    def status():
+        for cell, biome in zip(cells, s.biomes):
+            cell._update_social_fitness(cells, sim.social_grid)
+            cell._update_status(biome)
+            cell._update_legs()
+
+    return [('cell.update', update), ('cell.sensors', sensors), ('cell.predict', predict),
+            ('cell.move', move), ('cell.status', status)]
+
+def population_benchmarks(s):
+    """Population.update (GUNAKAN_MESIN_VEKTOR = True), total dan per fase."""
+    sim, terrain = s.simulation, s.terrain
+    population = Population(s.cells)
+    sim.sensor_grid.rebuild(population.x, population.y)
+    inputs = population._get_brain_inputs(s.grass_patches, terrain, sim.sensor_grid)
+    outputs = population.brains.predict(inputs)
+    biomes = terrain.get_biome_ids(population.x, population.y)
+    saved = {name: getattr(population, name).copy() for name in ('x', 'y', 'angle', 'energy', 'fitness', 'speed', 'state')}
+
+    def restore():
+        for name, value in saved.items():
+            setattr(population, name, value.copy())
+
+    def update():
+        sim.sensor_grid.rebuild(population.x, population.y)
+        population.update(s.grass_patches, terrain, sim.sensor_grid, sim.social_grid)
+
+    def move():
+        population._process_brain_outputs(outputs, biomes)
+        population._move()
+
+    def status():
+        sim.social_grid.rebuild(population.x, population.y)
+        population._update_social_fitness(sim.social_grid)
+        population._update_status(biomes)
+
+    def raycast():
+        # Sensor sinar diukur sendiri agar biayanya terlihat walau SENSOR_SINAR = False
+        ray_cos, ray_sin = ray_directions(population.angle)
+        sample_x, sample_y = ray_points(population.x, population.y, ray_cos, ray_sin)
+        march_terrain(terrain, sample_x, sample_y)
+        march_cells(sim.sensor_grid, population.x, population.y, sample_x, sample_y)
+
+    return [('population.update', update, restore),
+            ('population.sensors', lambda: population._get_brain_inputs(s.grass_patches, terrain, sim.sensor_grid), restore),
+            ('population.raycast', raycast, restore),
+            ('population.predict', lambda: population.brains.predict(inputs), restore),
+            ('population.move', move, restore),
+            ('population.status', status, restore),
+            ('population.grass_hits', lambda: population.find_grass_hits(s.grass_patches), restore)]
+
+def collision_benchmarks(s):
+    sim = s.simulation
+    # Rumput yang dimakan langsung diganti rumput baru seperti saat simulasi (ikut diukur)
+    # Posisi untuk seluruh rumput sekaligus, seperti _spawn_initial_grass (tabel spawn sudah di-cache per terrain)
+    spawn = lambda: FoodField(s.terrain, np.random.default_rng(BENCH_SEED)).take_many(len(s.grass_patches))
+    return [('grass_collision', lambda: [sim._check_grass_collision(cell) for cell in s.cells]),
+            ('food.spawn', spawn)]
+
+def terrain_benchmarks(s):
+    terrain = s.terrain
+    points = np.random.default_rng(BENCH_SEED).uniform(0, 1, (len(s.cells) * JUMLAH_SENSOR_TERRAIN, 2)) * (terrain.width, terrain.height)
+    xs, ys = points[:, 0], points[:, 1]
+    # Satu titik per sensor per sel, seperti satu frame simulasi
+    scalar_points = list(zip(xs.tolist(), ys.tolist()))
+    return [('terrain.get_biome_at', lambda: [terrain.get_biome_at(x, y) for x, y in scalar_points]),
+            ('terrain.get_biome_ids', lambda: terrain.get_biome_ids(xs, ys))]
+
+def evolution_benchmarks(s):
+    rng = random.Random(BENCH_SEED)
+    brains = [cell.brain for cell in s.cells]
+    pairs = [(rng.choice(brains), rng.choice(brains)) for _ in brains]
+    genomes = np.stack([brain.to_genome() for brain in brains]).astype(np.float32)
+    parents = genomes[:max(1, int(len(genomes) * SELECTION_PERCENT))]
+    generator = np.random.default_rng(BENCH_SEED)
+    return [('nn.mutate', lambda: [brain.mutate(MUTATION_RATE, MUTATION_STRENGTH) for brain in brains]),
+            ('nn.crossover', lambda: [NeuralNetwork.crossover(a, b) for a, b in pairs]),
+            ('nn.breed_genomes', lambda: breed_genomes(parents, len(genomes), generator))]
+
+# (suite, bergantung pada jumlah rumput); suite yang tidak bergantung hanya diukur untuk jumlah rumput pertama
+SUITES = [(cell_benchmarks, True), (population_benchmarks, True), (collision_benchmarks, True),
+          (terrain_benchmarks, False), (evolution_benchmarks, False)]
+
+def run_benchmarks(sizes, grass_counts, repeat, only=None):
+    results = []
+
+    def record(name, num_cells, num_grass, function, setup=None):
+        if only and not name.startswith(only):
+            return
+        median_ms, min_ms = measure(function, repeat, setup)
+        results.append({'name': name, 'cells': num_cells, 'grass': num_grass,
+                        'median_ms': round(median_ms, 4), 'min_ms': round(min_ms, 4),
+                        'per_cell_us': round(median_ms * 1000 / num_cells, 4) if num_cells else None,
+                        'repeat': repeat})
+        print(f"{name:<24} sel={num_cells:<6} rumput={num_grass:<6} median {median_ms:10.3f} ms | min {min_ms:10.3f} ms")
+
+    # Dunia dibuat dari seed tetap tanpa file cache, supaya hasil antar mesin sebanding
+    world_seed = BENCH_SEED % 100
+    terrain = Terrain(LEBAR_DUNIA, TINGGI_DUNIA, seed=world_seed, headless=True, use_cache=False)
+    record('terrain.generate_world', 0, 0, lambda: terrain.generate_world(workers=1))
+
+    for num_grass in grass_counts:
+        for num_cells in sizes:
+            scenario = Scenario(terrain, num_cells, num_grass)
+            for suite, uses_grass in SUITES:
+                if not uses_grass and num_grass != grass_counts[0]:
+                    continue
+                for name, function, *setup in suite(scenario):
+                    record(name, num_cells, num_grass, function, setup[0] if setup else scenario.restore)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Mencetak perbandingan dengan baseline; mengembalikan daftar hasil yang melambat."""
+    reference = {tuple(r[k] for k in RESULT_KEY): r for r in baseline}
+    regressions = []
+    print(f"\nPerbandingan dengan baseline (toleransi {tolerance:.0%}):")
+    for result in results:
+        key = tuple(result[k] for k in RESULT_KEY)
+        if key not in reference:
+            continue
+        # Waktu minimum paling sedikit terganggu proses lain, jadi itu yang dibandingkan
+        ratio = result['min_ms'] / max(reference[key]['min_ms'], 1e-9)
+        if ratio > 1 + tolerance:
+            status = "MELAMBAT"
+            regressions.append(result)
+        elif ratio < 1 - tolerance:
+            status = "lebih cepat"
+        else:
+            status = ""
+        print(f"{result['name']:<24} sel={result['cells']:<6} rumput={result['grass']:<6} "
+              f"{reference[key]['min_ms']:10.3f} -> {result['min_ms']:10.3f} ms ({ratio:5.2f}x) {status}")
+    return regressions
+
+def main():
+    args = parse_args()
+    sizes = [int(v) for v in args.sizes.split(',') if v]
+    grass_counts = [int(v) for v in args.grass.split(',') if v]
+    results = run_benchmarks(sizes, grass_counts, max(1, args.repeat), args.only)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'world': [LEBAR_DUNIA, TINGGI_DUNIA],
+        },
+        'results': results,
+    }
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Hasil disimpan ke {args.json_file}")
+    if args.csv_file:
+        with open(args.csv_file, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"✅ Hasil disimpan ke {args.csv_file}")
+
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Gagal memuat baseline: {e}")
+            sys.exit(2)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} pengukuran melambat lebih dari {args.tolerance:.0%}.")
+            sys.exit(1)
+        print("✅ Tidak ada regresi.")
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,8 @@ from settings import *
 class Crystal:
     """Mewakili kristal energi."""
     def __init__(self):
-        self.x = random.randint(0, LEBAR_LAYAR)
-        self.y = random.randint(0, TINGGI_LAYAR)
+        self.x = random.randint(0, LEBAR_DUNIA)
+        self.y = random.randint(0, TINGGI_DUNIA)
 
     def draw(self, screen):
         """Menggambar kristal."""
@@ -7,10 +7,25 @@ from settings import *
 
 class Grass:
     """Mendefinisikan sepetak rumput statis dengan tampilan garis-garis yang unik."""
-    def __init__(self, terrain):
-        # Posisi acak untuk pusat rumpun rumput
-        self.x = random.randint(0, LEBAR_LAYAR - 1)
-        self.y = random.randint(0, TINGGI_LAYAR - 1)
+    def __init__(self, terrain, rng=None):
+        # rng: random.Random milik simulasi (None = modul random global)
+        rng = rng or random
+        # Posisi acak untuk pusat rumpun rumput; helai dibuat dari seed sendiri agar rumput
+        # bisa dibuat ulang persis dari (x, y, seed), mis. saat memutar replay
+        self.reset(terrain, rng.randint(0, LEBAR_DUNIA - 1), rng.randint(0, TINGGI_DUNIA - 1), rng.getrandbits(32))
+
+    @classmethod
+    def at(cls, terrain, x, y, seed):
+        """Membuat ulang rumput yang sama persis dari posisi dan seed-nya."""
+        grass = cls.__new__(cls)
+        grass.reset(terrain, x, y, seed)
+        return grass
+
+    def reset(self, terrain, x, y, seed):
+        """Memindahkan rumput ini ke (x, y, seed); dipakai ulang untuk rumput pengganti tanpa alokasi baru."""
+        self.x = x
+        self.y = y
+        self.seed = seed
         self.biome = terrain.get_biome_at(self.x, self.y)
         
         # Atur status hidup dan kesuburan berdasarkan biome
@@ -22,15 +37,33 @@ class Grass:
             self.thriving = True
 
         self.radius = RADIUS_RUMPUT
-        self.blades = [] # List untuk menyimpan data setiap helai rumput
-        self._generate_blades() # Panggil fungsi untuk membuat helai-helai rumput
+        # Helai dan kotaknya baru dibuat saat pertama digambar, jadi simulasi tanpa layar
+        # (dan rumput yang dimakan sebelum terlihat) tidak pernah membuatnya
+        self._blades = None
+        self._rect = None
+
+    @property
+    def blades(self):
+        """List data setiap helai rumput; dibuat sekali dari seed."""
+        if self._blades is None:
+            self._blades = self._generate_blades()
+        return self._blades
+
+    @property
+    def rect(self):
+        # Helai tidak pernah berubah, jadi kotaknya dihitung sekali
+        if self._rect is None:
+            self._rect = self._blades_rect()
+        return self._rect
 
     def _generate_blades(self):
-        """Membuat dan menyimpan properti setiap helai rumput secara permanen."""
+        """Membuat properti setiap helai rumput (tetap untuk seed yang sama)."""
+        blades = []
         if not self.alive:
-            return
-            
-        num_blades = random.randint(4, 8)
+            return blades
+
+        rng = random.Random(self.seed)
+        num_blades = rng.randint(4, 8)
 
         # Tentukan properti berdasarkan kesuburan rumput
         if self.thriving:
@@ -44,30 +77,41 @@ class Grass:
 
         for _ in range(num_blades):
             # Titik pangkal untuk setiap helai
-            start_x = self.x + random.randint(-self.radius // 2, self.radius // 2)
-            start_y = self.y + random.randint(0, self.radius // 3)
+            start_x = self.x + rng.randint(-self.radius // 2, self.radius // 2)
+            start_y = self.y + rng.randint(0, self.radius // 3)
 
             # Hitung titik ujung dengan sudut dan panjang acak
-            angle = math.radians(random.randint(250, 290))
-            current_length = blade_length * random.uniform(0.8, 1.2)
+            angle = math.radians(rng.randint(250, 290))
+            current_length = blade_length * rng.uniform(0.8, 1.2)
             end_x = start_x + math.cos(angle) * current_length
             end_y = start_y + math.sin(angle) * current_length
             
             # Variasi warna alami
-            color_variation = random.randint(-20, 20)
+            color_variation = rng.randint(-20, 20)
             r = max(0, min(255, base_color[0] + color_variation))
             g = max(0, min(255, base_color[1] + color_variation))
             b = max(0, min(255, base_color[2] + color_variation))
             blade_color = (r, g, b)
             
             # Simpan data helai rumput (titik awal, titik akhir, warna, tebal)
-            self.blades.append(((start_x, start_y), (end_x, end_y), blade_color, line_width))
+            blades.append(((start_x, start_y), (end_x, end_y), blade_color, line_width))
+        return blades
+
+    def _blades_rect(self):
+        """Kotak pembatas semua helai rumput (dipakai renderer untuk menghapus/menggambar ulang)."""
+        if not self.blades:
+            return pygame.Rect(self.x, self.y, 0, 0)
+        xs = [p[0] for start, end, _, _ in self.blades for p in (start, end)]
+        ys = [p[1] for start, end, _, _ in self.blades for p in (start, end)]
+        left, top = math.floor(min(xs)) - 2, math.floor(min(ys)) - 2
+        return pygame.Rect(left, top, math.ceil(max(xs)) - left + 3, math.ceil(max(ys)) - top + 3)
 
-    def draw(self, screen):
-        """Menggambar helai-helai rumput yang sudah disimpan."""
+    def draw(self, screen, offset=(0, 0)):
+        """Menggambar helai-helai rumput yang sudah disimpan; offset = posisi kamera di dunia."""
         if not self.alive:
             return
 
         # Gambar setiap helai rumput dari data yang sudah ada
-        for start_pos, end_pos, color, width in self.blades:
-            pygame.draw.line(screen, color, start_pos, end_pos, width)
\ No newline at end of file
+        ox, oy = offset
+        for (start_x, start_y), (end_x, end_y), color, width in self.blades:
+            pygame.draw.line(screen, color, (start_x - ox, start_y - oy), (end_x - ox, end_y - oy), width)
\ No newline at end of file
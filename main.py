@@ -8,12 +8,12 @@ import os
 # Ini memastikan semua impor 'from src...' berfungsi dengan benar
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from settings import LEBAR_LAYAR, TINGGI_LAYAR
-from terrain import Terrain
+from settings import LEBAR_LAYAR, TINGGI_LAYAR, LEBAR_DUNIA, TINGGI_DUNIA
+from terrain import create_terrain
 
 # Import dari struktur folder baru
 from src.ui.menus import MainMenu, TrainingStartMenu, WorldMenu
-from src.simulation.modes import TrainingMode, SandboxMode
+from src.simulation.modes import TrainingMode, SandboxMode, ReplayMode
 from src.utils.helpers import show_loading_screen
 
 def main():
@@ -22,7 +22,7 @@ def main():
     screen = pygame.display.set_mode((LEBAR_LAYAR, TINGGI_LAYAR))
     
     show_loading_screen(screen, "Memuat Dunia...")
-    main_terrain = Terrain(LEBAR_LAYAR, TINGGI_LAYAR)
+    main_terrain = create_terrain(LEBAR_DUNIA, TINGGI_DUNIA)
 
     app_running = True
     while app_running:
@@ -40,13 +40,16 @@ def main():
         
         elif main_choice == "sandbox":
             game = SandboxMode()
+
+        elif main_choice == "replay":
+            game = ReplayMode()
             
         elif main_choice == "world_menu":
             world_menu = WorldMenu(screen)
             world_choice = world_menu.run()
             if world_choice == "generate_world":
                 show_loading_screen(screen, "Membuat Dunia Baru...")
-                main_terrain = Terrain.create_new_world(LEBAR_LAYAR, TINGGI_LAYAR)
+                main_terrain = type(main_terrain).create_new_world(LEBAR_DUNIA, TINGGI_DUNIA, previous=main_terrain)
                 
         elif main_choice in ("quit", "quit_app", "back"):
             app_running = False
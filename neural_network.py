@@ -1,83 +1,149 @@
 import random
 import numpy as np
 from settings import *
-import os
+
+# Tipe bobot semua otak: NeuralNetwork, BrainBank, dan genom hasil breed_genomes
+GENOME_DTYPE = np.float32
 
 class NeuralNetwork:
     """Jaringan Saraf Tiruan sederhana sebagai 'otak' sel."""
-    def __init__(self, num_inputs, num_hidden, num_outputs):
-        self.weights_ih = np.random.uniform(-1, 1, (num_hidden, num_inputs))
-        self.weights_ho = np.random.uniform(-1, 1, (num_outputs, num_hidden))
+    def __init__(self, num_inputs, num_hidden, num_outputs, rng=None):
+        # rng: np.random.Generator milik simulasi (None = state global np.random)
+        rng = np.random if rng is None else rng
+        # Bobot disimpan float32 seperti genom di BrainBank dan checkpoint, sehingga mesin per objek
+        # dan mesin vektor menghitung hal yang sama persis
+        self.weights_ih = rng.uniform(-1, 1, (num_hidden, num_inputs)).astype(GENOME_DTYPE)
+        self.weights_ho = rng.uniform(-1, 1, (num_outputs, num_hidden)).astype(GENOME_DTYPE)
 
     def predict(self, inputs):
         """Melakukan forward propagation untuk mendapatkan output."""
+        inputs = np.asarray(inputs, dtype=GENOME_DTYPE)
         hidden = np.dot(self.weights_ih, inputs)
         hidden = np.tanh(hidden)
         outputs = np.dot(self.weights_ho, hidden)
         outputs = np.tanh(outputs)
-        return outputs
+        # Output float64 agar aritmetika gerak sama dengan mesin vektor (float32 * float Python tetap float32)
+        return outputs.astype(np.float64)
+
+    def to_genome(self):
+        """Mengembalikan semua bobot sebagai satu vektor datar (ih lalu ho)."""
+        return np.concatenate((self.weights_ih.ravel(), self.weights_ho.ravel()))
+
+    @staticmethod
+    def from_genome(genome, num_inputs=NUM_INPUTS, num_hidden=NUM_HIDDEN, num_outputs=NUM_OUTPUTS):
+        """Membangun otak dari vektor bobot datar hasil to_genome()."""
+        brain = NeuralNetwork.__new__(NeuralNetwork)
+        split = num_hidden * num_inputs
+        brain.weights_ih = np.array(genome[:split], dtype=GENOME_DTYPE).reshape(num_hidden, num_inputs)
+        brain.weights_ho = np.array(genome[split:], dtype=GENOME_DTYPE).reshape(num_outputs, num_hidden)
+        return brain
 
+    # crossover dan mutate hanya tersisa sebagai pembanding per-otak di benchmark.py;
+    # evolusi memakai breed_genomes() dengan rng yang di-seed.
     @staticmethod
     def crossover(parent1_brain, parent2_brain):
         """Menggabungkan dua 'otak' untuk menciptakan keturunan."""
-        child_brain = NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS)
-        midpoint = random.randint(0, child_brain.weights_ih.size)
-        child_brain.weights_ih.flat[:midpoint] = parent1_brain.weights_ih.flat[:midpoint]
-        child_brain.weights_ih.flat[midpoint:] = parent2_brain.weights_ih.flat[midpoint:]
+        child_brain = NeuralNetwork.__new__(NeuralNetwork)
+        midpoint = random.randint(0, parent1_brain.weights_ih.size)
+        child_brain.weights_ih = np.concatenate((parent1_brain.weights_ih.flat[:midpoint],
+                                                 parent2_brain.weights_ih.flat[midpoint:])).reshape(parent1_brain.weights_ih.shape)
         
-        midpoint = random.randint(0, child_brain.weights_ho.size)
-        child_brain.weights_ho.flat[:midpoint] = parent1_brain.weights_ho.flat[:midpoint]
-        child_brain.weights_ho.flat[midpoint:] = parent2_brain.weights_ho.flat[midpoint:]
+        midpoint = random.randint(0, parent1_brain.weights_ho.size)
+        child_brain.weights_ho = np.concatenate((parent1_brain.weights_ho.flat[:midpoint],
+                                                 parent2_brain.weights_ho.flat[midpoint:])).reshape(parent1_brain.weights_ho.shape)
         return child_brain
 
     def mutate(self, rate, strength):
         """Mengubah bobot secara acak."""
-        for i in range(self.weights_ih.shape[0]):
-            for j in range(self.weights_ih.shape[1]):
-                if random.random() < rate:
-                    self.weights_ih[i, j] += random.uniform(-strength, strength)
-        for i in range(self.weights_ho.shape[0]):
-            for j in range(self.weights_ho.shape[1]):
-                if random.random() < rate:
-                    self.weights_ho[i, j] += random.uniform(-strength, strength)
+        for weights in (self.weights_ih, self.weights_ho):
+            mask = np.random.random(weights.shape) < rate
+            weights += mask * np.random.uniform(-strength, strength, weights.shape)
 
-    @staticmethod
-    def save_brains(filepath, brains):
-        """Menyimpan daftar beberapa otak (bobotnya) ke satu file."""
-        if not brains:
-            print("Peringatan: Tidak ada otak untuk disimpan.")
-            return
-        
-        all_weights = {}
+GENOME_SPLIT = NUM_HIDDEN * NUM_INPUTS
+GENOME_LENGTH = GENOME_SPLIT + NUM_OUTPUTS * NUM_HIDDEN
+
+def random_genomes(count, rng, genome_length=GENOME_LENGTH):
+    """Genom acak (count, genome_length) float32, setara dengan NeuralNetwork baru."""
+    return rng.uniform(-1, 1, (count, genome_length)).astype(GENOME_DTYPE)
+
+def breed_genomes(parent_genomes, count, rng, rate=MUTATION_RATE, strength=MUTATION_STRENGTH, split=GENOME_SPLIT):
+    """Membuat satu generasi anak sekaligus dari matriks genom induk (P, panjang_genom).
+
+    Sama dengan NeuralNetwork.crossover + mutate untuk setiap anak: induk dipilih acak dengan
+    pengembalian, titik potong dipilih terpisah untuk bagian ih dan ho, lalu setiap bobot
+    bermutasi dengan peluang rate. Semua undian memakai rng (np.random.Generator).
+    """
+    parent_genomes = np.asarray(parent_genomes)
+    genome_length = parent_genomes.shape[1]
+    parents = rng.integers(0, len(parent_genomes), size=(count, 2))
+    cut_ih = rng.integers(0, split, size=count, endpoint=True)
+    cut_ho = rng.integers(0, genome_length - split, size=count, endpoint=True)
+
+    # Gen ke-j diambil dari induk pertama jika posisinya (di dalam bagiannya) sebelum titik potong
+    position = np.arange(genome_length)
+    from_first = np.where(position < split,
+                          position[None, :] < cut_ih[:, None],
+                          (position - split)[None, :] < cut_ho[:, None])
+    children = np.where(from_first, parent_genomes[parents[:, 0]], parent_genomes[parents[:, 1]])
+
+    mutation_mask = rng.random((count, genome_length)) < rate
+    children += (mutation_mask * rng.uniform(-strength, strength, (count, genome_length))).astype(children.dtype)
+    return children
+
+class BrainBank:
+    """Menyimpan bobot seluruh populasi dalam satu matriks genom (N, panjang_genom).
+
+    weights_ih dan weights_ho adalah view berbentuk (N, hidden, input) dan (N, output, hidden)
+    di atas matriks yang sama, sehingga forward pass semua sel cukup dua batched matmul.
+    """
+    def __init__(self, brains=(), num_inputs=NUM_INPUTS, num_hidden=NUM_HIDDEN, num_outputs=NUM_OUTPUTS):
+        self.num_inputs = num_inputs
+        self.num_hidden = num_hidden
+        self.num_outputs = num_outputs
+        self.split = num_hidden * num_inputs
+        self.genome_length = self.split + num_outputs * num_hidden
+        self.genomes = np.empty((0, self.genome_length), dtype=GENOME_DTYPE)
+        self.assign(brains)
+
+    def __len__(self):
+        return self.genomes.shape[0]
+
+    @property
+    def weights_ih(self):
+        return self.genomes[:, :self.split].reshape(len(self), self.num_hidden, self.num_inputs)
+
+    @property
+    def weights_ho(self):
+        return self.genomes[:, self.split:].reshape(len(self), self.num_outputs, self.num_hidden)
+
+    def assign(self, brains):
+        """Mengganti seluruh isi bank, mis. saat generasi baru dibuat."""
+        brains = list(brains)
+        genomes = np.empty((len(brains), self.genome_length), dtype=GENOME_DTYPE)
         for i, brain in enumerate(brains):
-            all_weights[f'w_ih_{i}'] = brain.weights_ih
-            all_weights[f'w_ho_{i}'] = brain.weights_ho
-        
-        try:
-            np.savez(filepath, **all_weights)
-            print(f"✅ {len(brains)} otak berhasil disimpan ke {filepath}")
-        except Exception as e:
-            print(f"❌ Gagal menyimpan otak: {e}")
+            genomes[i] = brain.to_genome()
+        self.genomes = genomes
 
-    @staticmethod
-    def load_brains(filepath):
-        """Memuat beberapa otak dari file dan mengembalikannya sebagai list."""
-        if not os.path.exists(filepath):
-            print(f"Info: File otak '{filepath}' tidak ditemukan. Mode Sandbox akan dimulai dengan sel acak.")
-            return []
-            
-        try:
-            data = np.load(filepath)
-            loaded_brains = []
-            i = 0
-            while f'w_ih_{i}' in data:
-                brain = NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS)
-                brain.weights_ih = data[f'w_ih_{i}']
-                brain.weights_ho = data[f'w_ho_{i}']
-                loaded_brains.append(brain)
-                i += 1
-            print(f"✅ {len(loaded_brains)} otak berhasil dimuat dari {filepath}")
-            return loaded_brains
-        except Exception as e:
-            print(f"❌ Gagal memuat otak dari file: {e}")
-            return []
\ No newline at end of file
+    def predict(self, inputs):
+        """Forward pass untuk seluruh populasi. inputs: (N, input) -> outputs: (N, output)."""
+        inputs = np.asarray(inputs, dtype=GENOME_DTYPE)
+        hidden = np.tanh(np.matmul(self.weights_ih, inputs[:, :, None]))
+        outputs = np.tanh(np.matmul(self.weights_ho, hidden))
+        return outputs[:, :, 0].astype(np.float64)
+
+    def set(self, index, brain):
+        """Menukar satu individu dengan otak lain."""
+        self.genomes[index] = brain.to_genome()
+
+    def append(self, brains):
+        """Menambahkan individu baru di akhir bank."""
+        extra = BrainBank(brains, self.num_inputs, self.num_hidden, self.num_outputs)
+        self.genomes = np.concatenate((self.genomes, extra.genomes))
+
+    def keep(self, indices):
+        """Hanya menyisakan individu pada indeks yang diberikan (urutan ikut indeks), mis. saat sel mati."""
+        self.genomes = self.genomes[indices]
+
+    def get(self, index):
+        """Mengembalikan individu ke-index sebagai objek NeuralNetwork."""
+        return NeuralNetwork.from_genome(self.genomes[index], self.num_inputs, self.num_hidden, self.num_outputs)
@@ -13,11 +13,20 @@ WARNA_TEKS = (255, 255, 255)
 # --- PENGATURAN SIMULASI & EVOLUSI ---
 JUMLAH_SEL_AWAL = 2
 JUMLAH_RUMPUT = 40
+# Rumput yang dimakan tumbuh lagi setelah sekian detik (0 = langsung muncul di tempat lain)
+WAKTU_TUMBUH_RUMPUT = 0
+# Bobot peluang rumput tumbuh per biome (src/simulation/food.py); air dan batu selalu 0
+BOBOT_TUMBUH_RUMPUT = {'pasir': 1.0, 'rumput': 1.0, 'hutan': 1.0}
 GENERATION_TIME_SECS = 15
 SELECTION_PERCENT = 0.25
 MUTATION_RATE = 0.1
 MUTATION_STRENGTH = 0.1
+SEED_EVOLUSI = None  # Angka tetap agar seleksi & reproduksi bisa diulang persis; None = acak
 TURN_STRENGTH = 0.1
+# Metrik keragaman genom per generasi (src/utils/genome_metrics.py); jarak = selisih RMS per bobot
+METRIK_SAMPEL_GENOM = 256  # Jarak berpasangan hanya dihitung di sampel sebesar ini, bukan O(N^2)
+JARAK_SPESIES = 30         # Ambang spesies baru, dalam kelipatan jarak satu putaran mutasi (MUTATION_RATE/STRENGTH)
+JARAK_KLON = 0.05          # Genom dengan tetangga terdekat sedekat ini dihitung klon
 
 # --- PENGATURAN SEL & ENERGI ---
 ENERGI_AWAL = 200
@@ -39,15 +48,27 @@ BONUS_FITNESS_SOSIAL = 5
 # --- PENGATURAN PENGLIHATAN SEL ---
 JARAK_PENGLIHATAN_SEL = 50
 JUMLAH_SENSOR_TERRAIN = 8
+# Sensor sinar: setiap sensor juga ditelusuri sepanjang sinarnya (SAMPEL_PER_SINAR titik) untuk
+# jarak ke air/batu pertama dan jarak ke sel terdekat. Menambah 2 input per sensor, jadi otak yang
+# disimpan dengan pengaturan berbeda tidak bisa dimuat.
+SENSOR_SINAR = False
+SAMPEL_PER_SINAR = 8
 
 # --- PENGATURAN JARINGAN SARAF (ANN) ---
-# Input: [makanan(3), sensor terrain(8), sensor sel(8)]
-NUM_INPUTS = 3 + JUMLAH_SENSOR_TERRAIN + JUMLAH_SENSOR_TERRAIN  # <-- DIPERBARUI
+# Input: [makanan(3), sensor terrain(8), sensor sel(8)] + jika SENSOR_SINAR [jarak air/batu(8), jarak sel(8)]
+NUM_INPUTS = 3 + JUMLAH_SENSOR_TERRAIN * (4 if SENSOR_SINAR else 2)
 NUM_HIDDEN = 12  # <-- Sedikit ditambah untuk input yang lebih kompleks
 NUM_OUTPUTS = 7
 
 # --- PENGATURAN TERRAIN ---
 TERRAIN_SCALE = 1000.0
+# Ukuran dunia (piksel). Dunia yang lebih besar dari layar dibuat per petak saat dibutuhkan
+# (ChunkedTerrain) dan dilihat lewat kamera yang digeser dengan tombol panah
+LEBAR_DUNIA, TINGGI_DUNIA = LEBAR_LAYAR, TINGGI_LAYAR
+UKURAN_PETAK_TERRAIN = 64
+MAKS_PETAK_BIOME = 8192    # Petak biome uint8 di cache LRU (8192 x 4 KB = 32 MB, cukup untuk ~1000 sel yang tersebar)
+MAKS_PETAK_GAMBAR = 512    # Petak surface siap-blit di cache LRU (512 x 16 KB = 8 MB)
+KECEPATAN_KAMERA = 12      # Piksel per frame saat tombol panah ditekan
 WARNA_TERRAIN = {
     'air': (40, 120, 180),
     'pasir': (240, 230, 140),
@@ -76,7 +97,39 @@ NILAI_SENSOR_TERRAIN = {
     'batu': -0.7
 }
 
+# --- PENGATURAN PERFORMA ---
+# True: semua sel diperbarui sekaligus dengan NumPy (src/simulation/population.py)
+# False: setiap sel menjalankan Cell.update() satu per satu
+GUNAKAN_MESIN_VEKTOR = True
+# True: sel digambar dari atlas sprite yang sudah dipanggang (src/ui/sprites.py) dengan satu blits()
+# False: setiap sel digambar dengan primitif pygame.draw di Cell.draw()
+GUNAKAN_ATLAS_SPRITE = True
+
+# Simulasi berjalan dengan langkah tetap 1/FRAME_RATE detik, terlepas dari render
+# Kelipatan kecepatan untuk tombol 1-4; None = secepat mungkin (render tetap ~FRAME_RATE kali per detik)
+KECEPATAN_SIMULASI = [1, 4, 16, None]
+RENDER_SETIAP_N_FRAME = 1  # Hanya gambar setiap frame ke-N (ubah saat berjalan dengan tombol R)
+MAKS_TICK_PER_FRAME = 64   # Batas langkah simulasi per frame agar UI tidak membeku saat simulasi tertinggal
+# True: langkah simulasi berjalan di thread sendiri dan UI menggambar snapshot terbarunya (src/simulation/stepper.py)
+SIMULASI_DI_THREAD = True
+# Profiler per fase (src/utils/profiler.py); tombol P menyalakan overlay p50/p95/p99 saat berjalan
+PROFIL_AKTIF = False         # True: selalu mengukur, walau overlay tidak ditampilkan
+PROFIL_JENDELA_FRAME = 300   # Jumlah frame terakhir untuk menghitung persentil
+
 # --- PENGATURAN SIMPAN & MUAT ---
-BRAIN_FILE = 'data/fittest_brains.npz'
-WORLD_FILE = 'data/world.npy'
-WORLD_IMAGE_FILE = 'data/world.png'
\ No newline at end of file
+# Checkpoint biner (src/utils/checkpoint.py); file .npz lama dengan nama yang sama tetap bisa dimuat
+BRAIN_FILE = 'data/fittest_brains.bin'
+# Simpan otomatis di thread latar belakang selama latihan (0 = nonaktif)
+AUTOSAVE_SETIAP_GENERASI = 10
+AUTOSAVE_SETIAP_DETIK = 300
+# Raster biome uint8 + parameter pembuatannya (src/utils/world_file.py), di-memmap saat dimuat
+WORLD_FILE = 'data/world.bin'
+# Parameter dunia berpetak (seed, skala, oktaf); petaknya sendiri selalu dibuat ulang dari seed
+CHUNKED_WORLD_FILE = 'data/world_chunked.bin'
+# Rekaman replay (src/simulation/replay.py): keadaan setiap tick, diputar ulang tanpa menjalankan otak sel
+REKAM_REPLAY = False           # True: mode latihan & sandbox merekam ke REPLAY_FILE
+REPLAY_FILE = 'data/replay.bin'
+REPLAY_KEYFRAME_SETIAP = 300   # Keadaan lengkap setiap N tick agar bisa lompat ke tick mana pun
+# Metrik keragaman genom per generasi (src/utils/genome_metrics.py), satu baris JSON per generasi
+CATAT_METRIK = False           # True: mode latihan menambahkan metrik ke METRICS_FILE (train_headless: --metrics)
+METRICS_FILE = 'data/metrics.jsonl'
\ No newline at end of file
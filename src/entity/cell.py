@@ -6,69 +6,89 @@ import numpy as np
 from settings import *
 from neural_network import NeuralNetwork
 from grass import Grass
-from terrain import Terrain
+from terrain import Terrain, BIOME_AIR, SPEED_MULTIPLIER, ENERGY_COST, SENSOR_VALUE
+from src.utils.spatial import SpatialHash, GrassIndex
+from src.entity.sensors import sensor_directions, ray_points, march_terrain, march_cells
+
+POSSIBLE_STATES = ['idle', 'wandering', 'foraging', 'running']
+# (warna badan, warna garis tepi) per gender; garis tepi sel terbaik ke-1 dan ke-2 diganti emas/perak
+GENDER_COLORS = {'male': ((60, 180, 255), (10, 50, 100)), 'female': ((255, 105, 180), (100, 20, 60))}
+RANK_OUTLINE_COLORS = [(255, 215, 0), (192, 192, 192)]
 
 class Cell:
-    def __init__(self, brain: NeuralNetwork = None):
-        self.x: float = random.randint(0, LEBAR_LAYAR)
-        self.y: float = random.randint(0, TINGGI_LAYAR)
+    def __init__(self, brain: NeuralNetwork = None, rng: random.Random = None):
+        # rng: random.Random milik simulasi agar run bisa diulang persis (None = modul random global)
+        rng = rng or random
+        self.x: float = rng.randint(0, LEBAR_DUNIA)
+        self.y: float = rng.randint(0, TINGGI_DUNIA)
         self.energy: float = ENERGI_AWAL
-        self.angle: float = random.uniform(0, 2 * math.pi)
-        self.gender = random.choice(['male', 'female'])
+        self.angle: float = rng.uniform(0, 2 * math.pi)
+        self.gender = rng.choice(['male', 'female'])
         
-        self.possible_states = ['idle', 'wandering', 'foraging', 'running']
+        self.possible_states = POSSIBLE_STATES
         self.state: str = 'wandering'
         
         self.fitness: int = 0
         self.current_speed: float = 0
-        self.brain: NeuralNetwork = brain or NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS)
+        if brain is None:
+            brain = NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS,
+                                  None if rng is random else np.random.default_rng(rng.getrandbits(64)))
+        self.brain: NeuralNetwork = brain
         
-        self.leg_animation_cycle = random.uniform(0, 360)
+        self.leg_animation_cycle = rng.uniform(0, 360)
         self.leg_length = RADIUS_SEL * 1.5
         self.leg_swing_arc = math.pi / 4
         
         self.target_grass = None
 
-        if self.gender == 'male':
-            self.base_color = (60, 180, 255)
-            self.outline_color = (10, 50, 100)
-        else:
-            self.base_color = (255, 105, 180)
-            self.outline_color = (100, 20, 60)
+        self.base_color, self.outline_color = GENDER_COLORS[self.gender]
             
-    def update(self, grass_patches: list, all_cells: list, terrain: Terrain) -> str:
+    def update(self, grass_patches: list, all_cells: list, terrain: Terrain,
+               sensor_grid: SpatialHash = None, social_grid: SpatialHash = None) -> str:
         self.target_grass = self._find_nearest_grass(grass_patches)
-        biome_at_cell = terrain.get_biome_at(self.x, self.y)
+        biome_at_cell = terrain.get_biome_id_at(self.x, self.y)
 
         # Mengirim daftar sel lain ke fungsi input untuk dideteksi oleh sensor
-        inputs = self._get_brain_inputs(self.target_grass, terrain, all_cells)
+        inputs = self._get_brain_inputs(self.target_grass, terrain, all_cells, sensor_grid)
         outputs = self.brain.predict(np.array(inputs))
         
         self._update_state_from_brain(outputs)
         self._process_brain_outputs(outputs, biome_at_cell)
         
         self._move()
-        self._update_social_fitness(all_cells)
+        self._update_social_fitness(all_cells, social_grid)
         self._update_status(biome_at_cell)
         self._update_legs()
         
         return "hidup" if self.is_alive() else "mati"
     
-    def draw(self, screen: pygame.Surface, show_debug: bool = False, all_cells: list = None):
-        self._draw_legs(screen)
-        self._draw_body(screen)
-        self._draw_direction_indicator(screen)
-        self._draw_energy_bar(screen)
+    def draw(self, screen: pygame.Surface, show_debug: bool = False, all_cells: list = None, offset: tuple = (0, 0)):
+        # offset = posisi kamera di dunia; sel digambar pada (x - offset_x, y - offset_y)
+        self._draw_legs(screen, offset)
+        self._draw_body(screen, offset)
+        self._draw_direction_indicator(screen, offset)
+        self._draw_energy_bar(screen, offset)
         
         if show_debug:
-            self._draw_state_text(screen)
-            self._draw_foraging_line(screen)
-            self._draw_fitness_bar(screen)
-            # Mengirim daftar sel untuk visualisasi sensor
-            if all_cells:
-                self._draw_terrain_sensors(screen, all_cells)
-
-    def _get_brain_inputs(self, nearest_grass: Grass, terrain: Terrain, all_cells: list) -> list:
+            self.draw_debug(screen, all_cells, offset)
+
+    def draw_debug(self, screen: pygame.Surface, all_cells: list = None, offset: tuple = (0, 0)):
+        self._draw_state_text(screen, offset)
+        self._draw_foraging_line(screen, offset)
+        self._draw_fitness_bar(screen, offset)
+        # Mengirim daftar sel untuk visualisasi sensor
+        if all_cells:
+            self._draw_terrain_sensors(screen, all_cells, offset)
+
+    def get_rect(self, offset: tuple = (0, 0)) -> pygame.Rect:
+        """Kotak pembatas gambar sel tanpa debug: kaki, badan, dan bar energi di bawahnya."""
+        reach = int(self.leg_length) + 4
+        # Bar energi bisa lebih panjang dari bingkainya saat energi di atas ENERGI_AWAL
+        right = max(reach, int(RADIUS_SEL * 3) + 2)
+        return pygame.Rect(int(self.x) - offset[0] - reach, int(self.y) - offset[1] - reach, reach + right, reach + RADIUS_SEL + 10)
+
+    def _get_brain_inputs(self, nearest_grass: Grass, terrain: Terrain, all_cells: list,
+                          sensor_grid: SpatialHash = None) -> list:
         # Input dasar (makanan & energi)
         if not nearest_grass:
             norm_dist, norm_angle = 1.0, 0.0
@@ -85,19 +105,20 @@ class Cell:
         # Input dari sensor
         terrain_sensor_inputs = []
         cell_sensor_inputs = [] # List baru untuk sensor sel
-        
-        for i in range(JUMLAH_SENSOR_TERRAIN):
-            sensor_angle = self.angle + (i * (2 * math.pi / JUMLAH_SENSOR_TERRAIN))
-            sensor_x = self.x + JARAK_PENGLIHATAN_SEL * math.cos(sensor_angle)
-            sensor_y = self.y + JARAK_PENGLIHATAN_SEL * math.sin(sensor_angle)
+        directions = sensor_directions(self.angle)
+
+        for cos_i, sin_i in directions:
+            sensor_x = self.x + JARAK_PENGLIHATAN_SEL * cos_i
+            sensor_y = self.y + JARAK_PENGLIHATAN_SEL * sin_i
 
             # 1. Logika Sensor Terrain
-            biome_type = terrain.get_biome_at(sensor_x, sensor_y)
-            terrain_sensor_inputs.append(NILAI_SENSOR_TERRAIN.get(biome_type, 0.0))
+            biome_id = terrain.get_biome_id_at(sensor_x, sensor_y)
+            terrain_sensor_inputs.append(float(SENSOR_VALUE[biome_id]))
 
             # 2. Logika Sensor Sel
+            candidates = all_cells if sensor_grid is None else self._nearby_cells(sensor_grid, sensor_x, sensor_y, RADIUS_SEL)
             cell_detected = 0.0
-            for other_cell in all_cells:
+            for other_cell in candidates:
                 if other_cell is self:
                     continue
                 dist_to_other = math.hypot(sensor_x - other_cell.x, sensor_y - other_cell.y)
@@ -107,12 +128,26 @@ class Cell:
             cell_sensor_inputs.append(cell_detected)
 
         # Gabungkan semua input menjadi satu
-        return base_inputs + terrain_sensor_inputs + cell_sensor_inputs
+        inputs = base_inputs + terrain_sensor_inputs + cell_sensor_inputs
+        if SENSOR_SINAR:
+            inputs += self._get_ray_inputs(terrain, all_cells, sensor_grid, directions)
+        return inputs
 
-    def _process_brain_outputs(self, outputs: np.ndarray, terrain_type: str):
+    def _get_ray_inputs(self, terrain: Terrain, all_cells: list, sensor_grid: SpatialHash, directions: list) -> list:
+        # Sama dengan Population._get_brain_inputs untuk satu sel: jarak air/batu lalu jarak sel per sinar
+        if sensor_grid is None:
+            sensor_grid = SpatialHash(RADIUS_SEL + KECEPATAN_MAKS_SEL)
+            sensor_grid.rebuild([c.x for c in all_cells], [c.y for c in all_cells])
+        x, y = np.array([self.x]), np.array([self.y])
+        ray_cos, ray_sin = np.array(directions).T[:, None, :]
+        sample_x, sample_y = ray_points(x, y, ray_cos, ray_sin)
+        _, terrain_distance = march_terrain(terrain, sample_x, sample_y)
+        cell_distance = march_cells(sensor_grid, x, y, sample_x, sample_y)
+        return terrain_distance[0].tolist() + cell_distance[0].tolist()
+
+    def _process_brain_outputs(self, outputs: np.ndarray, biome_id: int):
         turn_left, turn_right, speed_control = outputs[:3]
-        terrain_modifier = PENGARUH_TERRAIN[terrain_type]
-        max_speed_on_terrain = KECEPATAN_MAKS_SEL * terrain_modifier['speed_multiplier']
+        max_speed_on_terrain = KECEPATAN_MAKS_SEL * float(SPEED_MULTIPLIER[biome_id])
 
         if self.state == 'idle':
             self.current_speed = 0
@@ -133,19 +168,20 @@ class Cell:
 
     def _find_nearest_grass(self, grass_patches: list):
         if not grass_patches: return None
+        if isinstance(grass_patches, GrassIndex):
+            return grass_patches.nearest(self.x, self.y)
         return min(grass_patches, key=lambda g: math.hypot(g.x - self.x, g.y - self.y))
 
     def _move(self):
         self.x += self.current_speed * math.cos(self.angle)
         self.y += self.current_speed * math.sin(self.angle)
-        self.x = max(0, min(LEBAR_LAYAR, self.x))
-        self.y = max(0, min(TINGGI_LAYAR, self.y))
+        self.x = max(0, min(LEBAR_DUNIA, self.x))
+        self.y = max(0, min(TINGGI_DUNIA, self.y))
     
-    def _update_status(self, terrain_type: str):
-        if terrain_type == 'air':
+    def _update_status(self, biome_id: int):
+        if biome_id == BIOME_AIR:
             self.fitness -= 2
             return
-        terrain_modifier = PENGARUH_TERRAIN[terrain_type]
         speed_ratio = self.current_speed / KECEPATAN_MAKS_SEL if KECEPATAN_MAKS_SEL > 0 else 0
         base_energy_cost = ENERGI_DIAM + (speed_ratio * ENERGI_BERGERAK)
         state_multiplier = 1.0
@@ -153,23 +189,32 @@ class Cell:
         elif self.state == 'idle':
             state_multiplier = 0.5
             self.fitness -= 0.5
-        total_energy_cost = base_energy_cost * terrain_modifier['energy_cost'] * state_multiplier
+        total_energy_cost = base_energy_cost * float(ENERGY_COST[biome_id]) * state_multiplier
         self.energy -= total_energy_cost
         self.fitness += 1
     
-    def _update_social_fitness(self, all_cells: list):
+    def _update_social_fitness(self, all_cells: list, social_grid: SpatialHash = None):
         nearby_friends = 0
-        for other_cell in all_cells:
+        candidates = all_cells if social_grid is None else self._nearby_cells(social_grid, self.x, self.y, JARAK_DETEKSI_SOSIAL)
+        for other_cell in candidates:
             if other_cell is self: continue
             if math.hypot(self.x - other_cell.x, self.y - other_cell.y) < JARAK_DETEKSI_SOSIAL:
                 nearby_friends += 1
         if nearby_friends >= 5:
             self.fitness += BONUS_FITNESS_SOSIAL
     
+    @staticmethod
+    def _nearby_cells(grid: SpatialHash, x: float, y: float, radius: float) -> list:
+        # Grid berisi posisi awal frame; sel bergerak paling jauh KECEPATAN_MAKS_SEL per frame,
+        # jadi radius diperlebar lalu jarak sebenarnya tetap diperiksa oleh pemanggil.
+        # Sel yang sudah mati di frame ini tidak lagi ada di daftar sel, maka dilewati.
+        return [c for c in grid.query(x, y, radius + KECEPATAN_MAKS_SEL) if c.is_alive()]
+
     def is_alive(self) -> bool:
         return self.energy > 0
 
-    def _draw_body(self, screen: pygame.Surface):
+    def _draw_body(self, screen: pygame.Surface, offset: tuple = (0, 0)):
+        x, y = self.x - offset[0], self.y - offset[1]
         speed_ratio = self.current_speed / KECEPATAN_MAKS_SEL if KECEPATAN_MAKS_SEL > 0 else 0
         r, g, b = self.base_color
         current_color = (
@@ -178,31 +223,33 @@ class Cell:
             np.clip(int(b + (0 - b) * speed_ratio), 0, 255)
         )
         if self.gender == 'male':
-            rect = pygame.Rect(self.x - RADIUS_SEL * 1.2, self.y - RADIUS_SEL * 0.8, RADIUS_SEL * 2.4, RADIUS_SEL * 1.6)
+            rect = pygame.Rect(x - RADIUS_SEL * 1.2, y - RADIUS_SEL * 0.8, RADIUS_SEL * 2.4, RADIUS_SEL * 1.6)
             pygame.draw.ellipse(screen, self.outline_color, rect.inflate(2, 2))
             pygame.draw.ellipse(screen, current_color, rect)
         else:
-            pygame.draw.circle(screen, self.outline_color, (int(self.x), int(self.y)), RADIUS_SEL + 1)
-            pygame.draw.circle(screen, current_color, (int(self.x), int(self.y)), RADIUS_SEL)
+            pygame.draw.circle(screen, self.outline_color, (int(x), int(y)), RADIUS_SEL + 1)
+            pygame.draw.circle(screen, current_color, (int(x), int(y)), RADIUS_SEL)
     
-    def _draw_legs(self, screen: pygame.Surface):
+    def _draw_legs(self, screen: pygame.Surface, offset: tuple = (0, 0)):
+        x, y = self.x - offset[0], self.y - offset[1]
         current_swing = math.sin(math.radians(self.leg_animation_cycle)) * self.leg_swing_arc
         for sign in [-1, 1]:
             angle = self.angle + (sign * math.pi / 2) - (sign * current_swing)
-            end_pos = (self.x + self.leg_length * math.cos(angle), self.y + self.leg_length * math.sin(angle))
-            pygame.draw.line(screen, (40, 40, 40), (self.x, self.y), end_pos, 3)
+            end_pos = (x + self.leg_length * math.cos(angle), y + self.leg_length * math.sin(angle))
+            pygame.draw.line(screen, (40, 40, 40), (x, y), end_pos, 3)
     
     def _update_legs(self):
         self.leg_animation_cycle = (self.leg_animation_cycle + self.current_speed * 2.5) % 360
     
-    def _draw_direction_indicator(self, screen: pygame.Surface):
-        end_x = self.x + (RADIUS_SEL + 2) * math.cos(self.angle)
-        end_y = self.y + (RADIUS_SEL + 2) * math.sin(self.angle)
-        pygame.draw.line(screen, (255, 50, 50), (self.x, self.y), (end_x, end_y), 2)
+    def _draw_direction_indicator(self, screen: pygame.Surface, offset: tuple = (0, 0)):
+        x, y = self.x - offset[0], self.y - offset[1]
+        end_x = x + (RADIUS_SEL + 2) * math.cos(self.angle)
+        end_y = y + (RADIUS_SEL + 2) * math.sin(self.angle)
+        pygame.draw.line(screen, (255, 50, 50), (x, y), (end_x, end_y), 2)
 
-    def _draw_energy_bar(self, screen: pygame.Surface):
+    def _draw_energy_bar(self, screen: pygame.Surface, offset: tuple = (0, 0)):
         if not self.is_alive(): return
-        bar_pos = (self.x - RADIUS_SEL, self.y + RADIUS_SEL + 4)
+        bar_pos = (self.x - offset[0] - RADIUS_SEL, self.y - offset[1] + RADIUS_SEL + 4)
         bar_size = (RADIUS_SEL * 2, 4)
         energy_ratio = self.energy / ENERGI_AWAL
         fill_width = bar_size[0] * energy_ratio
@@ -212,37 +259,39 @@ class Cell:
         if fill_width > 0:
             pygame.draw.rect(screen, energy_color, (*bar_pos, fill_width, bar_size[1]), border_radius=1)
     
-    def _draw_fitness_bar(self, screen: pygame.Surface):
+    def _draw_fitness_bar(self, screen: pygame.Surface, offset: tuple = (0, 0)):
         if not self.is_alive(): return
-        bar_pos = (self.x - RADIUS_SEL, self.y + RADIUS_SEL + 10)
+        bar_pos = (self.x - offset[0] - RADIUS_SEL, self.y - offset[1] + RADIUS_SEL + 10)
         bar_size = (RADIUS_SEL * 2, 4)
         fill_width = bar_size[0] * ((self.fitness % 1000) / 1000.0)
         pygame.draw.rect(screen, (50, 50, 50), (*bar_pos, *bar_size), border_radius=1)
         if fill_width > 0:
             pygame.draw.rect(screen, (138, 43, 226), (*bar_pos, fill_width, bar_size[1]), border_radius=1)
 
-    def _draw_state_text(self, screen: pygame.Surface):
+    def _draw_state_text(self, screen: pygame.Surface, offset: tuple = (0, 0)):
         if not hasattr(self, 'font'):
             self.font = pygame.font.Font(None, 20)
         text_surf = self.font.render(self.state[0].upper(), True, (255, 255, 255))
-        text_rect = text_surf.get_rect(center=(self.x, self.y - RADIUS_SEL - 18))
+        text_rect = text_surf.get_rect(center=(self.x - offset[0], self.y - offset[1] - RADIUS_SEL - 18))
         pygame.draw.rect(screen, (0, 0, 0, 128), text_rect.inflate(4, 4), border_radius=3)
         screen.blit(text_surf, text_rect)
     
-    def _draw_foraging_line(self, screen: pygame.Surface):
+    def _draw_foraging_line(self, screen: pygame.Surface, offset: tuple = (0, 0)):
         if self.state == 'foraging' and self.target_grass:
             if math.hypot(self.target_grass.x - self.x, self.target_grass.y - self.y) < JARAK_DETEKSI_MAKANAN:
-                pygame.draw.line(screen, (255, 255, 0), (self.x, self.y), (self.target_grass.x, self.target_grass.y), 1)
+                ox, oy = offset
+                pygame.draw.line(screen, (255, 255, 0), (self.x - ox, self.y - oy),
+                                 (self.target_grass.x - ox, self.target_grass.y - oy), 1)
 
-    def _draw_terrain_sensors(self, screen: pygame.Surface, all_cells: list):
-        for i in range(JUMLAH_SENSOR_TERRAIN):
-            sensor_angle = self.angle + (i * (2 * math.pi / JUMLAH_SENSOR_TERRAIN))
-            sensor_x = self.x + JARAK_PENGLIHATAN_SEL * math.cos(sensor_angle)
-            sensor_y = self.y + JARAK_PENGLIHATAN_SEL * math.sin(sensor_angle)
+    def _draw_terrain_sensors(self, screen: pygame.Surface, all_cells: list, offset: tuple = (0, 0)):
+        ox, oy = offset
+        for cos_i, sin_i in sensor_directions(self.angle):
+            sensor_x = self.x + JARAK_PENGLIHATAN_SEL * cos_i
+            sensor_y = self.y + JARAK_PENGLIHATAN_SEL * sin_i
             sensor_color = (255, 255, 255)
             for other_cell in all_cells:
                 if other_cell is not self and math.hypot(sensor_x - other_cell.x, sensor_y - other_cell.y) < RADIUS_SEL:
                     sensor_color = (255, 0, 0)
                     break
-            pygame.draw.line(screen, (100, 100, 100), (self.x, self.y), (sensor_x, sensor_y), 1)
-            pygame.draw.circle(screen, sensor_color, (int(sensor_x), int(sensor_y)), 3)
\ No newline at end of file
+            pygame.draw.line(screen, (100, 100, 100), (self.x - ox, self.y - oy), (sensor_x - ox, sensor_y - oy), 1)
+            pygame.draw.circle(screen, sensor_color, (int(sensor_x - ox), int(sensor_y - oy)), 3)
\ No newline at end of file
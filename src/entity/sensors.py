@@ -0,0 +1,54 @@
+# src/entity/sensors.py
+
+import math
+import numpy as np
+from settings import *
+from terrain import BIOMES, BIOME_AIR, BIOME_BATU
+
+# Sudut sensor relatif terhadap arah sel beserta tabel cos/sin-nya, dihitung sekali saat impor.
+# Arah setiap sinar cukup diputar dari arah sel: cos(a + o) = cos a cos o - sin a sin o.
+SENSOR_OFFSETS = np.arange(JUMLAH_SENSOR_TERRAIN) * (2 * math.pi / JUMLAH_SENSOR_TERRAIN)
+SENSOR_COS = np.cos(SENSOR_OFFSETS)
+SENSOR_SIN = np.sin(SENSOR_OFFSETS)
+# Tabel yang sama sebagai pasangan float untuk jalur skalar (Cell) tanpa overhead NumPy
+SENSOR_DIRECTIONS = list(zip(SENSOR_COS.tolist(), SENSOR_SIN.tolist()))
+
+# Jarak titik sampel dari sel di sepanjang setiap sinar; sampel terakhir tepat di ujung sensor
+RAY_SAMPLES = JARAK_PENGLIHATAN_SEL * np.arange(1, SAMPEL_PER_SINAR + 1) / SAMPEL_PER_SINAR
+# Biome yang menghentikan sinar terrain (di luar dunia dihitung batu)
+RAY_BLOCKER = np.isin(np.arange(len(BIOMES)), (BIOME_AIR, BIOME_BATU))
+
+def ray_directions(angles):
+    """Arah (cos, sin) setiap sensor untuk sudut sel `angles` (N,); hasilnya dua array (N, sensor)."""
+    cos_a, sin_a = np.cos(angles)[:, None], np.sin(angles)[:, None]
+    return cos_a * SENSOR_COS - sin_a * SENSOR_SIN, sin_a * SENSOR_COS + cos_a * SENSOR_SIN
+
+def sensor_directions(angle):
+    """Versi skalar dari ray_directions untuk satu sel: list (cos, sin) per sensor."""
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    return [(cos_a * c - sin_a * s, sin_a * c + cos_a * s) for c, s in SENSOR_DIRECTIONS]
+
+def ray_points(x, y, ray_cos, ray_sin):
+    """Titik sampel setiap sinar sebagai dua array (N, sensor, SAMPEL_PER_SINAR)."""
+    return (x[:, None, None] + ray_cos[:, :, None] * RAY_SAMPLES,
+            y[:, None, None] + ray_sin[:, :, None] * RAY_SAMPLES)
+
+def first_hit_distance(hits):
+    """Jarak ternormalisasi ke sampel pertama yang bernilai True di sumbu terakhir; 1.0 jika tidak ada."""
+    return np.where(hits.any(axis=-1), (hits.argmax(axis=-1) + 1) / SAMPEL_PER_SINAR, 1.0)
+
+def march_terrain(terrain, sample_x, sample_y):
+    """(ID biome di ujung sensor, jarak ke air/batu pertama) untuk setiap sinar sekaligus."""
+    biome_ids = terrain.get_biome_ids(sample_x, sample_y)
+    return biome_ids[..., -1], first_hit_distance(RAY_BLOCKER[biome_ids])
+
+def march_cells(grid, x, y, sample_x, sample_y):
+    """Jarak setiap sinar ke sampel pertama yang jatuh di petak grid berisi sel lain.
+
+    Hanya membaca jumlah titik per petak dari grid sensor frame ini (bukan jarak ke setiap sel),
+    jadi hasilnya perkiraan seukuran petak, tetapi biayanya sebanding dengan jumlah sampel dan
+    tidak membengkak saat sel berdesakan. Sel pemilik sinar dikurangkan dari petaknya sendiri.
+    """
+    keys = grid.keys_at(sample_x, sample_y)
+    counts = grid.counts_in(keys) - (keys == grid.keys_at(x, y)[:, None, None])
+    return first_hit_distance(counts > 0)
@@ -1,40 +1,186 @@
 # src/simulation/base_simulation.py
 import pygame
 import sys
-import math
+import time
+import random
+import threading
+import numpy as np
 from settings import *
 from grass import Grass
+from src.simulation.population import Population
+from src.simulation.food import FoodField
+from src.simulation.stepper import CellSnapshot, SimulationStepper
+from src.simulation.replay import ReplayRecorder
+from src.entity.cell import GENDER_COLORS, RANK_OUTLINE_COLORS
+from src.utils.spatial import SpatialHash, GrassIndex
+from src.utils.profiler import PROFILER
+from src.utils.leaderboard import Leaderboard
+from src.ui.renderer import Renderer
+from src.ui.profiler_overlay import ProfilerOverlay
+
+SPEED_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4]
+MAX_RENDER_INTERVAL = 8
 
 class BaseSimulation:
-    def __init__(self, title="Simulasi"):
-        self.screen = pygame.display.set_mode((LEBAR_LAYAR, TINGGI_LAYAR))
-        pygame.display.set_caption(title)
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 30)
+    def __init__(self, title="Simulasi", headless=False, seed=None):
+        # Mode headless tidak membuka jendela dan tidak memakai clock,
+        # sehingga simulasi bisa berjalan secepat CPU mengizinkan.
+        self.headless = headless
+        # Semua keacakan simulasi (posisi sel, otak acak, rumput) diambil dari generator ini,
+        # sehingga run dengan seed yang sama bisa diulang persis
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.random = random.Random(self.seed)
+        if headless:
+            self.screen = None
+            self.clock = None
+            self.font = None
+        else:
+            self.screen = pygame.display.set_mode((LEBAR_LAYAR, TINGGI_LAYAR))
+            pygame.display.set_caption(title)
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.Font(None, 30)
         self.running = True
         self.terrain = None
         self.cells = []
-        self.grass_patches = []
+        # Nomor generasi; hanya bertambah di mode latihan
+        self.generation_count = 1
+        self.tick_count = 0
+        self.population = None
+        # Peringkat fitness untuk garis tepi emas/perak, seleksi dan penyimpanan; dihitung ulang per tick
+        self.leaderboard = Leaderboard(self._current_fitness)
+        self.ranked_cells = []
+        # Grid dibangun ulang sekali per frame; ukuran petak memberi ruang untuk gerak satu frame
+        self.sensor_grid = SpatialHash(RADIUS_SEL + KECEPATAN_MAKS_SEL)
+        self.social_grid = SpatialHash(JARAK_DETEKSI_SOSIAL + KECEPATAN_MAKS_SEL)
+        self.grass_patches = GrassIndex()
+        # Posisi rumput baru dan jadwal tumbuh ulang; dibuat saat rumput pertama kali dibutuhkan
+        self.food = None
+        # Dibuat saat frame pertama digambar, setelah terrain dan rumput awal siap
+        self.renderer = None
         self.show_debug_text = False
+        self.profiler_overlay = None
+        self.speed_index = 0
+        self.render_every = RENDER_SETIAP_N_FRAME
+        # Selama dijeda tidak ada langkah simulasi dan loop hanya berjalan dengan FRAME_RATE (mis. replay)
+        self.paused = False
+        # Dipegang selama satu langkah simulasi; UI memegangnya untuk aksi yang menyentuh keadaan simulasi
+        self.lock = threading.RLock()
+        # (kotak lama, rumput baru) yang diganti simulasi, diterapkan ke latar renderer oleh thread UI
+        self.pending_grass = []
+        # Objek rumput dari slot yang sedang tumbuh ulang, dipakai lagi saat slotnya diisi
+        self.spare_grass = []
+        # Perekam replay (src/simulation/replay.py); aktif jika record_file diisi saat run()
+        self.record_file = REPLAY_FILE if REKAM_REPLAY else None
+        self.recorder = None
 
     def run(self):
         if self.terrain is None:
             print("Error: Terrain belum diatur untuk simulasi ini!")
             return
             
-        if not self.grass_patches:
-             while len(self.grass_patches) < JUMLAH_RUMPUT:
-                new_grass = Grass(self.terrain)
-                if new_grass.alive:
-                    self.grass_patches.append(new_grass)
+        self._spawn_initial_grass()
+        if self.record_file:
+            self.start_recording(self.record_file)
+        try:
+            if SIMULASI_DI_THREAD:
+                self._run_threaded()
+            else:
+                self._run_single_thread()
+        finally:
+            self.stop_recording()
+
+    def start_recording(self, filepath):
+        """Mulai merekam setiap tick ke file replay (terrain harus sudah diatur)."""
+        self.stop_recording()
+        self.recorder = ReplayRecorder(filepath, self.seed, self.terrain)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
 
+    def _run_single_thread(self):
+        accumulator = 0.0
+        previous = time.perf_counter()
+        frame = 0
         while self.running:
             self._handle_events()
+            now = time.perf_counter()
+            elapsed, previous = now - previous, now
+            accumulator = self._advance(elapsed, accumulator)
+
+            frame += 1
+            if frame % self.render_every == 0:
+                self._draw_elements()
+            self.clock.tick(0 if KECEPATAN_SIMULASI[self.speed_index] is None and not self.paused else FRAME_RATE)
+
+    def _run_threaded(self):
+        # Simulasi berjalan di SimulationStepper; loop ini hanya menangani input dan menggambar
+        # snapshot terbaru, sehingga jendela tetap responsif walau satu langkah simulasi lambat
+        stepper = SimulationStepper(self)
+        stepper.start()
+        try:
+            frame = 0
+            while self.running:
+                self._handle_events()
+                frame += 1
+                if frame % self.render_every == 0:
+                    self._draw_elements(stepper.snapshots.front)
+                self.clock.tick(FRAME_RATE)
+        finally:
+            self.running = False
+            stepper.stop()
+
+    def _advance(self, elapsed, accumulator):
+        """Menjalankan langkah simulasi yang jatuh tempo setelah `elapsed` detik waktu nyata.
+
+        Langkah waktu tetap: setiap _update_simulation() mewakili 1/FRAME_RATE detik waktu simulasi,
+        berapa pun frame yang benar-benar digambar. Mengembalikan sisa accumulator.
+        """
+        if self.paused:
+            return 0.0
+        tick_time = 1.0 / FRAME_RATE
+        speed = KECEPATAN_SIMULASI[self.speed_index]
+        if speed is None:
+            # Mode maksimum: isi satu jatah frame dengan langkah simulasi sebanyak mungkin
+            deadline = time.perf_counter() + tick_time
+            while self.running and not self.paused and time.perf_counter() < deadline:
+                self._step()
+            return 0.0
+        accumulator = min(accumulator + elapsed * speed, MAKS_TICK_PER_FRAME * tick_time)
+        while self.running and not self.paused and accumulator >= tick_time:
+            self._step()
+            accumulator -= tick_time
+        return accumulator
+
+    def _step(self):
+        with self.lock:
+            self.tick()
+
+    def tick(self):
+        """Satu langkah simulasi (1/FRAME_RATE detik), direkam jika perekam replay aktif."""
+        with PROFILER.scope('sim.total'):
+            self.leaderboard.invalidate()
             self._update_simulation()
-            self._draw_elements()
-            self.clock.tick(FRAME_RATE)
+            self.tick_count += 1
+            if self.recorder is not None:
+                with PROFILER.scope('sim.record'):
+                    self.recorder.record(self.tick_count, self.cells, self.population, self.grass_patches, self.generation_count)
+        PROFILER.end_frame('sim')
+
+    def _food_field(self):
+        if self.food is None or self.food.terrain is not self.terrain:
+            self.food = FoodField(self.terrain, np.random.default_rng(self.random.getrandbits(64)))
+        return self.food
+
+    def _spawn_initial_grass(self):
+        if not self.grass_patches:
+            for x, y, seed in self._food_field().take_many(JUMLAH_RUMPUT):
+                self.grass_patches.add(Grass.at(self.terrain, x, y, seed))
 
     def _handle_events(self):
+        if self.renderer is not None and self.renderer.camera.scrollable:
+            self.renderer.camera.handle_keys(pygame.key.get_pressed())
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -43,63 +189,198 @@ class BaseSimulation:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
-                self._handle_key_press(event)
+                with self.lock:
+                    self._handle_key_press(event)
 
     def _handle_key_press(self, event):
         if event.key == pygame.K_d:
             self.show_debug_text = not self.show_debug_text
+        elif event.key in SPEED_KEYS[:len(KECEPATAN_SIMULASI)]:
+            self.speed_index = SPEED_KEYS.index(event.key)
+        elif event.key == pygame.K_r:
+            self.render_every = self.render_every * 2 if self.render_every < MAX_RENDER_INTERVAL else 1
+        elif event.key == pygame.K_p:
+            # Pengukuran hanya berjalan selama overlay tampil (kecuali PROFIL_AKTIF)
+            self.profiler_overlay = None if self.profiler_overlay else ProfilerOverlay(PROFILER)
+            PROFILER.enable(self.profiler_overlay is not None or PROFIL_AKTIF)
 
     def _update_simulation(self):
-        for cell in self.cells[:]:
-            if cell.update(self.grass_patches, self.cells, self.terrain) == "mati":
+        self._regrow_grass()
+        if GUNAKAN_MESIN_VEKTOR:
+            self._update_population()
+            return
+        cells = self.cells[:]
+        with PROFILER.scope('sim.grid'):
+            xs, ys = [c.x for c in cells], [c.y for c in cells]
+            self.sensor_grid.rebuild(xs, ys, cells)
+            self.social_grid.rebuild(xs, ys, cells)
+        for i, cell in enumerate(cells):
+            with PROFILER.scope('sim.cells'):
+                status = cell.update(self.grass_patches, self.cells, self.terrain, self.sensor_grid, self.social_grid)
+            if status == "mati":
                 self.cells.remove(cell)
+                # Sinar hanya membaca jumlah titik per petak (tanpa cek is_alive), jadi sel mati
+                # dikeluarkan dari grid sensor seperti mesin vektor yang hanya melihat sel hidup
+                self.sensor_grid.discard(i)
             else:
-                self._check_grass_collision(cell)
+                with PROFILER.scope('sim.grass'):
+                    self._check_grass_collision(cell)
+
+    def _update_population(self):
+        # Bangun ulang store array jika daftar sel diganti (mis. generasi baru)
+        if self.population is None or self.population.cells is not self.cells:
+            self.population = Population(self.cells)
+        population = self.population
+        with PROFILER.scope('sim.grid'):
+            self.sensor_grid.rebuild(population.x, population.y)
+        population.update(self.grass_patches, self.terrain, self.sensor_grid, self.social_grid)
+        with PROFILER.scope('sim.grass'):
+            for i, grass in population.find_grass_hits(self.grass_patches):
+                population.feed(i)
+                self._replace_grass(grass)
+        with PROFILER.scope('sim.cleanup'):
+            population.remove_dead()
+
+    def sync_cells(self):
+        """Menyalin keadaan mesin vektor ke objek Cell; panggil sebelum membaca atribut Cell secara langsung."""
+        if self.population is not None and self.population.cells is self.cells:
+            self.population.sync_cells()
 
     def _check_grass_collision(self, cell):
-        for grass in self.grass_patches[:]:
-            if math.hypot(cell.x - grass.x, cell.y - grass.y) < RADIUS_SEL + grass.radius:
-                cell.energy = min(ENERGI_AWAL * 2, cell.energy + ENERGI_DARI_RUMPUT)
-                cell.fitness += BONUS_FITNESS_MAKAN
-                self.grass_patches.remove(grass)
-                
-                new_grass = None
-                while new_grass is None or not new_grass.alive:
-                    new_grass = Grass(self.terrain)
-                self.grass_patches.append(new_grass)
+        grass = self.grass_patches.first_overlapping(cell.x, cell.y, RADIUS_SEL)
+        if grass is not None:
+            cell.energy = min(ENERGI_AWAL * 2, cell.energy + ENERGI_DARI_RUMPUT)
+            cell.fitness += BONUS_FITNESS_MAKAN
+            self._replace_grass(grass)
+
+    def _replace_grass(self, grass):
+        """Rumput yang dimakan langsung dipindah ke tempat lain, atau slotnya menunggu tumbuh ulang.
+
+        Objek Grass yang sama dipakai ulang (Grass.reset), jadi memakan rumput tidak mengalokasi objek baru.
+        """
+        food = self._food_field()
+        spawn = food.take() if food.regrow_ticks == 0 else None
+        # Kotak lama diambil sebelum reset agar renderer bisa menghapus gambarnya
+        old_rect = grass.rect if self.renderer is not None else None
+        slot = self.grass_patches.remove(grass)
+        if spawn is not None:
+            grass.reset(self.terrain, *spawn)
+            self.grass_patches.place(slot, grass)
+            new_grass = grass
+        else:
+            new_grass = None
+            self.spare_grass.append(grass)
+            if food.regrow_ticks > 0:
+                food.schedule(slot, self.tick_count)
+        self._grass_changed(slot, old_rect, new_grass)
+
+    def _regrow_grass(self):
+        """Mengisi slot rumput yang jeda tumbuh ulangnya (WAKTU_TUMBUH_RUMPUT) sudah lewat."""
+        if self.food is None:
+            return
+        for slot in self.food.due(self.tick_count):
+            spawn = self.food.take()
+            if spawn is None:
                 break
+            if self.spare_grass:
+                new_grass = self.spare_grass.pop()
+                new_grass.reset(self.terrain, *spawn)
+            else:
+                new_grass = Grass.at(self.terrain, *spawn)
+            self.grass_patches.place(slot, new_grass)
+            self._grass_changed(slot, None, new_grass)
 
-    def _draw_elements(self):
-        self.terrain.draw(self.screen)
-
-        if self.cells:
-            sorted_cells = sorted(self.cells, key=lambda c: c.fitness, reverse=True)
-            for i, c in enumerate(self.cells):
-                if hasattr(c, 'outline_color'):
-                    c.outline_color = (10, 50, 100) if c.gender == 'male' else (100, 20, 60)
-            if len(sorted_cells) > 0 and hasattr(sorted_cells[0], 'outline_color'):
-                sorted_cells[0].outline_color = (255, 215, 0)
-            if len(sorted_cells) > 1 and hasattr(sorted_cells[1], 'outline_color'):
-                sorted_cells[1].outline_color = (192, 192, 192)
-        
-        for grass in self.grass_patches:
-            grass.draw(self.screen)
-        
-        for cell in self.cells:
-            # Mengirim daftar sel untuk keperluan visualisasi debug
-            cell.draw(self.screen, self.show_debug_text, self.cells)
-            
-        self._draw_info_text()
-        pygame.display.flip()
+    def _grass_changed(self, slot, old_rect, new_grass):
+        # new_grass None = slot dikosongkan; old_rect None = slot kosong diisi lagi (atau belum ada renderer)
+        if self.recorder is not None:
+            self.recorder.grass_replaced(slot, new_grass)
+        if self.renderer is not None:
+            self.pending_grass.append((old_rect, new_grass))
+
+    def _draw_elements(self, snapshot=None):
+        """Menggambar satu frame; snapshot diberikan oleh SimulationStepper saat simulasi di thread lain."""
+        with PROFILER.scope('draw.total'):
+            self._draw_frame(snapshot)
+        PROFILER.end_frame('draw')
+
+    def _draw_frame(self, snapshot):
+        with PROFILER.scope('draw.prepare'), self.lock:
+            if self.renderer is None:
+                self.renderer = self._create_renderer()
+            for old_rect, new_grass in self.pending_grass:
+                self.renderer.replace_grass(old_rect, new_grass)
+            self.pending_grass = []
+            if snapshot is None and self.renderer.atlas is not None:
+                snapshot = self.capture_snapshot()
+        # Terrain dan rumput sudah ada di latar yang di-cache; hanya area kotor yang dipulihkan
+        with PROFILER.scope('draw.background'):
+            self.renderer.begin_frame()
+
+        with PROFILER.scope('draw.cells'):
+            if self.renderer.atlas is not None:
+                self.renderer.draw_snapshot(snapshot)
+            else:
+                with self.lock:
+                    self.sync_cells()
+                    self._draw_cells_primitive()
+        if self.show_debug_text:
+            with PROFILER.scope('draw.debug'), self.lock:
+                self.sync_cells()
+                for cell in self.cells:
+                    # Mengirim daftar sel untuk keperluan visualisasi debug
+                    cell.draw_debug(self.screen, self.cells, self.renderer.offset)
+
+        with PROFILER.scope('draw.text'):
+            self._draw_info_text()
+            if self.profiler_overlay is not None:
+                self.profiler_overlay.draw(self.renderer)
+        # Gambar debug (sensor, garis target) bisa menjangkau seluruh layar
+        with PROFILER.scope('draw.flip'):
+            self.renderer.end_frame(full=self.show_debug_text)
+
+    def _create_renderer(self):
+        return Renderer(self.screen, self.terrain, self.grass_patches)
+
+    def capture_snapshot(self):
+        """Keadaan sel untuk digambar (CellSnapshot); dipanggil sambil memegang self.lock."""
+        return CellSnapshot.capture(self.cells, self.population)
+
+    @property
+    def cell_count(self):
+        return len(self.cells)
+
+    def _current_fitness(self):
+        # Mesin vektor menyimpan fitness sebagai array; tidak perlu dikumpulkan dari objek Cell
+        if self.population is not None and self.population.cells is self.cells:
+            return self.population.fitness
+        return [c.fitness for c in self.cells]
+
+    def _draw_cells_primitive(self):
+        # Hanya sel peringkat lama dan baru yang warna garis tepinya diganti
+        ranked = [self.cells[i] for i in self.leaderboard.top(len(RANK_OUTLINE_COLORS))]
+        for c in self.ranked_cells:
+            c.outline_color = GENDER_COLORS[c.gender][1]
+        for c, color in zip(ranked, RANK_OUTLINE_COLORS):
+            c.outline_color = color
+        self.ranked_cells = ranked
+        self.renderer.draw_cells(self.cells)
 
     def _draw_info_text(self):
-        info_sel = self.font.render(f"Jumlah Sel: {len(self.cells)}", True, WARNA_TEKS)
-        self.screen.blit(info_sel, (10, 40))
+        info_sel = self.font.render(f"Jumlah Sel: {self.cell_count}", True, WARNA_TEKS)
+        self.renderer.blit(info_sel, (10, 40))
 
         status_text = "ON" if self.show_debug_text else "OFF"
         color = (100, 255, 100) if self.show_debug_text else (255, 100, 100)
         info_debug = self.font.render(f"Mode Debug (D): {status_text}", True, color)
-        self.screen.blit(info_debug, (10, TINGGI_LAYAR - 70))
+        self.renderer.blit(info_debug, (10, TINGGI_LAYAR - 70))
+
+        speed = KECEPATAN_SIMULASI[self.speed_index]
+        speed_text = "maks" if speed is None else f"{speed}x"
+        info_speed = self.font.render(f"Kecepatan (1-4): {speed_text} | Render (R): 1/{self.render_every}", True, WARNA_TEKS)
+        self.renderer.blit(info_speed, (10, TINGGI_LAYAR - 100))
 
-        info_help = self.font.render("Tekan ESC untuk kembali ke menu", True, WARNA_TEKS)
-        self.screen.blit(info_help, (10, TINGGI_LAYAR - 40))
\ No newline at end of file
+        help_text = "Tekan ESC untuk kembali ke menu | P: profil"
+        if self.renderer.camera.scrollable:
+            help_text += " | Panah: geser kamera"
+        info_help = self.font.render(help_text, True, WARNA_TEKS)
+        self.renderer.blit(info_help, (10, TINGGI_LAYAR - 40))
\ No newline at end of file
@@ -0,0 +1,122 @@
+# src/simulation/food.py
+
+import heapq
+import weakref
+from collections import deque
+import numpy as np
+from settings import *
+from terrain import BIOMES
+
+# Bobot tumbuh per ID biome; rumput di air dan batu mati (lihat Grass.reset), jadi bobotnya selalu 0
+GROWTH_WEIGHTS = np.array([0.0 if biome in ('air', 'batu') else float(BOBOT_TUMBUH_RUMPUT.get(biome, 0.0))
+                           for biome in BIOMES])
+# Jumlah posisi yang diambil sekaligus setiap kali cadangan FoodField habis
+SPAWN_BATCH = 256
+# Batas putaran sampel penolakan di ChunkedTerrain sebelum menyerah (dunia tanpa tanah)
+MAX_REJECTION_ROUNDS = 64
+
+# Tabel per terrain dipakai bersama oleh semua simulasi (mis. shard latihan paralel) di proses ini
+_spawn_tables = weakref.WeakKeyDictionary()
+
+class SpawnTable:
+    """Semua piksel tempat rumput bisa tumbuh beserta bobotnya, dihitung sekali per Terrain.
+
+    Piksel disimpan sebagai indeks datar raster biome_map (x * tinggi + y). Jika semua bobot sama,
+    sampel cukup berupa indeks acak; jika tidak, dicari di jumlah kumulatif bobot (searchsorted).
+    """
+    def __init__(self, terrain):
+        self.height = terrain.height
+        weight_map = GROWTH_WEIGHTS[terrain.biome_map].ravel()
+        self.pixels = np.flatnonzero(weight_map > 0)
+        weights = weight_map[self.pixels]
+        self.cumulative = None if np.all(weights == weights[:1]) else np.cumsum(weights)
+
+    @classmethod
+    def of(cls, terrain):
+        table = _spawn_tables.get(terrain)
+        if table is None:
+            table = _spawn_tables[terrain] = cls(terrain)
+        return table
+
+    def sample(self, rng, count):
+        """(xs, ys) sebanyak count piksel acak sebanding bobotnya; kosong jika tidak ada tanah."""
+        if not len(self.pixels):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        if self.cumulative is None:
+            chosen = rng.integers(len(self.pixels), size=count)
+        else:
+            chosen = np.searchsorted(self.cumulative, rng.random(count) * self.cumulative[-1], side='right')
+        return np.divmod(self.pixels[chosen], self.height)
+
+class FoodField:
+    """Sumber posisi rumput baru dan jadwal tumbuh ulang rumput yang dimakan.
+
+    Posisi (x, y, seed) diambil dalam batch sebanding BOBOT_TUMBUH_RUMPUT lalu disimpan sebagai
+    cadangan, sehingga setiap rumput baru cukup mengambil satu entri tanpa loop coba-ulang. Untuk
+    Terrain dipakai SpawnTable; ChunkedTerrain tidak punya raster utuh, jadi titik acak diuji
+    sekaligus dengan get_biome_ids (sampel penolakan tervektor).
+
+    Dengan WAKTU_TUMBUH_RUMPUT > 0 slot rumput yang dimakan dikosongkan dan baru diisi lagi
+    setelah jeda itu (lihat BaseSimulation._regrow_grass).
+    """
+    def __init__(self, terrain, rng):
+        # rng: np.random.Generator milik simulasi
+        self.terrain = terrain
+        self.rng = rng
+        self.table = SpawnTable.of(terrain) if getattr(terrain, 'biome_map', None) is not None else None
+        self.regrow_ticks = int(round(WAKTU_TUMBUH_RUMPUT * FRAME_RATE))
+        self._reserve = deque()
+        # (tick jatuh tempo, slot) terurut sebagai heap
+        self._regrowing = []
+
+    def take(self):
+        """(x, y, seed) untuk satu rumput baru, atau None jika dunia tidak punya tanah."""
+        if not self._reserve:
+            self._refill(SPAWN_BATCH)
+        return self._reserve.popleft() if self._reserve else None
+
+    def take_many(self, count):
+        """Sampai count posisi sekaligus (lebih sedikit hanya jika dunia tidak punya tanah)."""
+        if len(self._reserve) < count:
+            self._refill(count - len(self._reserve))
+        return [self._reserve.popleft() for _ in range(min(count, len(self._reserve)))]
+
+    def schedule(self, slot, tick):
+        """Slot rumput yang dimakan pada tick ini tumbuh lagi setelah regrow_ticks."""
+        heapq.heappush(self._regrowing, (tick + self.regrow_ticks, slot))
+
+    def due(self, tick):
+        """Slot yang sudah waktunya tumbuh lagi, urut dari yang paling lama menunggu."""
+        slots = []
+        while self._regrowing and self._regrowing[0][0] <= tick:
+            slots.append(heapq.heappop(self._regrowing)[1])
+        return slots
+
+    @property
+    def regrowing(self):
+        return len(self._regrowing)
+
+    def _refill(self, count):
+        count = max(count, SPAWN_BATCH)
+        xs, ys = self.table.sample(self.rng, count) if self.table is not None else self._sample_chunked(count)
+        seeds = self.rng.integers(2 ** 32, size=len(xs), dtype=np.uint32)
+        self._reserve.extend(zip(xs.tolist(), ys.tolist(), seeds.tolist()))
+
+    def _sample_chunked(self, count):
+        width, height = self.terrain.width, self.terrain.height
+        top = GROWTH_WEIGHTS.max()
+        found_x, found_y, found = [], [], 0
+        for _ in range(MAX_REJECTION_ROUNDS):
+            if found >= count or top <= 0:
+                break
+            # Ambil lebih banyak dari yang dibutuhkan karena sebagian jatuh di air/batu
+            batch = 2 * (count - found)
+            xs = self.rng.integers(width, size=batch)
+            ys = self.rng.integers(height, size=batch)
+            accepted = self.rng.random(batch) * top < GROWTH_WEIGHTS[self.terrain.get_biome_ids(xs, ys)]
+            found_x.append(xs[accepted])
+            found_y.append(ys[accepted])
+            found += int(accepted.sum())
+        if not found:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(found_x)[:count], np.concatenate(found_y)[:count]
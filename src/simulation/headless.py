@@ -0,0 +1,102 @@
+# src/simulation/headless.py
+
+import time
+from settings import *
+from src.simulation.modes import TrainingMode
+from src.utils.checkpoint import CheckpointWriter
+from src.utils.genome_metrics import MetricsLog
+
+class HeadlessTrainer:
+    """Menjalankan TrainingMode tanpa jendela pygame dan tanpa batas frame rate."""
+    # Trainer paralel/pulau tidak punya TrainingMode di proses utama
+    game = None
+
+    def __init__(self, terrain, start_from_scratch=True, save_every=10, log_every=1, brain_file=BRAIN_FILE,
+                 seed=SEED_EVOLUSI, save_seconds=AUTOSAVE_SETIAP_DETIK, record_file=None, metrics_file=None):
+        self.game = TrainingMode(start_from_scratch=start_from_scratch, headless=True, seed=seed, brain_file=brain_file)
+        self.game.terrain = terrain
+        self.game._spawn_initial_grass()
+        self._init_progress(save_every, log_every, brain_file, save_seconds, metrics_file)
+        self.game.metrics_log = self.metrics_log
+        if record_file:
+            self.game.start_recording(record_file)
+
+    def _init_progress(self, save_every, log_every, brain_file, save_seconds=AUTOSAVE_SETIAP_DETIK, metrics_file=None):
+        self.save_every = save_every
+        self.save_seconds = save_seconds
+        self.log_every = log_every
+        self.brain_file = brain_file
+        self.generations_done = 0
+        self.frames_done = 0
+        # Thread penulis checkpoint dibuat saat checkpoint pertama disimpan; ditutup oleh close()
+        self.writer = None
+        # Metrik keragaman genom per generasi (src/utils/genome_metrics.py); None = tidak dicatat ke file
+        self.metrics_log = MetricsLog(metrics_file) if metrics_file else None
+
+    @property
+    def generation(self):
+        """Nomor generasi yang sedang berjalan."""
+        return self.game.generation_count
+
+    @property
+    def best_fitness(self):
+        return self.game.best_fitness
+
+    def run(self, max_generations=0):
+        """Melatih sampai max_generations generasi selesai (0 = tanpa batas)."""
+        start_time = time.perf_counter()
+        log_time = start_time
+        log_generations = 0
+        self.last_save_time = start_time
+        try:
+            while max_generations <= 0 or self.generations_done < max_generations:
+                self._run_generation()
+                self.generations_done += 1
+                log_generations += 1
+                if (self.save_every > 0 and self.generations_done % self.save_every == 0) or \
+                        (self.save_seconds > 0 and time.perf_counter() - self.last_save_time >= self.save_seconds):
+                    self.save_checkpoint()
+                if self.log_every > 0 and self.generations_done % self.log_every == 0:
+                    now = time.perf_counter()
+                    rate = log_generations / max(now - log_time, 1e-9)
+                    print(f"[headless] Generasi {self.generation - 1} selesai | "
+                          f"fitness terbaik {self.best_fitness:.1f} | {rate:.2f} gen/s")
+                    log_time, log_generations = now, 0
+        except KeyboardInterrupt:
+            print("\n[headless] Dihentikan oleh pengguna.")
+        finally:
+            try:
+                self.save_checkpoint()
+            finally:
+                # Checkpoint terakhir harus benar-benar tertulis sebelum proses berakhir
+                self.close()
+            if self.game is not None:
+                self.game.stop_recording()
+
+        elapsed = time.perf_counter() - start_time
+        print(f"[headless] {self.generations_done} generasi, {self.frames_done} frame dalam {elapsed:.1f}s "
+              f"({self.generations_done / max(elapsed, 1e-9):.2f} gen/s, {self.frames_done / max(elapsed, 1e-9):.0f} frame/s)")
+
+    def _run_generation(self):
+        """Menjalankan frame simulasi sampai generasi saat ini berakhir."""
+        generation_before = self.game.generation_count
+        while self.game.generation_count == generation_before:
+            self.game.tick()
+            self.frames_done += 1
+
+    def _checkpoint(self):
+        # Otak induk dari generasi terakhir yang selesai; sebelum itu, sel yang sedang berjalan
+        return self.game.parents_checkpoint()
+
+    def save_checkpoint(self):
+        """Menyerahkan checkpoint ke thread penulis; latihan langsung berlanjut. Panggil close() setelahnya."""
+        if self.writer is None:
+            self.writer = CheckpointWriter()
+        self.writer.submit(self._checkpoint(), self.brain_file)
+        self.last_save_time = time.perf_counter()
+
+    def close(self):
+        """Menunggu checkpoint yang tertunda selesai ditulis lalu menghentikan thread penulis."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -0,0 +1,123 @@
+# src/simulation/islands.py
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from settings import *
+from neural_network import breed_genomes, random_genomes, GENOME_LENGTH
+from src.simulation.headless import HeadlessTrainer
+from src.simulation.parallel import evaluate_shard, evolve_genomes
+from src.utils.checkpoint import BrainCheckpoint
+from src.utils.genome_metrics import generation_metrics, summary
+
+def run_island_generation(genomes, world_seed, frames, rng_seed):
+    """Dijalankan di proses worker: evaluasi lalu evolusi satu pulau selama satu generasi.
+
+    Hanya matriks genom float32 yang dikirim bolak-balik, bukan objek Cell.
+    Mengembalikan (genom_anak, genom_induk_terurut, fitness_induk, fitness_terbaik, jumlah_frame, fitness).
+    """
+    fitness, alive, frames_run = evaluate_shard(genomes, world_seed, frames, rng_seed)
+    children, parents, parent_fitness, best_fitness = evolve_genomes(genomes, fitness, alive, len(genomes),
+                                                                      np.random.default_rng(rng_seed))
+    return children, parents, parent_fitness, best_fitness, frames_run, fitness
+
+class IslandTrainer(HeadlessTrainer):
+    """Evolusi model pulau: K subpopulasi berevolusi terpisah dan sesekali bertukar migran.
+
+    Setiap migration_interval generasi, pulau ke-i mengirim `migrants` genom induk terbaiknya
+    ke pulau ke-(i+1) (topologi cincin), menggantikan anak terakhir di pulau tujuan.
+    """
+    def __init__(self, population_size=JUMLAH_SEL_AWAL, islands=4, migration_interval=5, migrants=2,
+                 workers=None, world_seed=None, start_from_scratch=True,
+                 save_every=10, log_every=1, brain_file=BRAIN_FILE, seed=SEED_EVOLUSI,
+                 save_seconds=AUTOSAVE_SETIAP_DETIK, metrics_file=None):
+        self._init_progress(save_every, log_every, brain_file, save_seconds, metrics_file)
+        self.rng = np.random.default_rng(seed)
+        self.num_islands = max(1, min(islands, population_size))
+        # Sisa pembagian dibagikan ke pulau-pulau pertama agar total sel tetap population_size
+        base, extra = divmod(population_size, self.num_islands)
+        self.island_sizes = [base + (i < extra) for i in range(self.num_islands)]
+        self.migration_interval = migration_interval
+        self.migrants = min(migrants, min(self.island_sizes))
+        self.workers = max(1, min(workers or os.cpu_count() or 1, self.num_islands))
+        self.world_seed = world_seed
+        self.generation_frame_limit = GENERATION_TIME_SECS * FRAME_RATE
+        self.generation_count = 1
+        self._best_fitness = 0
+        self.island_parents = [np.empty((0, GENOME_LENGTH), dtype=np.float32)] * self.num_islands
+        self.island_parent_fitness = [np.empty(0)] * self.num_islands
+        self.pool = None
+
+        checkpoint = None if start_from_scratch else BrainCheckpoint.load(brain_file)
+        if checkpoint is not None and checkpoint.parents:
+            if seed is None and checkpoint.rng_state is not None:
+                self.rng.bit_generator.state = checkpoint.rng_state
+            self.generation_count = checkpoint.generation + 1
+            self.islands = [breed_genomes(checkpoint.parent_genomes, size, self.rng) for size in self.island_sizes]
+        else:
+            self.islands = [random_genomes(size, self.rng) for size in self.island_sizes]
+
+    @property
+    def generation(self):
+        return self.generation_count
+
+    @property
+    def best_fitness(self):
+        return self._best_fitness
+
+    def run(self, max_generations=0):
+        sizes = str(self.island_sizes[0]) if len(set(self.island_sizes)) == 1 else '/'.join(map(str, self.island_sizes))
+        print(f"[pulau] {self.num_islands} pulau x {sizes} sel, migrasi {self.migrants} otak "
+              f"setiap {self.migration_interval} generasi, {self.workers} worker.")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            self.pool = pool
+            try:
+                super().run(max_generations)
+            finally:
+                self.pool = None
+
+    def _run_generation(self):
+        futures = []
+        for i, genomes in enumerate(self.islands):
+            world_seed = None if self.world_seed is None else self.world_seed + i
+            futures.append(self.pool.submit(run_island_generation, genomes, world_seed,
+                                            self.generation_frame_limit, int(self.rng.integers(2 ** 63))))
+        results = [future.result() for future in futures]
+        # Metrik dihitung atas seluruh pulau sekaligus, dari genom yang baru saja dievaluasi
+        metrics = generation_metrics(np.concatenate(self.islands), np.concatenate([r[5] for r in results]),
+                                     self.generation_count, np.random.default_rng(self.rng.integers(2 ** 63)))
+        if self.metrics_log is not None:
+            self.metrics_log.append(metrics, mode='pulau', islands=self.num_islands)
+        self.islands = [r[0] for r in results]
+        self.island_parents = [r[1] for r in results]
+        self.island_parent_fitness = [r[2] for r in results]
+        best_per_island = [r[3] for r in results]
+        self.frames_done += sum(r[4] for r in results)
+        self._best_fitness = max(best_per_island)
+
+        print(f"Generasi {self.generation_count} -> {self.generation_count + 1}. Fitness terbaik per pulau: "
+              + ", ".join(f"{f:.0f}" for f in best_per_island) + f" ({summary(metrics)}).")
+        self.generation_count += 1
+        if self.migration_interval > 0 and (self.generation_count - 1) % self.migration_interval == 0:
+            self._migrate()
+
+    def _migrate(self):
+        """Menyalin genom induk terbaik setiap pulau ke pulau berikutnya dalam cincin."""
+        if self.num_islands < 2 or self.migrants <= 0:
+            return
+        outgoing = [parents[:self.migrants].copy() for parents in self.island_parents]
+        for i, migrants in enumerate(outgoing):
+            if not len(migrants):
+                continue
+            target = self.islands[(i + 1) % self.num_islands]
+            target[-len(migrants):] = migrants
+        print(f"[pulau] Migrasi: {sum(len(m) for m in outgoing)} otak berpindah pulau.")
+
+    def _checkpoint(self):
+        # Induk semua pulau digabung lalu diurutkan ulang berdasarkan fitness
+        rng_state = self.rng.bit_generator.state
+        parents = np.concatenate(self.island_parents)
+        if not len(parents):
+            return BrainCheckpoint(np.concatenate(self.islands), generation=self.generation_count, rng_state=rng_state)
+        return BrainCheckpoint.from_population(parents, np.concatenate(self.island_parent_fitness),
+                                               self.generation_count - 1, rng=self.rng)
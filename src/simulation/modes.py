@@ -1,32 +1,65 @@
 # src/simulation/modes.py
 
-import random
+import time
+import numpy as np
 import pygame # <-- Pastikan pygame diimpor
 from settings import *
+from grass import Grass
+from terrain import create_terrain
 from src.entity.cell import Cell, NeuralNetwork
+from neural_network import breed_genomes, GENOME_LENGTH
 from src.simulation.base_simulation import BaseSimulation
+from src.simulation.replay import ReplayPlayer
+from src.ui.renderer import Renderer
+from src.utils.checkpoint import BrainCheckpoint, CheckpointWriter
+from src.utils.genome_metrics import MetricsLog, generation_metrics, summary
+from src.utils.profiler import PROFILER
 
 class TrainingMode(BaseSimulation):
-    def __init__(self, start_from_scratch=True):
-        super().__init__(title="Mode Latihan")
-        self.generation_count = 1
+    def __init__(self, start_from_scratch=True, headless=False, seed=SEED_EVOLUSI, brain_file=BRAIN_FILE):
+        super().__init__(title="Mode Latihan", headless=headless, seed=seed)
+        # Generator acak khusus reproduksi agar evolusi bisa diulang dengan seed yang sama
+        self.rng = np.random.default_rng(seed)
+        self.brain_file = brain_file
+        # Mode headless diatur oleh HeadlessTrainer yang punya jadwal simpan sendiri
+        self.autosave = not headless
+        self.metrics_log = MetricsLog(METRICS_FILE) if CATAT_METRIK and not headless else None
+        self.checkpoint_writer = None
+        self.last_save_time = time.monotonic()
         self.generation_timer = 0
         self.generation_frame_limit = GENERATION_TIME_SECS * FRAME_RATE
         self.save_indicator_timer = 0
+        # Otak induk (terurut dari fitness tertinggi) dari generasi terakhir yang selesai
+        self.fittest_brains = []
+        self.fittest_fitness = []
+        self.best_fitness = 0
         
         if start_from_scratch:
             print("Memulai sesi latihan baru dari awal.")
-            self.cells = [Cell() for _ in range(JUMLAH_SEL_AWAL)]
+            self.cells = [Cell(rng=self.random) for _ in range(JUMLAH_SEL_AWAL)]
         else:
             print("Mencoba melanjutkan latihan dari file...")
-            trained_brains = NeuralNetwork.load_brains(BRAIN_FILE)
-            if not trained_brains:
+            checkpoint = BrainCheckpoint.load(brain_file)
+            if checkpoint is None or not checkpoint.parents:
                 print("File otak tidak ditemukan. Memulai dari awal.")
-                self.cells = [Cell() for _ in range(JUMLAH_SEL_AWAL)]
+                self.cells = [Cell(rng=self.random) for _ in range(JUMLAH_SEL_AWAL)]
             else:
                 print("Berhasil memuat otak. Melanjutkan latihan...")
-                self.cells = self._create_new_population(trained_brains)
+                # Tanpa seed eksplisit, lanjutkan urutan acak evolusi dari checkpoint
+                if seed is None and checkpoint.rng_state is not None:
+                    self.rng.bit_generator.state = checkpoint.rng_state
+                self.generation_count = checkpoint.generation + 1
+                self.cells = self._create_new_population(checkpoint.parent_genomes)
     
+    def run(self):
+        try:
+            super().run()
+        finally:
+            # Simpanan dari tombol S atau autosave terakhir harus tertulis sebelum keluar
+            if self.checkpoint_writer is not None:
+                self.checkpoint_writer.close()
+                self.checkpoint_writer = None
+
     def _handle_key_press(self, event):
         super()._handle_key_press(event)
         if event.key == pygame.K_s:
@@ -38,15 +71,44 @@ class TrainingMode(BaseSimulation):
         if self.save_indicator_timer > 0:
             self.save_indicator_timer -= 1
         if self.generation_timer >= self.generation_frame_limit or not self.cells:
-            self._evolve_next_generation()
+            with PROFILER.scope('sim.evolve'):
+                self._evolve_next_generation()
+            if self.autosave and AUTOSAVE_SETIAP_GENERASI > 0 and (self.generation_count - 1) % AUTOSAVE_SETIAP_GENERASI == 0:
+                self._autosave()
+        if self.autosave and AUTOSAVE_SETIAP_DETIK > 0 and time.monotonic() - self.last_save_time >= AUTOSAVE_SETIAP_DETIK:
+            self._autosave()
+
+    def _autosave(self):
+        print(f"Simpan otomatis generasi {self.generation_count - 1}...")
+        self._submit_checkpoint(self.parents_checkpoint())
+
+    def _submit_checkpoint(self, checkpoint):
+        # Serialisasi dan penulisan file terjadi di thread penulis, bukan di thread simulasi/render
+        if self.checkpoint_writer is None:
+            self.checkpoint_writer = CheckpointWriter()
+        self.checkpoint_writer.submit(checkpoint, self.brain_file)
+        self.last_save_time = time.monotonic()
 
     def _save_fittest_brains(self):
         if not self.cells: return
-        self.cells.sort(key=lambda c: c.fitness, reverse=True)
-        fittest_brains = [cell.brain for cell in self.cells[:10]]
-        NeuralNetwork.save_brains(BRAIN_FILE, fittest_brains)
+        self._submit_checkpoint(self.current_checkpoint())
         self.save_indicator_timer = 120
 
+    def current_checkpoint(self):
+        """Seluruh populasi yang sedang berjalan, terurut dari fitness tertinggi (urutan self.cells tetap)."""
+        genomes = np.array([cell.brain.to_genome() for cell in self.cells], dtype=np.float32).reshape(len(self.cells), -1)
+        fitness = self.leaderboard.fitness
+        parents = max(1, int(len(self.cells) * SELECTION_PERCENT)) if self.cells else 0
+        return BrainCheckpoint.from_population(genomes, fitness, self.generation_count, parents, self.rng)
+
+    def parents_checkpoint(self):
+        """Induk generasi terakhir yang selesai, atau populasi berjalan jika belum ada."""
+        if not self.fittest_brains:
+            return self.current_checkpoint()
+        genomes = np.stack([brain.to_genome() for brain in self.fittest_brains]).astype(np.float32)
+        return BrainCheckpoint(genomes, np.array(self.fittest_fitness), self.generation_count - 1,
+                               rng_state=self.rng.bit_generator.state)
+
     # vvv FUNGSI YANG DIPERBAIKI vvv
     def _draw_info_text(self):
         # Panggil metode dasar untuk info jumlah sel
@@ -57,46 +119,153 @@ class TrainingMode(BaseSimulation):
         info_time = self.font.render(f"Waktu: {self.generation_timer // FRAME_RATE}s", True, WARNA_TEKS)
         info_save_prompt = self.font.render("Tekan 'S' untuk menyimpan otak", True, WARNA_TEKS)
         
-        self.screen.blit(info_gen, (10, 10))
-        self.screen.blit(info_time, (10, 70))
-        self.screen.blit(info_save_prompt, (LEBAR_LAYAR - info_save_prompt.get_width() - 10, 10))
+        self.renderer.blit(info_gen, (10, 10))
+        self.renderer.blit(info_time, (10, 70))
+        self.renderer.blit(info_save_prompt, (LEBAR_LAYAR - info_save_prompt.get_width() - 10, 10))
 
         # Tampilkan indikator saat menyimpan
         if self.save_indicator_timer > 0:
             save_indicator_text = self.font.render("Otak berhasil disimpan!", True, (100, 255, 100))
             text_rect = save_indicator_text.get_rect(topright=(LEBAR_LAYAR - 10, 40))
-            self.screen.blit(save_indicator_text, text_rect)
+            self.renderer.blit(save_indicator_text, text_rect)
     # ^^^ FUNGSI YANG DIPERBAIKI ^^^
 
     def _evolve_next_generation(self):
         self.generation_count += 1
         self.generation_timer = 0
-        self.cells.sort(key=lambda c: c.fitness, reverse=True)
-        num_to_select = int(len(self.cells) * SELECTION_PERCENT)
-        fittest_cells = self.cells[:num_to_select]
-        
+        self.sync_cells()
+        selected = self.leaderboard.select(SELECTION_PERCENT)
+        fittest_cells = [self.cells[i] for i in selected]
+        self.best_fitness = self.leaderboard.best()
+        self.fittest_brains = [c.brain for c in fittest_cells]
+        self.fittest_fitness = [c.fitness for c in fittest_cells]
+        genomes = np.array([cell.brain.to_genome() for cell in self.cells]).reshape(len(self.cells), GENOME_LENGTH)
+        metrics = generation_metrics(genomes, self.leaderboard.fitness, self.generation_count - 1,
+                                     np.random.default_rng(self.rng.integers(2 ** 63)))
+        if self.metrics_log is not None:
+            self.metrics_log.append(metrics, mode='latihan')
+
         if not fittest_cells:
             print(f"Generasi {self.generation_count-1} punah.")
-            self.cells = [Cell() for _ in range(JUMLAH_SEL_AWAL)]
+            self.cells = [Cell(rng=self.random) for _ in range(JUMLAH_SEL_AWAL)]
         else:
-            print(f"Generasi {self.generation_count-1} -> {self.generation_count}. {len(fittest_cells)} sel terbaik bertahan.")
-            brains = [c.brain for c in fittest_cells]
-            self.cells = self._create_new_population(brains)
-
-    def _create_new_population(self, parent_brains):
-        new_cells = []
-        while len(new_cells) < JUMLAH_SEL_AWAL:
-            p1, p2 = random.choices(parent_brains, k=2)
-            child_brain = NeuralNetwork.crossover(p1, p2)
-            child_brain.mutate(MUTATION_RATE, MUTATION_STRENGTH)
-            new_cells.append(Cell(brain=child_brain))
-        return new_cells
+            median_fitness = self.leaderboard.percentile(50)
+            print(f"Generasi {self.generation_count-1} -> {self.generation_count}. {len(fittest_cells)} sel terbaik bertahan "
+                  f"(fitness terbaik {self.best_fitness:.1f}, median {median_fitness:.1f}; {summary(metrics)}).")
+            self.cells = self._create_new_population(genomes[selected])
+        self.leaderboard.invalidate()
+
+    def _create_new_population(self, parent_genomes):
+        children = breed_genomes(parent_genomes, JUMLAH_SEL_AWAL, self.rng)
+        return [Cell(brain=NeuralNetwork.from_genome(genome), rng=self.random) for genome in children]
 
 class SandboxMode(BaseSimulation):
-    def __init__(self):
-        super().__init__(title="Mode Sandbox")
-        trained_brains = NeuralNetwork.load_brains(BRAIN_FILE)
-        if not trained_brains:
-            self.cells = [Cell() for _ in range(JUMLAH_SEL_AWAL)]
+    def __init__(self, seed=None):
+        super().__init__(title="Mode Sandbox", seed=seed)
+        checkpoint = BrainCheckpoint.load(BRAIN_FILE)
+        if checkpoint is None or not checkpoint.parents:
+            self.cells = [Cell(rng=self.random) for _ in range(JUMLAH_SEL_AWAL)]
         else:
-            self.cells = [Cell(brain=random.choice(trained_brains)) for _ in range(JUMLAH_SEL_AWAL)]
\ No newline at end of file
+            # Hanya genom induk yang terpilih yang dibaca dari file yang di-memmap
+            self.cells = [Cell(brain=checkpoint.brain(self.random.randrange(checkpoint.parents)), rng=self.random)
+                          for _ in range(JUMLAH_SEL_AWAL)]
+
+REPLAY_JUMP_SECS = 10
+
+class ReplayMode(BaseSimulation):
+    """Memutar ulang file replay: keadaan sel dibaca dari rekaman, otak sel tidak dijalankan.
+
+    Satu tick simulasi = satu tick rekaman, jadi tombol kecepatan 1-4 tetap berlaku.
+    Spasi: jeda, Page Up/Down: lompat mundur/maju, Home/End: awal/akhir rekaman.
+    """
+    def __init__(self, replay_file=REPLAY_FILE):
+        super().__init__(title="Mode Replay")
+        self.record_file = None
+        self.player = ReplayPlayer.load(replay_file)
+        self.snapshot = None
+
+    def run(self):
+        if self.player is None:
+            return
+        world = self.player.header['world']
+        if self.terrain is None or (world['seed'] is not None and
+                                    (self.terrain.seed, self.terrain.width, self.terrain.height) !=
+                                    (world['seed'], world['width'], world['height'])):
+            # Dunia tersimpan bukan dunia rekaman: buat ulang dari seed tanpa menimpa file dunia
+            print(f"Info: Replay direkam di dunia lain (seed {world['seed']}). Membuat ulang dunianya...")
+            self.terrain = create_terrain(world['width'], world['height'], seed=world['seed'], use_cache=False)
+        try:
+            super().run()
+        finally:
+            self.player.close()
+
+    def _create_renderer(self):
+        # Replay hanya punya snapshot (tanpa objek Cell), jadi selalu digambar dengan atlas sprite
+        return Renderer(self.screen, self.terrain, self.grass_patches, use_atlas=True)
+
+    def capture_snapshot(self):
+        return self.snapshot
+
+    @property
+    def cell_count(self):
+        return len(self.snapshot) if self.snapshot is not None else 0
+
+    def _spawn_initial_grass(self):
+        self.player.seek(self.player.first_tick)
+        self._apply_player_state()
+
+    def _update_simulation(self):
+        if self.paused:
+            return
+        if not self.player.step():
+            self.paused = True
+            return
+        self._apply_player_state()
+
+    def _apply_player_state(self):
+        player = self.player
+        self.snapshot = player.snapshot
+        self.generation_count = player.generation
+        slots = range(len(player.grass)) if player.changed_slots is None else player.changed_slots
+        patches = self.grass_patches
+        for slot in slots:
+            state = player.grass[slot]
+            old_grass = patches.patches[slot] if slot < patches.slot_count else None
+            old_state = None if old_grass is None else (old_grass.x, old_grass.y, old_grass.seed)
+            if old_state == state:
+                continue
+            # state None = slot kosong (rumputnya sedang tumbuh ulang)
+            new_grass = None if state is None else Grass.at(self.terrain, *state)
+            if old_grass is None:
+                patches.place(slot, new_grass)
+            elif new_grass is None:
+                patches.remove(old_grass)
+            else:
+                patches.replace(old_grass, new_grass)
+            if self.renderer is not None:
+                self.pending_grass.append((None if old_grass is None else old_grass.rect, new_grass))
+
+    def _handle_key_press(self, event):
+        super()._handle_key_press(event)
+        jump = REPLAY_JUMP_SECS * self.player.frame_rate
+        if event.key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN, pygame.K_HOME, pygame.K_END):
+            target = {pygame.K_PAGEUP: self.player.tick - jump, pygame.K_PAGEDOWN: self.player.tick + jump,
+                      pygame.K_HOME: self.player.first_tick, pygame.K_END: self.player.last_tick}[event.key]
+            self.player.seek(target)
+            self._apply_player_state()
+
+    def _draw_info_text(self):
+        super()._draw_info_text()
+        player = self.player
+        elapsed = (player.tick - player.first_tick) // player.frame_rate
+        total = (player.last_tick - player.first_tick) // player.frame_rate
+        status = " (jeda)" if self.paused else ""
+        info_gen = self.font.render(f"Generasi: {self.generation_count}", True, WARNA_TEKS)
+        info_time = self.font.render(f"Replay: {elapsed // 60}:{elapsed % 60:02d} / {total // 60}:{total % 60:02d}{status}",
+                                     True, WARNA_TEKS)
+        info_keys = self.font.render("Spasi: jeda | PgUp/PgDn: lompat | Home/End", True, WARNA_TEKS)
+        self.renderer.blit(info_gen, (10, 10))
+        self.renderer.blit(info_time, (10, 70))
+        self.renderer.blit(info_keys, (LEBAR_LAYAR - info_keys.get_width() - 10, 10))
\ No newline at end of file
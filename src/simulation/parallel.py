@@ -0,0 +1,148 @@
+# src/simulation/parallel.py
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from settings import *
+from terrain import create_terrain
+from neural_network import NeuralNetwork, breed_genomes, random_genomes, GENOME_LENGTH
+from src.entity.cell import Cell
+from src.simulation.base_simulation import BaseSimulation
+from src.simulation.headless import HeadlessTrainer
+from src.utils.checkpoint import BrainCheckpoint
+from src.utils.leaderboard import top_indices
+from src.utils.genome_metrics import generation_metrics, summary
+
+# Terrain disimpan per proses worker agar tidak dibuat ulang setiap generasi
+_worker_terrains = {}
+
+def _get_worker_terrain(world_seed):
+    if world_seed not in _worker_terrains:
+        if world_seed is None:
+            # Dunia yang sama dengan mode latihan biasa (dari file cache dunia)
+            _worker_terrains[world_seed] = create_terrain(LEBAR_DUNIA, TINGGI_DUNIA, headless=True)
+        else:
+            _worker_terrains[world_seed] = create_terrain(LEBAR_DUNIA, TINGGI_DUNIA, seed=world_seed, headless=True, use_cache=False)
+    return _worker_terrains[world_seed]
+
+def evaluate_shard(genomes, world_seed, frames, rng_seed):
+    """Dijalankan di proses worker: mensimulasikan satu pecahan populasi selama satu generasi.
+
+    Mengembalikan (fitness, alive, jumlah_frame) dengan urutan yang sama seperti genomes.
+    """
+    simulation = BaseSimulation(headless=True, seed=rng_seed)
+    simulation.terrain = _get_worker_terrain(world_seed)
+    cells = [Cell(brain=NeuralNetwork.from_genome(genome), rng=simulation.random) for genome in genomes]
+    simulation.cells = list(cells)
+    simulation._spawn_initial_grass()
+    frames_run = 0
+    while frames_run < frames and simulation.cells:
+        simulation.tick()
+        frames_run += 1
+    simulation.sync_cells()
+
+    # Sel mati sudah dikeluarkan dari simulation.cells dan tidak ikut seleksi
+    survivors = {id(c) for c in simulation.cells}
+    fitness = np.array([c.fitness for c in cells], dtype=np.float64)
+    alive = np.array([id(c) in survivors for c in cells], dtype=bool)
+    return fitness, alive, frames_run
+
+def evolve_genomes(genomes, fitness, alive, count, rng):
+    """Seleksi truncation + reproduksi pada matriks genom, seperti TrainingMode._evolve_next_generation.
+
+    Mengembalikan (genom_generasi_baru, genom_induk_terurut, fitness_induk, fitness_terbaik).
+    """
+    survivors = np.nonzero(alive)[0]
+    num_to_select = int(len(survivors) * SELECTION_PERCENT)
+    # Hanya induk (dan sel terbaik) yang perlu diurutkan, bukan seluruh populasi
+    survivors = survivors[top_indices(fitness[survivors], max(num_to_select, 1))]
+    parents = genomes[survivors[:num_to_select]]
+    parent_fitness = fitness[survivors[:num_to_select]]
+    best_fitness = float(fitness[survivors[0]]) if len(survivors) else 0
+
+    if not len(parents):
+        children = random_genomes(count, rng, genomes.shape[1])
+    else:
+        children = breed_genomes(parents, count, rng)
+    return children, parents, parent_fitness, best_fitness
+
+class ParallelTrainer(HeadlessTrainer):
+    """Mengevaluasi setiap generasi secara paralel di beberapa proses worker.
+
+    Populasi dibagi menjadi pecahan; setiap worker menjalankan loop BaseSimulation headless
+    dengan salinan Terrain sendiri. Koordinator mengumpulkan fitness, lalu melakukan seleksi
+    dan reproduksi seperti TrainingMode._evolve_next_generation.
+    """
+    def __init__(self, population_size=JUMLAH_SEL_AWAL, workers=None, world_seed=None, start_from_scratch=True,
+                 save_every=10, log_every=1, brain_file=BRAIN_FILE, seed=SEED_EVOLUSI,
+                 save_seconds=AUTOSAVE_SETIAP_DETIK, metrics_file=None):
+        self._init_progress(save_every, log_every, brain_file, save_seconds, metrics_file)
+        self.rng = np.random.default_rng(seed)
+        self.population_size = population_size
+        self.workers = max(1, min(workers or os.cpu_count() or 1, population_size))
+        self.world_seed = world_seed
+        self.generation_frame_limit = GENERATION_TIME_SECS * FRAME_RATE
+        self.generation_count = 1
+        self._best_fitness = 0
+        self.parents = np.empty((0, GENOME_LENGTH), dtype=np.float32)
+        self.parent_fitness = np.empty(0)
+
+        checkpoint = None if start_from_scratch else BrainCheckpoint.load(brain_file)
+        if checkpoint is not None and checkpoint.parents:
+            if seed is None and checkpoint.rng_state is not None:
+                self.rng.bit_generator.state = checkpoint.rng_state
+            self.generation_count = checkpoint.generation + 1
+            self.genomes = breed_genomes(checkpoint.parent_genomes, population_size, self.rng)
+        else:
+            self.genomes = random_genomes(population_size, self.rng)
+        self.pool = None
+
+    @property
+    def generation(self):
+        return self.generation_count
+
+    @property
+    def best_fitness(self):
+        return self._best_fitness
+
+    def run(self, max_generations=0):
+        print(f"[paralel] {self.population_size} sel dibagi ke {self.workers} worker.")
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            self.pool = pool
+            try:
+                super().run(max_generations)
+            finally:
+                self.pool = None
+
+    def _run_generation(self):
+        shards = np.array_split(self.genomes, self.workers)
+        seeds = [None if self.world_seed is None else self.world_seed + i for i in range(len(shards))]
+        futures = [self.pool.submit(evaluate_shard, shard, seed, self.generation_frame_limit, int(self.rng.integers(2 ** 63)))
+                   for shard, seed in zip(shards, seeds)]
+        results = [future.result() for future in futures]
+        fitness = np.concatenate([r[0] for r in results])
+        alive = np.concatenate([r[1] for r in results])
+        self.frames_done += sum(r[2] for r in results)
+        self._evolve_next_generation(fitness, alive)
+
+    def _evolve_next_generation(self, fitness, alive):
+        metrics = generation_metrics(self.genomes, fitness, self.generation_count,
+                                     np.random.default_rng(self.rng.integers(2 ** 63)))
+        if self.metrics_log is not None:
+            self.metrics_log.append(metrics, mode='paralel')
+        self.generation_count += 1
+        self.genomes, self.parents, self.parent_fitness, self._best_fitness = evolve_genomes(
+            self.genomes, fitness, alive, self.population_size, self.rng)
+        parents = self.parents
+        if not len(parents):
+            print(f"Generasi {self.generation_count-1} punah.")
+        else:
+            print(f"Generasi {self.generation_count-1} -> {self.generation_count}. {len(parents)} sel terbaik bertahan "
+                  f"({summary(metrics)}).")
+
+    def _checkpoint(self):
+        rng_state = self.rng.bit_generator.state
+        if len(self.parents):
+            return BrainCheckpoint(self.parents, self.parent_fitness, self.generation_count - 1, rng_state=rng_state)
+        # Belum ada generasi yang selesai (atau punah): simpan populasi yang akan dievaluasi
+        return BrainCheckpoint(self.genomes, generation=self.generation_count, rng_state=rng_state)
@@ -0,0 +1,193 @@
+# src/simulation/population.py
+import math
+import numpy as np
+from settings import *
+from neural_network import BrainBank
+from terrain import BIOME_AIR, SPEED_MULTIPLIER, ENERGY_COST, SENSOR_VALUE
+from src.entity.cell import POSSIBLE_STATES
+from src.entity.sensors import ray_directions, ray_points, march_terrain, march_cells
+from src.utils.spatial import SpatialHash, GrassIndex
+from src.utils.profiler import PROFILER
+
+STATE_IDLE, STATE_WANDERING, STATE_FORAGING, STATE_RUNNING = (POSSIBLE_STATES.index(s) for s in ('idle', 'wandering', 'foraging', 'running'))
+
+class Population:
+    """Menyimpan seluruh sel sebagai array NumPy (structure-of-arrays) dan memperbaruinya sekaligus.
+
+    Indeks ke-i setiap array selalu sesuai dengan self.cells[i]. Berbeda dengan Cell.update yang
+    berjalan satu per satu, semua sel di sini melihat posisi sel lain dari awal frame yang sama.
+    """
+    def __init__(self, cells: list):
+        self.cells = cells
+        self.x = np.array([c.x for c in cells], dtype=np.float64)
+        self.y = np.array([c.y for c in cells], dtype=np.float64)
+        self.angle = np.array([c.angle for c in cells], dtype=np.float64)
+        self.energy = np.array([c.energy for c in cells], dtype=np.float64)
+        self.fitness = np.array([c.fitness for c in cells], dtype=np.float64)
+        self.state = np.array([POSSIBLE_STATES.index(c.state) for c in cells], dtype=np.int8)
+        self.speed = np.array([c.current_speed for c in cells], dtype=np.float64)
+        self.leg_cycle = np.array([c.leg_animation_cycle for c in cells], dtype=np.float64)
+        self.male = np.array([c.gender == 'male' for c in cells], dtype=bool)
+        self.brains = BrainBank(c.brain for c in cells)
+        self.target = np.full(len(cells), -1, dtype=np.intp)
+        self.target_grass = [None] * len(cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def update(self, grass_patches: GrassIndex, terrain, sensor_grid: SpatialHash, social_grid: SpatialHash):
+        """Satu langkah simulasi untuk seluruh sel: sensor, otak, gerak, status.
+
+        sensor_grid harus sudah berisi posisi sel saat ini; social_grid diisi ulang di sini
+        setelah semua sel bergerak.
+        """
+        if not self.cells:
+            return
+        with PROFILER.scope('sim.sensors'):
+            biome_at_cell = terrain.get_biome_ids(self.x, self.y)
+            inputs = self._get_brain_inputs(grass_patches, terrain, sensor_grid)
+        with PROFILER.scope('sim.predict'):
+            outputs = self.brains.predict(inputs)
+
+        with PROFILER.scope('sim.move'):
+            self.state = np.argmax(outputs[:, 3:], axis=1).astype(np.int8)
+            self._process_brain_outputs(outputs, biome_at_cell)
+            self._move()
+        with PROFILER.scope('sim.social'):
+            social_grid.rebuild(self.x, self.y)
+            self._update_social_fitness(social_grid)
+        with PROFILER.scope('sim.status'):
+            self._update_status(biome_at_cell)
+            self.leg_cycle = (self.leg_cycle + self.speed * 2.5) % 360
+
+    def find_grass_hits(self, grass_patches: GrassIndex) -> list:
+        """Mengembalikan pasangan (indeks sel, rumput) yang dimakan, diselesaikan sesuai urutan sel."""
+        if not grass_patches or not self.cells:
+            return []
+        alive = np.nonzero(self.energy > 0)[0]
+        rows, slots = grass_patches.overlap_pairs(self.x[alive], self.y[alive], RADIUS_SEL)
+        # Hanya sel yang benar-benar menyentuh rumput yang diproses satu per satu
+        order = np.lexsort((slots, rows))
+        hits = []
+        eaten = set()
+        for row, slot in zip(rows[order].tolist(), slots[order].tolist()):
+            cell_index = int(alive[row])
+            if slot not in eaten and (not hits or hits[-1][0] != cell_index):
+                eaten.add(slot)
+                hits.append((cell_index, grass_patches.patches[slot]))
+        return hits
+
+    def feed(self, i: int):
+        self.energy[i] = min(ENERGI_AWAL * 2, self.energy[i] + ENERGI_DARI_RUMPUT)
+        self.fitness[i] += BONUS_FITNESS_MAKAN
+
+    def remove_dead(self):
+        """Membuang sel mati dari array dan dari list sel (list yang sama tetap dipakai)."""
+        alive = self.energy > 0
+        if alive.all():
+            return
+        # Sel yang dibuang tidak lagi disinkronkan nanti, jadi nilai terakhirnya disalin sekarang
+        self.sync_cells(np.nonzero(~alive)[0].tolist())
+        keep = np.nonzero(alive)[0]
+        for name in ('x', 'y', 'angle', 'energy', 'fitness', 'state', 'speed', 'leg_cycle', 'male', 'target'):
+            setattr(self, name, getattr(self, name)[keep])
+        self.cells[:] = [self.cells[i] for i in keep]
+        self.brains.keep(keep)
+        self.target_grass = [self.target_grass[i] for i in keep]
+
+    def sync_cells(self, indices=None):
+        """Menyalin nilai array kembali ke objek Cell (semua, atau hanya indices).
+
+        Tidak dipanggil setiap tick: pemanggil menyinkronkan hanya saat objek Cell benar-benar dibaca
+        (gambar primitif/debug, akhir generasi). Fitness untuk peringkat dibaca langsung dari array.
+        """
+        for i in range(len(self.cells)) if indices is None else indices:
+            cell = self.cells[i]
+            cell.x = float(self.x[i])
+            cell.y = float(self.y[i])
+            cell.angle = float(self.angle[i])
+            cell.energy = float(self.energy[i])
+            cell.fitness = float(self.fitness[i])
+            cell.state = POSSIBLE_STATES[self.state[i]]
+            cell.current_speed = float(self.speed[i])
+            cell.leg_animation_cycle = float(self.leg_cycle[i])
+            cell.target_grass = self.target_grass[i]
+
+    def _get_brain_inputs(self, grass_patches: GrassIndex, terrain, sensor_grid: SpatialHash) -> np.ndarray:
+        n = len(self.cells)
+        inputs = np.empty((n, NUM_INPUTS))
+
+        # Input dasar (makanan & energi)
+        if not grass_patches:
+            inputs[:, 0] = 1.0
+            inputs[:, 1] = 0.0
+            self.target[:] = -1
+            self.target_grass = [None] * n
+        else:
+            self.target = grass_patches.nearest_slots(self.x, self.y)
+            self.target_grass = [grass_patches.patches[g] for g in self.target]
+            dist_x = np.take(grass_patches.xs, self.target) - self.x
+            dist_y = np.take(grass_patches.ys, self.target) - self.y
+            distance = np.hypot(dist_x, dist_y)
+            angle_to_grass = np.arctan2(dist_y, dist_x)
+            inputs[:, 0] = np.minimum(distance, LEBAR_LAYAR) / LEBAR_LAYAR
+            angle_diff = np.mod(angle_to_grass - self.angle + math.pi, 2 * math.pi) - math.pi
+            inputs[:, 1] = angle_diff / math.pi
+        inputs[:, 2] = self.energy / ENERGI_AWAL
+
+        # Input dari sensor terrain dan sensor sel
+        ray_cos, ray_sin = ray_directions(self.angle)
+        sensor_x = self.x[:, None] + JARAK_PENGLIHATAN_SEL * ray_cos
+        sensor_y = self.y[:, None] + JARAK_PENGLIHATAN_SEL * ray_sin
+        sensors = JUMLAH_SENSOR_TERRAIN
+        if SENSOR_SINAR:
+            # Ujung sensor adalah sampel terakhir sinar, jadi biome-nya tidak perlu dicari lagi
+            sample_x, sample_y = ray_points(self.x, self.y, ray_cos, ray_sin)
+            end_biomes, inputs[:, 3 + 2 * sensors:3 + 3 * sensors] = march_terrain(terrain, sample_x, sample_y)
+            inputs[:, 3 + 3 * sensors:] = march_cells(sensor_grid, self.x, self.y, sample_x, sample_y)
+        else:
+            end_biomes = terrain.get_biome_ids(sensor_x, sensor_y)
+        inputs[:, 3:3 + sensors] = SENSOR_VALUE[end_biomes]
+        inputs[:, 3 + sensors:3 + 2 * sensors] = self._detect_cells(sensor_x, sensor_y, sensor_grid)
+        return inputs
+
+    def _detect_cells(self, sensor_x: np.ndarray, sensor_y: np.ndarray, sensor_grid: SpatialHash) -> np.ndarray:
+        sensor_ids, other = sensor_grid.query_pairs(sensor_x, sensor_y, RADIUS_SEL)
+        # Sensor tidak boleh mendeteksi selnya sendiri
+        owner = sensor_ids // sensor_x.shape[1]
+        detected = np.zeros(sensor_x.size)
+        detected[sensor_ids[other != owner]] = 1.0
+        return detected.reshape(sensor_x.shape)
+
+    def _process_brain_outputs(self, outputs: np.ndarray, biome_ids: np.ndarray):
+        turn_left, turn_right, speed_control = outputs[:, 0], outputs[:, 1], outputs[:, 2]
+        max_speed_on_terrain = KECEPATAN_MAKS_SEL * SPEED_MULTIPLIER[biome_ids]
+        state = self.state
+
+        turn_factor = np.select([state == STATE_IDLE, state == STATE_RUNNING], [0.0, 0.5], default=1.0)
+        self.angle = self.angle + (turn_right - turn_left) * TURN_STRENGTH * turn_factor
+        self.speed = np.select(
+            [state == STATE_IDLE, state == STATE_WANDERING, state == STATE_FORAGING],
+            [0.0, max_speed_on_terrain * 0.4, (speed_control + 1) / 2 * max_speed_on_terrain],
+            default=max_speed_on_terrain)
+
+    def _move(self):
+        self.x = np.clip(self.x + self.speed * np.cos(self.angle), 0, LEBAR_DUNIA)
+        self.y = np.clip(self.y + self.speed * np.sin(self.angle), 0, TINGGI_DUNIA)
+
+    def _update_status(self, biome_ids: np.ndarray):
+        in_water = biome_ids == BIOME_AIR
+        speed_ratio = self.speed / KECEPATAN_MAKS_SEL if KECEPATAN_MAKS_SEL > 0 else np.zeros_like(self.speed)
+        base_energy_cost = ENERGI_DIAM + speed_ratio * ENERGI_BERGERAK
+        state_multiplier = np.select([self.state == STATE_RUNNING, self.state == STATE_IDLE], [2.5, 0.5], default=1.0)
+        total_energy_cost = base_energy_cost * ENERGY_COST[biome_ids] * state_multiplier
+
+        # Sel di air hanya kehilangan fitness, tanpa biaya energi
+        self.energy = np.where(in_water, self.energy, self.energy - total_energy_cost)
+        fitness_delta = np.where(self.state == STATE_IDLE, 0.5, 1.0)
+        self.fitness = self.fitness + np.where(in_water, -2.0, fitness_delta)
+
+    def _update_social_fitness(self, social_grid: SpatialHash):
+        cell_ids, other = social_grid.query_pairs(self.x, self.y, JARAK_DETEKSI_SOSIAL)
+        nearby_friends = np.bincount(cell_ids[other != cell_ids], minlength=len(self.cells))
+        self.fitness += np.where(nearby_friends >= 5, BONUS_FITNESS_SOSIAL, 0)
@@ -0,0 +1,261 @@
+# src/simulation/replay.py
+
+import os
+import json
+import math
+import struct
+import zlib
+import bisect
+import numpy as np
+from settings import *
+from src.simulation.stepper import CellSnapshot
+
+# Tata letak file (little-endian); selama merekam data hanya ditambahkan di akhir file:
+#   [magic 8 byte][versi uint32][panjang header uint32][header JSON]
+#   lalu rekaman berurutan, satu per tick: [jenis uint8][tick uint32][panjang data uint32][data zlib]
+# KEYFRAME berisi keadaan lengkap (sel + semua rumput); TICK hanya perubahan sejak tick sebelumnya.
+MAGIC = b'AIREPLAY'
+FORMAT_VERSION = 2
+# Versi 1 sama persis, hanya belum pernah berisi slot rumput kosong
+SUPPORTED_VERSIONS = (1, 2)
+PREFIX = struct.Struct('<8sII')
+RECORD = struct.Struct('<BII')
+KEYFRAME, TICK = 1, 2
+KEYFRAME_COUNTS = struct.Struct('<III')  # generasi, jumlah sel, jumlah rumput
+TICK_COUNTS = struct.Struct('<II')       # jumlah sel yang mati, jumlah rumput yang berganti
+# Rumput (x, y, seed) untuk slot yang kosong karena rumputnya sedang tumbuh ulang
+VACANT_GRASS = (0xFFFFFFFF, 0, 0)
+
+# Kolom sel di keyframe (float32) dan di rekaman tick; fase kaki tidak disimpan per tick karena
+# selalu bisa dihitung dari kecepatan: leg_cycle = (leg_cycle + speed * 2.5) % 360
+KEYFRAME_FIELDS = ('x', 'y', 'angle', 'leg_cycle', 'speed', 'energy', 'fitness')
+TICK_FIELDS_F32 = ('x', 'y', 'fitness')
+# float16 cukup presisi untuk menggambar (sudut disimpan dalam rentang [0, 2pi))
+TICK_FIELDS_F16 = ('angle', 'speed', 'energy')
+
+class ReplayRecorder:
+    """Merekam jalannya simulasi ke file replay: keyframe berkala ditambah perubahan setiap tick.
+
+    Yang direkam hanya keadaan yang dibutuhkan untuk menggambar (posisi, arah, kecepatan, energi,
+    fitness sel dan rumput), sehingga pemutaran tidak perlu menjalankan otak sel. Keyframe baru
+    juga ditulis setiap kali daftar sel diganti (generasi baru).
+    """
+    def __init__(self, filepath, seed, terrain, keyframe_interval=REPLAY_KEYFRAME_SETIAP):
+        self.filepath = filepath
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.ticks_written = 0
+        self._cells = None
+        self._ids = []
+        self._keyframe_tick = None
+        self._grass_events = []
+        header = json.dumps({
+            'seed': seed,
+            'world': {'width': terrain.width, 'height': terrain.height,
+                      'seed': None if terrain.seed is None else int(terrain.seed)},
+            'frame_rate': FRAME_RATE,
+            'keyframe_interval': self.keyframe_interval,
+        }).encode('utf-8')
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.file = open(filepath, 'wb')
+        self.file.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        self.file.write(header)
+        print(f"Merekam replay ke {filepath} (seed {seed}).")
+
+    def grass_replaced(self, slot, grass):
+        """Mencatat rumput baru di slot GrassIndex (None = slot dikosongkan); ikut ditulis bersama tick berikutnya."""
+        self._grass_events.append((slot, *(VACANT_GRASS if grass is None else (grass.x, grass.y, grass.seed))))
+
+    def record(self, tick, cells, population, grass_patches, generation=1):
+        """Merekam keadaan setelah tick; dipanggil tepat sekali setiap tick simulasi."""
+        snapshot = CellSnapshot.capture(cells, population)
+        removed = None
+        if cells is self._cells and tick - self._keyframe_tick < self.keyframe_interval:
+            removed = self._removed_indices(cells)
+        if removed is None:
+            self._write_keyframe(tick, cells, snapshot, grass_patches, generation)
+        else:
+            self._write_tick(tick, snapshot, removed)
+        self._grass_events = []
+        self.ticks_written += 1
+
+    def _removed_indices(self, cells):
+        # Di antara dua keyframe, list sel yang sama hanya bisa menyusut (sel mati dibuang, urutan tetap)
+        if len(cells) == len(self._ids):
+            return np.empty(0, dtype=np.int32)
+        index_of = {cell_id: i for i, cell_id in enumerate(self._ids)}
+        try:
+            kept = [index_of[id(cell)] for cell in cells]
+        except KeyError:
+            return None
+        self._ids = [id(cell) for cell in cells]
+        return np.setdiff1d(np.arange(len(index_of)), kept).astype(np.int32)
+
+    def _write_keyframe(self, tick, cells, snapshot, grass_patches, generation):
+        grass = np.array([VACANT_GRASS if g is None else (g.x, g.y, g.seed) for g in grass_patches.patches],
+                         dtype=np.uint32).reshape(-1, 3)
+        columns = np.array([getattr(snapshot, name) for name in KEYFRAME_FIELDS], dtype=np.float32)
+        payload = b''.join((KEYFRAME_COUNTS.pack(generation, len(snapshot), len(grass)), columns.tobytes(),
+                            snapshot.male.astype(np.uint8).tobytes(), grass.tobytes()))
+        self._write(KEYFRAME, tick, payload)
+        self._cells = cells
+        self._ids = [id(cell) for cell in cells]
+        self._keyframe_tick = tick
+        # Rekaman yang terputus (mis. crash) tetap bisa diputar sampai keyframe terakhir
+        self.file.flush()
+
+    def _write_tick(self, tick, snapshot, removed):
+        exact = np.array([getattr(snapshot, name) for name in TICK_FIELDS_F32], dtype=np.float32)
+        approx = np.array([np.mod(snapshot.angle, 2 * math.pi), snapshot.speed, snapshot.energy], dtype=np.float16)
+        grass = np.array(self._grass_events, dtype=np.uint32).reshape(-1, 4)
+        payload = b''.join((TICK_COUNTS.pack(len(removed), len(grass)), removed.tobytes(),
+                            exact.tobytes(), approx.tobytes(), grass.tobytes()))
+        self._write(TICK, tick, payload)
+
+    def _write(self, kind, tick, payload):
+        data = zlib.compress(payload, 1)
+        self.file.write(RECORD.pack(kind, tick, len(data)))
+        self.file.write(data)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            print(f"✅ Replay {self.ticks_written} tick disimpan ke {self.filepath}")
+
+class ReplayPlayer:
+    """Memutar file replay tanpa menjalankan otak sel: keadaan sel dan rumput dibaca dari rekaman.
+
+    Saat dimuat hanya kepala setiap rekaman yang dibaca (indeks tick -> posisi file), sehingga
+    lompat ke tick mana pun cukup membaca keyframe terdekat sebelumnya lalu menerapkan
+    perubahan per tick sesudahnya.
+    """
+    def __init__(self, filepath, header, records):
+        self.filepath = filepath
+        self.header = header
+        self.frame_rate = header.get('frame_rate', FRAME_RATE)
+        self.records = records
+        self.ticks = [tick for _, tick, _, _ in records]
+        self.keyframes = [i for i, (kind, _, _, _) in enumerate(records) if kind == KEYFRAME]
+        self.file = open(filepath, 'rb')
+        self.position = -1
+        self.generation = 1
+        self.snapshot = None
+        # Rumput per slot GrassIndex sebagai (x, y, seed); changed_slots None = semua bisa berubah
+        self.grass = []
+        self.changed_slots = None
+
+    @classmethod
+    def load(cls, filepath):
+        """Membaca indeks file replay; mengembalikan None jika file tidak ada atau rusak."""
+        if not os.path.exists(filepath):
+            print(f"Info: File replay '{filepath}' tidak ditemukan.")
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                magic, version, header_length = PREFIX.unpack(f.read(PREFIX.size))
+                if magic != MAGIC:
+                    print(f"❌ {filepath} bukan file replay.")
+                    return None
+                if version not in SUPPORTED_VERSIONS:
+                    print(f"❌ Versi file replay {version} tidak didukung (diharapkan {FORMAT_VERSION}).")
+                    return None
+                header = json.loads(f.read(header_length).decode('utf-8'))
+                records = []
+                offset = PREFIX.size + header_length
+                file_size = os.fstat(f.fileno()).st_size
+                while offset + RECORD.size <= file_size:
+                    kind, tick, length = RECORD.unpack(f.read(RECORD.size))
+                    if offset + RECORD.size + length > file_size:
+                        break  # Rekaman terakhir terpotong (perekaman berhenti mendadak)
+                    records.append((kind, tick, offset + RECORD.size, length))
+                    offset += RECORD.size + length
+                    f.seek(offset)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"❌ Gagal memuat replay dari file: {e}")
+            return None
+        # Rekaman sebelum keyframe pertama tidak bisa diputar
+        while records and records[0][0] != KEYFRAME:
+            records.pop(0)
+        if not records:
+            print(f"❌ File replay {filepath} tidak berisi keyframe.")
+            return None
+        print(f"✅ Replay {len(records)} tick dimuat dari {filepath}")
+        return cls(filepath, header, records)
+
+    @property
+    def tick(self):
+        return self.ticks[max(self.position, 0)]
+
+    @property
+    def first_tick(self):
+        return self.ticks[0]
+
+    @property
+    def last_tick(self):
+        return self.ticks[-1]
+
+    def step(self):
+        """Maju satu tick. Mengembalikan False jika rekaman sudah habis."""
+        if self.position + 1 >= len(self.records):
+            return False
+        self._apply(self.position + 1)
+        return True
+
+    def seek(self, tick):
+        """Lompat ke tick (dibatasi ke rentang rekaman) lewat keyframe terdekat sebelumnya."""
+        target = max(0, bisect.bisect_right(self.ticks, tick) - 1)
+        keyframe = self.keyframes[bisect.bisect_right(self.keyframes, target) - 1]
+        if not (keyframe <= self.position <= target):
+            self._apply(keyframe)
+        while self.position < target:
+            self._apply(self.position + 1)
+        self.changed_slots = None
+
+    def _apply(self, position):
+        kind, _, offset, length = self.records[position]
+        self.file.seek(offset)
+        payload = zlib.decompress(self.file.read(length))
+        if kind == KEYFRAME:
+            self._apply_keyframe(payload)
+        else:
+            self._apply_tick(payload)
+        self.position = position
+
+    def _apply_keyframe(self, payload):
+        self.generation, count, grass_count = KEYFRAME_COUNTS.unpack_from(payload)
+        offset = KEYFRAME_COUNTS.size
+        cells = np.frombuffer(payload, np.float32, len(KEYFRAME_FIELDS) * count, offset).reshape(-1, count)
+        offset += cells.nbytes
+        male = np.frombuffer(payload, np.uint8, count, offset).astype(bool)
+        offset += count
+        grass = np.frombuffer(payload, np.uint32, 3 * grass_count, offset).reshape(-1, 3)
+        self.snapshot = CellSnapshot(*cells.astype(np.float64), male)
+        self.grass = [None if g[0] == VACANT_GRASS[0] else tuple(g) for g in grass.tolist()]
+        self.changed_slots = None
+
+    def _apply_tick(self, payload):
+        removed_count, grass_count = TICK_COUNTS.unpack_from(payload)
+        offset = TICK_COUNTS.size
+        removed = np.frombuffer(payload, np.int32, removed_count, offset)
+        offset += removed.nbytes
+        previous = self.snapshot
+        count = len(previous) - removed_count
+        exact = np.frombuffer(payload, np.float32, len(TICK_FIELDS_F32) * count, offset).reshape(-1, count)
+        offset += exact.nbytes
+        approx = np.frombuffer(payload, np.float16, len(TICK_FIELDS_F16) * count, offset).reshape(-1, count)
+        offset += approx.nbytes
+        events = np.frombuffer(payload, np.uint32, 4 * grass_count, offset).reshape(-1, 4)
+
+        keep = np.delete(np.arange(len(previous)), removed)
+        x, y, fitness = exact.astype(np.float64)
+        angle, speed, energy = approx.astype(np.float64)
+        leg_cycle = (previous.leg_cycle[keep] + speed * 2.5) % 360
+        self.snapshot = CellSnapshot(x, y, angle, leg_cycle, speed, energy, fitness, previous.male[keep])
+        self.changed_slots = []
+        for slot, grass_x, grass_y, seed in events.tolist():
+            self.grass[slot] = None if grass_x == VACANT_GRASS[0] else (grass_x, grass_y, seed)
+            self.changed_slots.append(slot)
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,93 @@
+# src/simulation/stepper.py
+
+import threading
+import time
+import numpy as np
+from settings import *
+
+class CellSnapshot:
+    """Salinan ringkas keadaan semua sel (array NumPy) yang cukup untuk menggambar satu frame.
+
+    Snapshot tidak pernah diubah setelah dibuat, sehingga UI bisa membacanya tanpa kunci
+    selagi simulasi terus berjalan.
+    """
+    def __init__(self, x, y, angle, leg_cycle, speed, energy, fitness, male):
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.leg_cycle = leg_cycle
+        self.speed = speed
+        self.energy = energy
+        self.fitness = fitness
+        self.male = male
+
+    def __len__(self):
+        return len(self.x)
+
+    @classmethod
+    def capture(cls, cells, population=None):
+        """Mengambil snapshot dari array Population jika masih sesuai, atau dari objek Cell."""
+        if population is not None and population.cells is cells:
+            return cls(population.x.copy(), population.y.copy(), population.angle.copy(), population.leg_cycle.copy(),
+                       population.speed.copy(), population.energy.copy(), population.fitness.copy(), population.male.copy())
+        return cls(np.array([c.x for c in cells], dtype=np.float64),
+                   np.array([c.y for c in cells], dtype=np.float64),
+                   np.array([c.angle for c in cells], dtype=np.float64),
+                   np.array([c.leg_animation_cycle for c in cells], dtype=np.float64),
+                   np.array([c.current_speed for c in cells], dtype=np.float64),
+                   np.array([c.energy for c in cells], dtype=np.float64),
+                   np.array([c.fitness for c in cells], dtype=np.float64),
+                   np.array([c.gender == 'male' for c in cells], dtype=bool))
+
+class SnapshotBuffer:
+    """Double buffer snapshot: simulasi mengisi snapshot baru (back) lalu menukarnya menjadi front.
+
+    UI selalu membaca front terbaru; snapshot lama dibuang setelah tidak dipakai lagi.
+    """
+    def __init__(self, snapshot=None):
+        self.front = snapshot
+        self.published = 0
+
+    def publish(self, snapshot):
+        # Penggantian referensi bersifat atomik, jadi pembaca tidak pernah melihat snapshot setengah jadi
+        self.front = snapshot
+        self.published += 1
+
+class SimulationStepper(threading.Thread):
+    """Menjalankan langkah simulasi di thread terpisah dengan langkah waktu tetap.
+
+    Setiap langkah memegang simulation.lock; thread UI memegang kunci yang sama hanya untuk
+    aksi yang menyentuh keadaan simulasi (tombol, gambar debug, rumput yang berganti).
+    """
+    def __init__(self, simulation):
+        super().__init__(name="simulation-stepper", daemon=True)
+        self.simulation = simulation
+        self.snapshots = SnapshotBuffer(self._capture())
+        self._stop_event = threading.Event()
+
+    def _capture(self):
+        with self.simulation.lock:
+            return self.simulation.capture_snapshot()
+
+    def run(self):
+        simulation = self.simulation
+        tick_time = 1.0 / FRAME_RATE
+        accumulator = 0.0
+        previous = time.perf_counter()
+        while simulation.running and not self._stop_event.is_set():
+            now = time.perf_counter()
+            elapsed, previous = now - previous, now
+            accumulator = simulation._advance(elapsed, accumulator)
+            self.snapshots.publish(self._capture())
+
+            speed = KECEPATAN_SIMULASI[simulation.speed_index]
+            if simulation.paused:
+                self._stop_event.wait(tick_time)
+            elif speed is not None:
+                # Tidur sampai langkah berikutnya jatuh tempo (dalam waktu nyata)
+                self._stop_event.wait(max(0.0, (tick_time - accumulator) / speed))
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,48 @@
+# src/ui/camera.py
+
+import pygame
+from settings import *
+
+class Camera:
+    """Jendela pandang seukuran layar di atas dunia; (x, y) adalah sudut kiri atasnya di koordinat dunia.
+
+    Posisi selalu bilangan bulat dan dibatasi agar pandangan tidak keluar dari dunia
+    (kecuali dunia lebih kecil dari layar, maka kamera tetap di (0, 0)).
+    """
+    def __init__(self, view_width=LEBAR_LAYAR, view_height=TINGGI_LAYAR, world_width=LEBAR_DUNIA, world_height=TINGGI_DUNIA):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def scrollable(self):
+        return self.world_width > self.view_width or self.world_height > self.view_height
+
+    @property
+    def offset(self):
+        return self.x, self.y
+
+    @property
+    def rect(self):
+        """Area dunia yang sedang terlihat."""
+        return pygame.Rect(self.x, self.y, self.view_width, self.view_height)
+
+    def move_to(self, x, y):
+        self.x = int(max(0, min(x, self.world_width - self.view_width)))
+        self.y = int(max(0, min(y, self.world_height - self.view_height)))
+
+    def move(self, dx, dy):
+        self.move_to(self.x + dx, self.y + dy)
+
+    def center_on(self, x, y):
+        self.move_to(x - self.view_width // 2, y - self.view_height // 2)
+
+    def handle_keys(self, pressed):
+        """Menggeser kamera dengan tombol panah yang sedang ditekan (hasil pygame.key.get_pressed())."""
+        dx = (pressed[pygame.K_RIGHT] - pressed[pygame.K_LEFT]) * KECEPATAN_KAMERA
+        dy = (pressed[pygame.K_DOWN] - pressed[pygame.K_UP]) * KECEPATAN_KAMERA
+        if dx or dy:
+            self.move(dx, dy)
@@ -53,8 +53,9 @@ class MainMenu(BaseMenu):
         self.buttons = {
             "train": Button(btn_x, 200, btn_width, btn_height, "Mulai Latihan", (0, 100, 200), (0, 150, 255)),
             "sandbox": Button(btn_x, 280, btn_width, btn_height, "Buka Sandbox", (0, 150, 100), (0, 200, 150)),
-            "world_menu": Button(btn_x, 360, btn_width, btn_height, "Pengaturan Dunia", (100, 100, 100), (150, 150, 150)),
-            "quit": Button(btn_x, 440, btn_width, btn_height, "Keluar", (200, 50, 50), (255, 100, 100))
+            "replay": Button(btn_x, 360, btn_width, btn_height, "Putar Replay", (140, 90, 180), (170, 120, 220)),
+            "world_menu": Button(btn_x, 440, btn_width, btn_height, "Pengaturan Dunia", (100, 100, 100), (150, 150, 150)),
+            "quit": Button(btn_x, 520, btn_width, btn_height, "Keluar", (200, 50, 50), (255, 100, 100))
         }
 
 class TrainingStartMenu(BaseMenu):
@@ -0,0 +1,44 @@
+# src/ui/profiler_overlay.py
+
+import time
+import pygame
+from settings import *
+
+ROW_HEIGHT = 16
+COLUMN_X = (8, 120, 175, 230)
+PANEL_WIDTH = 290
+
+class ProfilerOverlay:
+    """Panel waktu per fase (p50/p95/p99 dalam ms) di sisi kanan layar.
+
+    Persentil dihitung ulang dan panel digambar ulang hanya beberapa kali per detik,
+    jadi setiap frame cukup satu blit.
+    """
+    def __init__(self, profiler, refresh_secs=0.25):
+        self.profiler = profiler
+        self.refresh_secs = refresh_secs
+        self.font = pygame.font.Font(None, 20)
+        self.surface = None
+        self.next_refresh = 0.0
+
+    def draw(self, renderer):
+        now = time.perf_counter()
+        if self.surface is None or now >= self.next_refresh:
+            self.surface = self._render()
+            self.next_refresh = now + self.refresh_secs
+        renderer.blit(self.surface, (renderer.screen.get_width() - PANEL_WIDTH - 10, 70))
+
+    def _render(self):
+        rows = self.profiler.stats()
+        surface = pygame.Surface((PANEL_WIDTH, ROW_HEIGHT * (len(rows) + 1) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        self._draw_row(surface, 0, ("fase (ms)", "p50", "p95", "p99"), (200, 200, 200))
+        for i, (name, p50, p95, p99) in enumerate(rows, start=1):
+            # Fase yang lebih lama dari satu jatah frame ditandai merah
+            color = (255, 120, 120) if p95 * FRAME_RATE > 1000 else WARNA_TEKS
+            self._draw_row(surface, i, (name, f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"), color)
+        return surface
+
+    def _draw_row(self, surface, row, texts, color):
+        for x, text in zip(COLUMN_X, texts):
+            surface.blit(self.font.render(text, True, color), (x, 4 + row * ROW_HEIGHT))
@@ -0,0 +1,138 @@
+# src/ui/renderer.py
+
+import pygame
+from settings import *
+from src.ui.sprites import CellSpriteAtlas
+from src.ui.camera import Camera
+
+# Di atas jumlah kotak kotor ini, memulihkan dan mengirim seluruh layar lebih murah
+MAX_DIRTY_RECTS = 300
+
+class Renderer:
+    """Menggambar simulasi berlapis: latar statis (terrain + rumput) di-cache dalam satu surface.
+
+    Setiap frame hanya area yang kotor yang dipulihkan dari latar lalu dikirim ke layar dengan
+    pygame.display.update(rects), sehingga biaya render mengikuti jumlah objek yang bergerak,
+    bukan luas layar.
+
+    Latar hanya mencakup area dunia yang terlihat kamera (view) dan disusun ulang saat kamera
+    bergeser; semua posisi objek dalam koordinat dunia dan digeser sebesar offset saat digambar.
+    """
+    def __init__(self, screen, terrain, grass_patches, camera=None, use_atlas=GUNAKAN_ATLAS_SPRITE):
+        self.screen = screen
+        self.terrain = terrain
+        self.grass_patches = grass_patches
+        self.camera = camera or Camera(*screen.get_size(), terrain.width, terrain.height)
+        self.background = screen.copy()
+        self.view = None
+        # Area yang digambar frame sebelumnya (harus dihapus frame ini)
+        self.previous_rects = []
+        # Area latar yang berubah sejak frame terakhir (rumput dimakan/tumbuh)
+        self.background_rects = []
+        self.current_rects = []
+        self.full_redraw = True
+        self.atlas = CellSpriteAtlas() if use_atlas else None
+        self._build_background()
+
+    @property
+    def offset(self):
+        """Posisi dunia yang tampil di sudut kiri atas layar pada frame ini."""
+        return self.view.topleft
+
+    def _build_background(self):
+        # Terrain dan rumput di area yang terlihat; frame berikutnya digambar penuh
+        self.view = self.camera.rect
+        self.terrain.blit_region(self.background, self.view)
+        for grass in self.grass_patches:
+            if self.view.colliderect(grass.rect):
+                grass.draw(self.background, self.view.topleft)
+        self.background_rects = []
+        self.full_redraw = True
+
+    def _scroll_background(self):
+        """Menggeser latar mengikuti kamera; hanya jalur yang baru terlihat yang digambar."""
+        view = self.camera.rect
+        dx, dy = view.x - self.view.x, view.y - self.view.y
+        if abs(dx) >= view.width or abs(dy) >= view.height:
+            self._build_background()
+            return
+        self.background.scroll(-dx, -dy)
+        self.view = view
+        if dx:
+            self._redraw_background(pygame.Rect(view.right - dx if dx > 0 else view.x, view.y, abs(dx), view.height))
+        if dy:
+            self._redraw_background(pygame.Rect(view.x, view.bottom - dy if dy > 0 else view.y, view.width, abs(dy)))
+        self.background_rects = []
+        self.full_redraw = True
+
+    def replace_grass(self, old_rect, new_grass):
+        """Memperbarui latar setelah rumput di old_rect diganti new_grass di grass_patches (salah satunya boleh None).
+
+        Rumput dipakai ulang di tempat lain, jadi yang diterima adalah kotak lamanya, bukan objek lamanya.
+        """
+        if old_rect is not None:
+            self._redraw_background(old_rect)
+        if new_grass is not None:
+            self._redraw_background(new_grass.rect)
+
+    def _redraw_background(self, rect):
+        # Pulihkan terrain lalu gambar ulang rumput yang menyentuh area ini dengan urutan yang sama
+        # seperti menggambar penuh; clip mencegah helai di luar area menimpa rumput lain
+        rect = rect.clip(self.view)
+        if not rect:
+            return
+        local = rect.move(-self.view.x, -self.view.y)
+        self.terrain.blit_region(self.background, rect, local)
+        self.background.set_clip(local)
+        for grass in self.grass_patches:
+            if rect.colliderect(grass.rect):
+                grass.draw(self.background, self.view.topleft)
+        self.background.set_clip(None)
+        self.background_rects.append(local)
+
+    def begin_frame(self):
+        """Menghapus objek dinamis frame sebelumnya dengan menyalin latar di area tersebut."""
+        if self.view != self.camera.rect:
+            self._scroll_background()
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous_rects + self.background_rects:
+                self.screen.blit(self.background, rect, rect)
+        self.current_rects = []
+
+    def draw_snapshot(self, snapshot):
+        """Menggambar sel dari CellSnapshot memakai atlas sprite (satu blits())."""
+        self.current_rects.extend(self.atlas.draw_snapshot(self.screen, snapshot, self.offset))
+
+    def draw_cells(self, cells):
+        """Menggambar sel satu per satu dengan primitif Cell.draw (atlas dimatikan)."""
+        screen_rect = self.screen.get_rect()
+        for cell in cells:
+            rect = cell.get_rect(self.offset)
+            if screen_rect.colliderect(rect):
+                cell.draw(self.screen, offset=self.offset)
+                self.current_rects.append(rect)
+
+    def mark(self, rect):
+        """Mencatat area yang digambar di atas latar pada frame ini."""
+        if rect:
+            self.current_rects.append(pygame.Rect(rect))
+
+    def blit(self, surface, dest):
+        """Blit ke layar sekaligus mencatat areanya sebagai area kotor."""
+        rect = self.screen.blit(surface, dest)
+        self.current_rects.append(rect)
+        return rect
+
+    def end_frame(self, full=False):
+        """Mengirim frame ke layar. full=True memperbarui seluruh layar (mis. mode debug)."""
+        full = full or len(self.current_rects) > MAX_DIRTY_RECTS
+        if full or self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous_rects + self.background_rects + self.current_rects)
+        # Setelah frame penuh, frame berikutnya juga dipulihkan penuh karena gambar debug bisa di mana saja
+        self.full_redraw = full
+        self.previous_rects = self.current_rects
+        self.background_rects = []
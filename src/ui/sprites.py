@@ -0,0 +1,147 @@
+# src/ui/sprites.py
+
+import math
+import numpy as np
+import pygame
+from settings import *
+from src.entity.cell import GENDER_COLORS, RANK_OUTLINE_COLORS
+from src.utils.leaderboard import top_indices
+
+# Resolusi kuantisasi atlas; cukup halus sehingga selisih dengan gambar primitif < 1 piksel
+ROTATION_BUCKETS = 64
+LEG_PHASE_BUCKETS = 16
+SPEED_BUCKETS = 16
+
+LEG_LENGTH = RADIUS_SEL * 1.5
+LEG_SWING_ARC = math.pi / 4
+BAR_WIDTH = RADIUS_SEL * 2
+BAR_HEIGHT = 4
+# Energi bisa mencapai 2x ENERGI_AWAL, jadi isi bar bisa 2x lebar bingkainya
+BAR_MAX_FILL = BAR_WIDTH * 2
+
+# Sprite kaki/badan/penunjuk arah berpusat di (SPRITE_CENTER, SPRITE_CENTER)
+SPRITE_CENTER = int(LEG_LENGTH) + 4
+SPRITE_SIZE = SPRITE_CENTER * 2
+# Kotak pembatas satu sel (semua lapis, termasuk bar energi terpanjang) relatif terhadap sudut sprite
+CELL_RECT_WIDTH = max(SPRITE_SIZE, SPRITE_CENTER - RADIUS_SEL + BAR_MAX_FILL + 1)
+CELL_RECT_HEIGHT = max(SPRITE_SIZE, SPRITE_CENTER + RADIUS_SEL + 4 + BAR_HEIGHT + 1)
+
+class CellSpriteAtlas:
+    """Sprite sel yang sudah dipanggang, digambar sekaligus dengan satu Surface.blits().
+
+    Sel terdiri dari empat lapis dengan urutan seperti Cell.draw: kaki (arah x fase kaki),
+    badan (gender x warna kecepatan x peringkat fitness), penunjuk arah (arah) dan bar energi
+    (lebar isi). Badan tidak ikut berputar, jadi lapisan terpisah jauh lebih kecil daripada
+    satu sprite untuk setiap kombinasi kunci.
+    """
+    def __init__(self):
+        self.legs = [[self._bake_legs(rotation, phase) for phase in range(LEG_PHASE_BUCKETS)]
+                     for rotation in range(ROTATION_BUCKETS)]
+        self.indicators = [self._bake_indicator(rotation) for rotation in range(ROTATION_BUCKETS)]
+        self.bars = [self._bake_energy_bar(fill) for fill in range(BAR_MAX_FILL + 1)]
+        # bodies[male][speed_bucket][rank]: rank 0/1 = garis tepi emas/perak, rank terakhir = warna gender
+        self.bodies = [[[self._bake_body(gender, speed_bucket, rank) for rank in range(len(RANK_OUTLINE_COLORS) + 1)]
+                        for speed_bucket in range(SPEED_BUCKETS)]
+                       for gender in ('female', 'male')]
+
+    @staticmethod
+    def _new_sprite(width, height):
+        return pygame.Surface((width, height), pygame.SRCALPHA)
+
+    @staticmethod
+    def _finish(surface):
+        # convert_alpha() mempercepat blit, tetapi hanya bisa setelah jendela dibuat
+        return surface.convert_alpha() if pygame.display.get_surface() else surface
+
+    def _bake_legs(self, rotation, phase):
+        surface = self._new_sprite(SPRITE_SIZE, SPRITE_SIZE)
+        angle = rotation * 2 * math.pi / ROTATION_BUCKETS
+        swing = math.sin(math.radians(phase * 360 / LEG_PHASE_BUCKETS)) * LEG_SWING_ARC
+        for sign in [-1, 1]:
+            leg_angle = angle + (sign * math.pi / 2) - (sign * swing)
+            end_pos = (SPRITE_CENTER + LEG_LENGTH * math.cos(leg_angle), SPRITE_CENTER + LEG_LENGTH * math.sin(leg_angle))
+            pygame.draw.line(surface, (40, 40, 40), (SPRITE_CENTER, SPRITE_CENTER), end_pos, 3)
+        return self._finish(surface)
+
+    def _bake_indicator(self, rotation):
+        surface = self._new_sprite(SPRITE_SIZE, SPRITE_SIZE)
+        angle = rotation * 2 * math.pi / ROTATION_BUCKETS
+        end_pos = (SPRITE_CENTER + (RADIUS_SEL + 2) * math.cos(angle), SPRITE_CENTER + (RADIUS_SEL + 2) * math.sin(angle))
+        pygame.draw.line(surface, (255, 50, 50), (SPRITE_CENTER, SPRITE_CENTER), end_pos, 2)
+        return self._finish(surface)
+
+    def _bake_body(self, gender, speed_bucket, rank):
+        surface = self._new_sprite(SPRITE_SIZE, SPRITE_SIZE)
+        base_color, outline_color = GENDER_COLORS[gender]
+        if rank < len(RANK_OUTLINE_COLORS):
+            outline_color = RANK_OUTLINE_COLORS[rank]
+        speed_ratio = speed_bucket / (SPEED_BUCKETS - 1)
+        r, g, b = base_color
+        current_color = (
+            min(255, max(0, int(r + (255 - r) * speed_ratio))),
+            min(255, max(0, int(g + (220 - g) * speed_ratio))),
+            min(255, max(0, int(b + (0 - b) * speed_ratio)))
+        )
+        if gender == 'male':
+            rect = pygame.Rect(SPRITE_CENTER - RADIUS_SEL * 1.2, SPRITE_CENTER - RADIUS_SEL * 0.8, RADIUS_SEL * 2.4, RADIUS_SEL * 1.6)
+            pygame.draw.ellipse(surface, outline_color, rect.inflate(2, 2))
+            pygame.draw.ellipse(surface, current_color, rect)
+        else:
+            pygame.draw.circle(surface, outline_color, (SPRITE_CENTER, SPRITE_CENTER), RADIUS_SEL + 1)
+            pygame.draw.circle(surface, current_color, (SPRITE_CENTER, SPRITE_CENTER), RADIUS_SEL)
+        return self._finish(surface)
+
+    def _bake_energy_bar(self, fill_width):
+        surface = self._new_sprite(max(BAR_WIDTH, fill_width), BAR_HEIGHT)
+        energy_ratio = fill_width / BAR_WIDTH
+        r, g = int(255 * (1 - energy_ratio)), int(255 * energy_ratio)
+        energy_color = (min(255, max(0, r)), min(255, max(0, g)), 0)
+        pygame.draw.rect(surface, (50, 50, 50), (0, 0, BAR_WIDTH, BAR_HEIGHT), border_radius=1)
+        if fill_width > 0:
+            pygame.draw.rect(surface, energy_color, (0, 0, fill_width, BAR_HEIGHT), border_radius=1)
+        return self._finish(surface)
+
+    def draw_snapshot(self, screen, snapshot, offset=(0, 0)):
+        """Menggambar semua sel dari CellSnapshot dengan satu panggilan blits().
+
+        offset adalah posisi kamera di dunia; sel di luar layar tidak digambar. Kunci atlas
+        dihitung sekaligus dengan NumPy; mengembalikan kotak pembatas tiap sel yang digambar.
+        """
+        count = len(snapshot)
+        if count == 0:
+            return []
+        # Dua sel dengan fitness tertinggi (dari semua sel, bukan hanya yang terlihat) mendapat garis tepi emas dan perak
+        ranks = np.full(count, len(RANK_OUTLINE_COLORS), dtype=np.int64)
+        best = top_indices(snapshot.fitness, len(RANK_OUTLINE_COLORS))
+        ranks[best] = np.arange(len(best))
+
+        xs, ys = snapshot.x - offset[0], snapshot.y - offset[1]
+        lefts = xs.astype(np.int64) - SPRITE_CENTER
+        tops = ys.astype(np.int64) - SPRITE_CENTER
+        width, height = screen.get_size()
+        visible = np.flatnonzero((lefts < width) & (lefts + CELL_RECT_WIDTH > 0) &
+                                 (tops < height) & (tops + CELL_RECT_HEIGHT > 0))
+        xs, ys, lefts, tops, ranks = xs[visible], ys[visible], lefts[visible], tops[visible], ranks[visible]
+        angle, leg_cycle, speed = snapshot.angle[visible], snapshot.leg_cycle[visible], snapshot.speed[visible]
+        energy, male = snapshot.energy[visible], snapshot.male[visible]
+
+        rotations = np.rint(angle * (ROTATION_BUCKETS / (2 * math.pi))).astype(np.int64) % ROTATION_BUCKETS
+        phases = np.rint(leg_cycle * (LEG_PHASE_BUCKETS / 360)).astype(np.int64) % LEG_PHASE_BUCKETS
+        speed_step = (SPEED_BUCKETS - 1) / KECEPATAN_MAKS_SEL if KECEPATAN_MAKS_SEL > 0 else 0
+        speed_buckets = np.clip(np.rint(speed * speed_step), 0, SPEED_BUCKETS - 1).astype(np.int64)
+        fills = np.clip(np.rint(energy * (BAR_WIDTH / ENERGI_AWAL)), 0, BAR_MAX_FILL).astype(np.int64)
+        bar_lefts = (xs - RADIUS_SEL).astype(np.int64)
+        bar_tops = (ys + RADIUS_SEL + 4).astype(np.int64)
+
+        sequence = []
+        for left, top, rotation, phase, is_male, speed_bucket, rank, fill, bar_left, bar_top, cell_energy in zip(
+                lefts.tolist(), tops.tolist(), rotations.tolist(), phases.tolist(), male.tolist(),
+                speed_buckets.tolist(), ranks.tolist(), fills.tolist(), bar_lefts.tolist(), bar_tops.tolist(),
+                energy.tolist()):
+            sequence.append((self.legs[rotation][phase], (left, top)))
+            sequence.append((self.bodies[is_male][speed_bucket][rank], (left, top)))
+            sequence.append((self.indicators[rotation], (left, top)))
+            if cell_energy > 0:
+                sequence.append((self.bars[fill], (bar_left, bar_top)))
+        screen.blits(sequence, doreturn=False)
+        return [(left, top, CELL_RECT_WIDTH, CELL_RECT_HEIGHT) for left, top in zip(lefts.tolist(), tops.tolist())]
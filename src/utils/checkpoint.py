@@ -0,0 +1,227 @@
+# src/utils/checkpoint.py
+
+import os
+import json
+import struct
+import threading
+import numpy as np
+from settings import *
+from neural_network import NeuralNetwork, GENOME_LENGTH
+
+# Tata letak file (little-endian):
+#   [magic 8 byte][versi uint32][panjang header uint32][header JSON][padding s.d. kelipatan 64]
+#   [genom float32 (count, genome_length)][padding s.d. kelipatan 8][fitness float64 (count,)]
+MAGIC = b'AIBRAIN\x00'
+FORMAT_VERSION = 1
+PREFIX = struct.Struct('<8sII')
+DATA_ALIGN = 64
+GENOME_DTYPE = np.dtype('<f4')
+FITNESS_DTYPE = np.dtype('<f8')
+
+def _align(offset, alignment):
+    return -(-offset // alignment) * alignment
+
+class BrainCheckpoint:
+    """Populasi otak sebagai satu matriks genom float32, terurut dari fitness tertinggi.
+
+    `parents` adalah jumlah genom terdepan yang terpilih sebagai induk; melanjutkan latihan dan
+    mode Sandbox hanya memakai bagian ini. Saat dimuat, genom dan fitness berupa np.memmap
+    (hanya-baca) sehingga file besar tidak perlu disalin ke memori.
+    """
+    def __init__(self, genomes, fitness=None, generation=0, parents=None, rng_state=None,
+                 num_inputs=NUM_INPUTS, num_hidden=NUM_HIDDEN, num_outputs=NUM_OUTPUTS):
+        self.genomes = genomes
+        self.fitness = np.zeros(len(genomes)) if fitness is None else fitness
+        self.generation = generation
+        self.parents = len(genomes) if parents is None else parents
+        self.rng_state = rng_state
+        self.num_inputs = num_inputs
+        self.num_hidden = num_hidden
+        self.num_outputs = num_outputs
+
+    def __len__(self):
+        return len(self.genomes)
+
+    @classmethod
+    def from_population(cls, genomes, fitness, generation=0, parents=None, rng=None):
+        """Membuat checkpoint dari genom + fitness sembarang urutan (diurutkan di sini)."""
+        genomes = np.asarray(genomes, dtype=np.float32)
+        fitness = np.asarray(fitness, dtype=np.float64)
+        order = np.argsort(-fitness, kind='stable')
+        rng_state = rng.bit_generator.state if rng is not None else None
+        return cls(genomes[order], fitness[order], generation, parents, rng_state)
+
+    @property
+    def parent_genomes(self):
+        return self.genomes[:self.parents]
+
+    @property
+    def best_fitness(self):
+        return float(self.fitness[0]) if len(self) else 0
+
+    def copy(self):
+        """Salinan lepas (bukan memmap/view), aman diserahkan ke thread lain."""
+        return BrainCheckpoint(np.array(self.genomes, dtype=np.float32), np.array(self.fitness, dtype=np.float64),
+                               self.generation, self.parents, self.rng_state,
+                               self.num_inputs, self.num_hidden, self.num_outputs)
+
+    def brain(self, index):
+        return NeuralNetwork.from_genome(self.genomes[index], self.num_inputs, self.num_hidden, self.num_outputs)
+
+    def save(self, filepath):
+        """Menulis checkpoint ke filepath. Mengembalikan True jika berhasil.
+
+        Data ditulis ke file sementara lalu di-rename, sehingga crash di tengah penulisan
+        tidak pernah meninggalkan file checkpoint setengah jadi.
+        """
+        if not len(self):
+            print("Peringatan: Tidak ada otak untuk disimpan.")
+            return False
+        genomes = np.ascontiguousarray(self.genomes, dtype=GENOME_DTYPE)
+        fitness = np.ascontiguousarray(self.fitness, dtype=FITNESS_DTYPE)
+        header = json.dumps({
+            'num_inputs': self.num_inputs,
+            'num_hidden': self.num_hidden,
+            'num_outputs': self.num_outputs,
+            'count': len(genomes),
+            'genome_length': genomes.shape[1],
+            'parents': int(self.parents),
+            'generation': int(self.generation),
+            'best_fitness': self.best_fitness,
+            'rng_state': self.rng_state,
+        }).encode('utf-8')
+        genome_offset = _align(PREFIX.size + len(header), DATA_ALIGN)
+        fitness_offset = _align(genome_offset + genomes.nbytes, FITNESS_DTYPE.itemsize)
+        temp_path = filepath + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+                f.write(header)
+                f.write(b'\x00' * (genome_offset - PREFIX.size - len(header)))
+                f.write(genomes.tobytes())
+                f.write(b'\x00' * (fitness_offset - genome_offset - genomes.nbytes))
+                f.write(fitness.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+            print(f"✅ {len(genomes)} otak berhasil disimpan ke {filepath}")
+            return True
+        except OSError as e:
+            print(f"❌ Gagal menyimpan otak: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    @classmethod
+    def load(cls, filepath, mmap=True):
+        """Memuat checkpoint; mengembalikan None jika file tidak ada atau tidak cocok.
+
+        File .npz format lama (pasangan w_ih_i/w_ho_i) dengan nama yang sama tetap bisa dimuat.
+        """
+        if not os.path.exists(filepath):
+            legacy_path = os.path.splitext(filepath)[0] + '.npz'
+            if os.path.exists(legacy_path):
+                return cls._load_legacy_npz(legacy_path)
+            print(f"Info: File otak '{filepath}' tidak ditemukan.")
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                prefix = f.read(PREFIX.size)
+                if prefix[:len(MAGIC)] != MAGIC:
+                    return cls._load_legacy_npz(filepath)
+                _, version, header_length = PREFIX.unpack(prefix)
+                header = json.loads(f.read(header_length).decode('utf-8'))
+            if version != FORMAT_VERSION:
+                print(f"❌ Versi file otak {version} tidak didukung (diharapkan {FORMAT_VERSION}).")
+                return None
+            topology = (header['num_inputs'], header['num_hidden'], header['num_outputs'])
+            if topology != (NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS):
+                print(f"❌ Topologi otak di file {topology} tidak cocok dengan pengaturan "
+                      f"{(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS)}.")
+                return None
+
+            count, genome_length = header['count'], header['genome_length']
+            genome_offset = _align(PREFIX.size + header_length, DATA_ALIGN)
+            fitness_offset = _align(genome_offset + count * genome_length * GENOME_DTYPE.itemsize, FITNESS_DTYPE.itemsize)
+            if mmap:
+                genomes = np.memmap(filepath, dtype=GENOME_DTYPE, mode='r', offset=genome_offset, shape=(count, genome_length))
+                fitness = np.memmap(filepath, dtype=FITNESS_DTYPE, mode='r', offset=fitness_offset, shape=(count,))
+            else:
+                genomes = np.fromfile(filepath, dtype=GENOME_DTYPE, count=count * genome_length, offset=genome_offset)
+                genomes = genomes.reshape(count, genome_length)
+                fitness = np.fromfile(filepath, dtype=FITNESS_DTYPE, count=count, offset=fitness_offset)
+            print(f"✅ {count} otak (generasi {header['generation']}) berhasil dimuat dari {filepath}")
+            return cls(genomes, fitness, header['generation'], header['parents'], header['rng_state'], *topology)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Gagal memuat otak dari file: {e}")
+            return None
+
+    @classmethod
+    def _load_legacy_npz(cls, filepath):
+        try:
+            data = np.load(filepath)
+            genomes = []
+            while f'w_ih_{len(genomes)}' in data:
+                i = len(genomes)
+                genomes.append(np.concatenate((data[f'w_ih_{i}'].ravel(), data[f'w_ho_{i}'].ravel())))
+            if not genomes or len(genomes[0]) != GENOME_LENGTH:
+                print(f"❌ File otak lama {filepath} kosong atau topologinya tidak cocok.")
+                return None
+            print(f"✅ {len(genomes)} otak berhasil dimuat dari {filepath} (format lama)")
+            return cls(np.array(genomes, dtype=np.float32))
+        except (OSError, ValueError) as e:
+            print(f"❌ Gagal memuat otak dari file: {e}")
+            return None
+
+class CheckpointWriter:
+    """Menyimpan checkpoint di thread latar belakang agar simulasi tidak pernah menunggu disk.
+
+    submit() hanya menyalin data ke buffer lalu langsung kembali. Jika beberapa permintaan
+    menumpuk selagi penulisan berjalan, hanya yang terbaru yang ditulis.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, checkpoint, filepath):
+        snapshot = checkpoint.copy()
+        with self._condition:
+            self._pending = (snapshot, filepath)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                checkpoint, filepath = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                checkpoint.save(filepath)
+            except Exception as e:
+                # Thread harus tetap hidup, kalau tidak flush()/close() menunggu selamanya
+                print(f"❌ Gagal menyimpan checkpoint ke {filepath}: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self):
+        """Menunggu sampai semua permintaan yang sudah masuk selesai ditulis."""
+        with self._condition:
+            while self._pending is not None or self._busy:
+                self._condition.wait()
+
+    def close(self):
+        self.flush()
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
@@ -0,0 +1,127 @@
+# src/utils/genome_metrics.py
+
+import json
+import math
+import os
+import time
+import numpy as np
+from settings import *
+
+# Tetangga terdekat yang dirata-rata untuk skor novelty
+NOVELTY_NEIGHBORS = 5
+# Jarak RMS per bobot yang ditambahkan satu putaran mutasi breed_genomes: setiap bobot bergeser
+# uniform(-strength, strength) dengan peluang rate, jadi rata-rata kuadratnya rate * strength^2 / 3
+MUTATION_STEP = MUTATION_STRENGTH * math.sqrt(MUTATION_RATE / 3)
+
+def genome_distances(a, b):
+    """Jarak antar genom (len(a), len(b)) sebagai selisih RMS per bobot, jadi tidak bergantung panjang genom.
+
+    Dihitung lewat |a|^2 + |b|^2 - 2ab dengan satu perkalian matriks, bukan selisih per pasangan.
+    """
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    squared = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * (a @ b.T)
+    return np.sqrt(np.maximum(squared, 0) / max(a.shape[1], 1))
+
+def sample_indices(fitness, size, rng):
+    """Indeks sampel genom (paling banyak size), selalu termasuk genom dengan fitness tertinggi."""
+    n = len(fitness)
+    if n <= size:
+        return np.arange(n)
+    chosen = rng.choice(n, size, replace=False)
+    best = int(np.argmax(fitness))
+    if best not in chosen:
+        chosen[0] = best
+    return np.sort(chosen)
+
+def found_species(distances, order, threshold):
+    """Pengelompokan leader: genom diperiksa menurut order (fitness menurun) dan menjadi wakil
+    spesies baru jika jaraknya ke semua wakil yang sudah ada lebih dari threshold.
+
+    distances adalah matriks jarak sampel; hasilnya indeks (ke sampel) wakil setiap spesies.
+    """
+    leaders = []
+    for i in order:
+        if not leaders or distances[i, leaders].min() > threshold:
+            leaders.append(i)
+    return np.array(leaders, dtype=np.intp)
+
+def generation_metrics(genomes, fitness, generation, rng, sample_size=METRIK_SAMPEL_GENOM,
+                       species_threshold=JARAK_SPESIES * MUTATION_STEP, clone_threshold=JARAK_KLON):
+    """Keragaman genom, spesies, dan distribusi fitness per spesies untuk satu generasi.
+
+    Jarak berpasangan hanya dihitung di sampel acak berukuran sample_size (O(S^2) berapa pun
+    ukuran populasinya). Wakil spesies dipilih di sampel itu, lalu seluruh populasi dimasukkan
+    ke spesies wakil terdekatnya (O(N x spesies)); genom di luar sampel bisa sedikit lebih jauh
+    dari ambangnya. Ambang spesies tetap (JARAK_SPESIES putaran mutasi), jadi genom acak yang
+    tidak berkerabat (~0.82) masing-masing spesies sendiri, sedangkan populasi yang kolaps ke satu
+    garis keturunan menjadi satu spesies. rng (np.random.Generator) memilih sampel; pemanggil
+    menurunkannya dari generator evolusi ber-seed agar run dengan seed berbeda tidak memakai
+    pasangan yang sama.
+    """
+    genomes = np.asarray(genomes)
+    fitness = np.asarray(fitness, dtype=np.float64)
+    n = len(genomes)
+    metrics = {'generation': int(generation), 'time': round(time.time(), 3), 'population': n}
+    if n == 0:
+        metrics.update(sampled=0, species_count=0, species=[])
+        return metrics
+    metrics['fitness'] = _fitness_stats(fitness)
+
+    sample = sample_indices(fitness, sample_size, rng)
+    distances = genome_distances(genomes[sample], genomes[sample])
+    metrics['sampled'] = len(sample)
+    if len(sample) > 1:
+        pairs = distances[np.triu_indices(len(sample), 1)]
+        p5, median, p95 = np.percentile(pairs, (5, 50, 95))
+        metrics['distance'] = {'mean': round(float(pairs.mean()), 5), 'std': round(float(pairs.std()), 5),
+                               'min': round(float(pairs.min()), 5), 'p5': round(float(p5), 5),
+                               'median': round(float(median), 5), 'p95': round(float(p95), 5)}
+        # Novelty: rata-rata jarak ke beberapa tetangga terdekat (diri sendiri tidak dihitung)
+        np.fill_diagonal(distances, np.inf)
+        k = min(NOVELTY_NEIGHBORS, len(sample) - 1)
+        nearest = np.partition(distances, k - 1, axis=1)[:, :k]
+        novelty = nearest.mean(axis=1)
+        metrics['novelty'] = {'mean': round(float(novelty.mean()), 5), 'max': round(float(novelty.max()), 5)}
+        metrics['clone_fraction'] = round(float((nearest[:, 0] < clone_threshold).mean()), 4)
+        np.fill_diagonal(distances, 0)
+
+    leaders = sample[found_species(distances, np.argsort(-fitness[sample], kind='stable'), species_threshold)]
+    species = np.zeros(n, dtype=np.intp)
+    for start in range(0, n, 4096):
+        species[start:start + 4096] = genome_distances(genomes[start:start + 4096], genomes[leaders]).argmin(axis=1)
+    metrics['species_threshold'] = round(species_threshold, 5)
+    metrics['species_count'] = len(leaders)
+    order = np.argsort(species, kind='stable')
+    groups = np.split(fitness[order], np.cumsum(np.bincount(species, minlength=len(leaders)))[:-1])
+    metrics['species'] = [{'id': s, 'size': len(group), **_fitness_stats(group)} for s, group in enumerate(groups)]
+    return metrics
+
+def _fitness_stats(fitness):
+    if not len(fitness):
+        return {'best': 0.0, 'mean': 0.0, 'median': 0.0}
+    return {'best': round(float(fitness.max()), 3), 'mean': round(float(fitness.mean()), 3),
+            'median': round(float(np.median(fitness)), 3)}
+
+def summary(metrics):
+    """Ringkasan satu baris untuk log generasi."""
+    distance = metrics.get('distance', {}).get('mean', 0.0)
+    return (f"keragaman {distance:.3f}, {metrics['species_count']} spesies, "
+            f"klon {metrics.get('clone_fraction', 0.0):.0%}")
+
+class MetricsLog:
+    """File metrik append-only: satu objek JSON per generasi per baris (JSON Lines).
+
+    File dibuka hanya selama menulis satu baris, jadi baris yang sudah ditulis tetap utuh walau
+    latihan dihentikan mendadak, dan beberapa sesi latihan bisa menambah ke file yang sama.
+    """
+    def __init__(self, filepath):
+        self.filepath = filepath
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        print(f"Mencatat metrik keragaman genom ke {filepath}.")
+
+    def append(self, metrics, **fields):
+        """Menambahkan metrik satu generasi; fields (mis. mode='pulau') ikut ditulis di baris yang sama."""
+        with open(self.filepath, 'a') as f:
+            f.write(json.dumps({**fields, **metrics}) + '\n')
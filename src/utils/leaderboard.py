@@ -0,0 +1,69 @@
+# src/utils/leaderboard.py
+
+import numpy as np
+
+def top_indices(fitness, k):
+    """Indeks k fitness tertinggi, terurut menurun.
+
+    Hasilnya sama dengan np.argsort(-fitness, kind='stable')[:k] (fitness sama diurutkan menurut
+    indeks), tetapi hanya butuh O(N + k log k): np.partition mencari nilai ke-k, lalu hanya k
+    pemenangnya yang diurutkan.
+    """
+    fitness = np.asarray(fitness, dtype=np.float64)
+    n = len(fitness)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k == n:
+        return np.argsort(-fitness, kind='stable')
+    kth = np.partition(fitness, n - k)[n - k]
+    above = np.flatnonzero(fitness > kth)
+    # Dari fitness yang sama dengan batas, yang indeksnya lebih kecil didahulukan seperti sort stabil
+    ties = np.flatnonzero(fitness == kth)[:k - len(above)]
+    chosen = np.concatenate((above, ties))
+    return chosen[np.argsort(-fitness[chosen], kind='stable')]
+
+class Leaderboard:
+    """Peringkat fitness populasi yang dihitung paling banyak sekali per tick lalu dipakai bersama.
+
+    Fitness hampir semua sel berubah setiap tick, jadi peringkat tidak diurutkan ulang setiap
+    perubahan: setelah invalidate(), array fitness diambil dari `source` saat pertama dibutuhkan
+    dan top-k dicari dengan top_indices. Permintaan k yang lebih kecil memakai hasil yang sama.
+    """
+    def __init__(self, source):
+        # source: fungsi tanpa argumen yang mengembalikan fitness semua sel (urutan = daftar sel)
+        self.source = source
+        self.invalidate()
+
+    def invalidate(self):
+        """Dipanggil setiap kali fitness atau daftar sel berubah."""
+        self._fitness = None
+        self._top = np.empty(0, dtype=np.intp)
+
+    @property
+    def fitness(self):
+        if self._fitness is None:
+            self._fitness = np.asarray(self.source(), dtype=np.float64)
+        return self._fitness
+
+    def __len__(self):
+        return len(self.fitness)
+
+    def top(self, k):
+        """Indeks k sel terbaik, terurut dari fitness tertinggi."""
+        k = min(k, len(self))
+        if k > len(self._top):
+            self._top = top_indices(self.fitness, k)
+        return self._top[:k]
+
+    def select(self, fraction):
+        """Indeks sel terbaik sebanyak `fraction` dari populasi (seleksi truncation), terurut."""
+        return self.top(int(len(self) * fraction))
+
+    def best(self):
+        top = self.top(1)
+        return float(self.fitness[top[0]]) if len(top) else 0
+
+    def percentile(self, q):
+        """Persentil fitness populasi (q dalam 0-100, boleh array); 0 jika tidak ada sel."""
+        return np.percentile(self.fitness, q) if len(self) else 0.0
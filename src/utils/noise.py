@@ -0,0 +1,71 @@
+# src/utils/noise.py
+
+import os
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Di atas jumlah piksel ini, workers=None berarti memakai semua core
+PARALLEL_MIN_PIXELS = 4_000_000
+TILE_SIZE = 1024
+
+def _lattice_vector(cx, cy, seed):
+    """Vektor gradien pada titik kisi (cx, cy), sama persis dengan pustaka perlin_noise."""
+    coord_hash = max(1, int(abs(cx + 10 * cy + 1)))
+    rng = random.Random(seed * coord_hash)
+    return rng.uniform(-1, 1), rng.uniform(-1, 1)
+
+def _fade(t):
+    return 6 * t ** 5 - 15 * t ** 4 + 10 * t ** 3
+
+def perlin_tile(x0, y0, width, height, scale, octaves, seed):
+    """Noise Perlin untuk piksel [x0, x0+width) x [y0, y0+height), hasil berbentuk (width, height).
+
+    Menghasilkan nilai yang sama dengan PerlinNoise(octaves, seed)([i / scale, j / scale]),
+    tetapi seluruh petak dihitung dengan operasi array.
+    """
+    xs = (np.arange(x0, x0 + width) / scale) * octaves
+    ys = (np.arange(y0, y0 + height) / scale) * octaves
+    ix, iy = np.floor(xs).astype(np.int64), np.floor(ys).astype(np.int64)
+    fx, fy = xs - ix, ys - iy
+
+    # Gradien hanya dihitung sekali per titik kisi yang dipakai petak ini
+    cx_min, cy_min = int(ix.min()), int(iy.min())
+    grid_w, grid_h = int(ix.max()) - cx_min + 2, int(iy.max()) - cy_min + 2
+    gradients = np.array([[_lattice_vector(cx_min + a, cy_min + b, seed) for b in range(grid_h)]
+                          for a in range(grid_w)])
+
+    gx_idx, gy_idx = ix - cx_min, iy - cy_min
+    world = np.zeros((width, height))
+    for a in (0, 1):
+        dx = fx - a
+        wx = _fade(1 - np.abs(dx))
+        for b in (0, 1):
+            dy = fy - b
+            wy = _fade(1 - np.abs(dy))
+            g = gradients[(gx_idx + a)[:, None], (gy_idx + b)[None, :]]
+            world += (wx[:, None] * wy[None, :]) * (g[..., 0] * dx[:, None] + g[..., 1] * dy[None, :])
+    return world
+
+def _perlin_tile_job(args):
+    return args[0], args[1], perlin_tile(*args)
+
+def generate_perlin(width, height, scale, octaves, seed, workers=None, tile_size=TILE_SIZE):
+    """Mengisi peta (width, height) dengan noise Perlin, opsional paralel per petak.
+
+    Hasil deterministik untuk seed yang sama, berapa pun jumlah worker.
+    """
+    if seed <= 0:
+        raise ValueError("seed harus bilangan bulat positif")
+    if workers is None:
+        workers = (os.cpu_count() or 1) if width * height >= PARALLEL_MIN_PIXELS else 1
+    if workers <= 1:
+        return perlin_tile(0, 0, width, height, scale, octaves, seed)
+
+    jobs = [(x0, y0, min(tile_size, width - x0), min(tile_size, height - y0), scale, octaves, seed)
+            for x0 in range(0, width, tile_size) for y0 in range(0, height, tile_size)]
+    world = np.empty((width, height))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for x0, y0, tile in pool.map(_perlin_tile_job, jobs):
+            world[x0:x0 + tile.shape[0], y0:y0 + tile.shape[1]] = tile
+    return world
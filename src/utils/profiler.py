@@ -0,0 +1,119 @@
+# src/utils/profiler.py
+
+import csv
+import os
+import threading
+import time
+from contextlib import nullcontext
+import numpy as np
+from settings import *
+
+# Dipakai saat profiler mati: satu objek yang sama untuk semua scope, tanpa pengukuran apa pun
+NULL_SCOPE = nullcontext()
+
+class _Scope:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    """Pengukur waktu per fase dengan scope bernama, mis. `with PROFILER.scope('sim.predict'):`.
+
+    Nama berawalan grup ('sim.' = satu tick simulasi, 'draw.' = satu frame gambar). Waktu scope
+    yang sama dalam satu frame dijumlahkan, lalu end_frame(grup) menyimpannya ke jendela bergulir
+    untuk persentil p50/p95/p99. Setiap grup hanya disentuh oleh satu thread, tetapi jendela
+    sampel dibaca overlay dari thread UI, jadi end_frame() dan stats() berbagi satu kunci. Saat
+    dimatikan, scope() mengembalikan NULL_SCOPE sehingga biayanya hanya satu pemanggilan fungsi.
+    """
+    def __init__(self, enabled=False, window=PROFIL_JENDELA_FRAME):
+        self.enabled = enabled
+        self.window = window
+        self._pending = {}
+        self._samples = {}
+        self._counts = {}
+        self._frames = {}
+        self._trace_file = None
+        self._trace_writer = None
+        self._lock = threading.Lock()
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name, seconds):
+        group = self._pending.setdefault(name.partition('.')[0], {})
+        group[name] = group.get(name, 0.0) + seconds
+
+    def enable(self, enabled=True):
+        """Menyalakan/mematikan pengukuran; data lama dibuang saat dinyalakan ulang."""
+        if enabled and not self.enabled:
+            with self._lock:
+                self._pending, self._samples, self._counts = {}, {}, {}
+        self.enabled = enabled or self._trace_file is not None
+
+    def end_frame(self, group):
+        """Menutup satu frame grup: jumlah waktu setiap fase dimasukkan ke jendela bergulir."""
+        if not self.enabled:
+            return
+        pending = self._pending.get(group)
+        if not pending:
+            return
+        self._pending[group] = {}
+        with self._lock:
+            frame = self._frames.get(group, 0)
+            self._frames[group] = frame + 1
+            for name, seconds in pending.items():
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = np.zeros(self.window)
+                    self._counts[name] = 0
+                samples[self._counts[name] % self.window] = seconds * 1000
+                self._counts[name] += 1
+                if self._trace_writer is not None:
+                    self._trace_writer.writerow((group, frame, name, f"{seconds * 1000:.4f}"))
+
+    def stats(self):
+        """(nama, p50, p95, p99) dalam milidetik untuk setiap fase, urut sesuai kemunculan."""
+        # Salinan diambil di bawah kunci; persentil dihitung di luar agar simulasi tidak menunggu
+        with self._lock:
+            windows = [(name, samples[:min(self._counts[name], self.window)].copy())
+                       for name, samples in self._samples.items()]
+        return [(name, *np.percentile(samples, (50, 95, 99))) for name, samples in windows if len(samples)]
+
+    def start_trace(self, filepath):
+        """Mulai menulis setiap fase setiap frame ke file CSV (grup, frame, fase, ms)."""
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._trace_file = open(filepath, 'w', newline='')
+        self._trace_writer = csv.writer(self._trace_file)
+        self._trace_writer.writerow(('group', 'frame', 'phase', 'ms'))
+        self.enable()
+        print(f"Merekam profil per fase ke {filepath}.")
+
+    def stop_trace(self):
+        if self._trace_file is None:
+            return
+        with self._lock:
+            self._trace_file.close()
+            print(f"✅ Profil per fase disimpan ke {self._trace_file.name}")
+            self._trace_file = self._trace_writer = None
+
+    def print_summary(self):
+        print(f"{'fase':<20} {'p50':>9} {'p95':>9} {'p99':>9}  (ms, {self.window} frame terakhir)")
+        for name, p50, p95, p99 in self.stats():
+            print(f"{name:<20} {p50:9.3f} {p95:9.3f} {p99:9.3f}")
+
+# Satu profiler untuk seluruh proses, seperti pengaturan di settings.py
+PROFILER = Profiler(enabled=PROFIL_AKTIF)
@@ -0,0 +1,364 @@
+# src/utils/spatial.py
+
+import math
+import numpy as np
+from settings import LEBAR_DUNIA, TINGGI_DUNIA, JUMLAH_RUMPUT, RADIUS_SEL, RADIUS_RUMPUT
+
+# Offset 3x3 petak tetangga (kolom, baris)
+NEIGHBOR_OFFSETS = [(dc, dr) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+# Di atas jumlah petak ini (dunia besar) grid hanya menyimpan petak yang berisi titik
+MAX_DENSE_BINS = 1 << 20
+
+class SpatialHash:
+    """Grid seragam untuk mencari titik dalam radius tertentu tanpa memeriksa semua titik.
+
+    Titik diurutkan per petak sekali setiap rebuild(); pencarian hanya memeriksa 3x3 petak
+    di sekitar titik kueri, sehingga radius kueri tidak boleh melebihi cell_size. Untuk dunia
+    besar hanya petak yang berisi titik yang disimpan (dicari dengan searchsorted), sehingga
+    memori mengikuti jumlah titik, bukan luas dunia.
+    """
+    def __init__(self, cell_size, width=LEBAR_DUNIA, height=TINGGI_DUNIA):
+        self.cell_size = float(cell_size)
+        # +1 karena posisi sel boleh tepat di tepi dunia (x == width)
+        self.cols = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+        self.dense = self.cols * self.rows <= MAX_DENSE_BINS
+        self.items = None
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.order = np.empty(0, dtype=np.intp)
+        # Padat: bin_start[kunci] untuk setiap petak. Jarang: hanya petak terisi, kuncinya di bin_keys.
+        # Keduanya punya satu elemen penutup di akhir bin_start.
+        self.bin_keys = np.arange(self.cols * self.rows) if self.dense else np.empty(0, dtype=np.int64)
+        self.bin_start = np.zeros(len(self.bin_keys) + 1, dtype=np.intp)
+        self._xs_list, self._ys_list, self._order_list = [], [], []
+        self._bin_spans = None
+        # Kunci petak setiap titik, dan titik yang dikeluarkan dengan discard() sejak rebuild terakhir
+        self.point_keys = np.empty(0, dtype=np.int64)
+        self._discarded = set()
+        self._discarded_keys = None
+
+    def __len__(self):
+        return len(self.xs)
+
+    def rebuild(self, xs, ys, items=None):
+        """Mengisi ulang grid. items (opsional) adalah objek yang dikembalikan oleh query()."""
+        self.xs = np.asarray(xs, dtype=np.float64)
+        self.ys = np.asarray(ys, dtype=np.float64)
+        self.items = items
+        keys = self._keys(self._bin_coords(self.xs, self.cols), self._bin_coords(self.ys, self.rows))
+        self.point_keys = keys
+        self._discarded = set()
+        self._discarded_keys = None
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        if self.dense:
+            self.bin_start = np.searchsorted(sorted_keys, np.arange(self.cols * self.rows + 1))
+        else:
+            starts = np.flatnonzero(np.diff(sorted_keys, prepend=-1))
+            self.bin_keys = sorted_keys[starts]
+            self.bin_start = np.append(starts, len(keys))
+        self._xs_list = self.xs.tolist()
+        self._ys_list = self.ys.tolist()
+        self._order_list = self.order.tolist()
+        self._bin_spans = None
+
+    def discard(self, index):
+        """Mengeluarkan titik ke-index sampai rebuild berikutnya (mis. sel yang mati di tengah frame).
+
+        O(1): titiknya hanya ditandai, lalu dilewati oleh query()/query_pairs() dan tidak dihitung counts_in().
+        """
+        if index not in self._discarded:
+            self._discarded.add(index)
+            self._discarded_keys = None
+
+    def query(self, x, y, radius):
+        """Mengembalikan item (atau indeks) yang berjarak kurang dari radius dari (x, y)."""
+        col, row = math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+        if self._bin_spans is None:
+            # Dibuat saat pertama dibutuhkan (jalur vektor tidak memakainya): list bin_start untuk
+            # grid padat, dict kunci -> (awal, akhir) untuk grid jarang
+            bin_start = self.bin_start.tolist()
+            self._bin_spans = bin_start if self.dense else {
+                key: (bin_start[i], bin_start[i + 1]) for i, key in enumerate(self.bin_keys.tolist())}
+        xs, ys, order, bin_spans = self._xs_list, self._ys_list, self._order_list, self._bin_spans
+        found = []
+        for dc, dr in NEIGHBOR_OFFSETS:
+            c, r = col + dc, row + dr
+            if not (0 <= c < self.cols and 0 <= r < self.rows):
+                continue
+            key = r * self.cols + c
+            start, end = (bin_spans[key], bin_spans[key + 1]) if self.dense else bin_spans.get(key, (0, 0))
+            for idx in order[start:end]:
+                if math.hypot(x - xs[idx], y - ys[idx]) < radius and idx not in self._discarded:
+                    found.append(idx if self.items is None else self.items[idx])
+        return found
+
+    def query_pairs(self, qx, qy, radius):
+        """Versi vektor dari query() untuk banyak titik sekaligus.
+
+        Mengembalikan dua array (indeks_kueri, indeks_item) untuk setiap pasangan yang
+        berjarak kurang dari radius.
+        """
+        qx = np.asarray(qx, dtype=np.float64).ravel()
+        qy = np.asarray(qy, dtype=np.float64).ravel()
+        if len(self.xs) == 0 or len(qx) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        qcol = np.floor(qx / self.cell_size).astype(np.intp)
+        qrow = np.floor(qy / self.cell_size).astype(np.intp)
+        query_ids = np.arange(len(qx))
+
+        all_queries, all_starts, all_counts = [], [], []
+        for dc, dr in NEIGHBOR_OFFSETS:
+            c, r = qcol + dc, qrow + dr
+            valid = (c >= 0) & (c < self.cols) & (r >= 0) & (r < self.rows)
+            keys = self._keys(c[valid], r[valid])
+            starts, counts = self._bin_spans_of(keys)
+            all_queries.append(query_ids[valid])
+            all_starts.append(starts)
+            all_counts.append(counts)
+        queries = np.concatenate(all_queries)
+        starts = np.concatenate(all_starts)
+        counts = np.concatenate(all_counts)
+
+        # Jabarkan setiap (kueri, petak) menjadi satu baris per kandidat di petak itu
+        total = int(counts.sum())
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        candidates = self.order[offsets + np.arange(total)]
+        pair_queries = np.repeat(queries, counts)
+
+        dx = qx[pair_queries] - self.xs[candidates]
+        dy = qy[pair_queries] - self.ys[candidates]
+        close = dx * dx + dy * dy < radius * radius
+        if self._discarded:
+            close &= ~np.isin(candidates, list(self._discarded))
+        return pair_queries[close], candidates[close]
+
+    def keys_at(self, qx, qy):
+        """Kunci petak yang memuat setiap titik (bentuk sama dengan qx); -1 untuk titik di luar grid."""
+        qx, qy = np.asarray(qx, dtype=np.float64), np.asarray(qy, dtype=np.float64)
+        cols = np.floor(qx / self.cell_size)
+        rows = np.floor(qy / self.cell_size)
+        inside = (cols >= 0) & (cols < self.cols) & (rows >= 0) & (rows < self.rows)
+        return np.where(inside, self._keys(np.where(inside, cols, 0).astype(np.intp), np.where(inside, rows, 0).astype(np.intp)), -1)
+
+    def counts_in(self, keys):
+        """Jumlah titik di setiap petak `keys` dari keys_at() (0 untuk -1)."""
+        keys = np.asarray(keys)
+        if len(self.xs) == 0:
+            return np.zeros(keys.shape, dtype=np.intp)
+        inside = keys >= 0
+        _, counts = self._bin_spans_of(np.where(inside, keys, 0).ravel())
+        counts = counts.reshape(keys.shape)
+        if self._discarded:
+            counts = counts - self._discarded_counts(keys)
+        return np.where(inside, counts, 0)
+
+    def _discarded_counts(self, keys):
+        # Jumlah titik yang di-discard per petak, dicari dengan searchsorted di kunci unik yang terurut
+        if self._discarded_keys is None:
+            self._discarded_keys = np.unique(self.point_keys[list(self._discarded)], return_counts=True)
+        unique, counts = self._discarded_keys
+        slots = np.minimum(np.searchsorted(unique, keys), len(unique) - 1)
+        return np.where(unique[slots] == keys, counts[slots], 0)
+
+    def _bin_spans_of(self, keys):
+        """Awal isi dan jumlah titik di petak-petak `keys` (jumlah 0 untuk petak kosong)."""
+        if self.dense:
+            starts = self.bin_start[keys]
+            return starts, self.bin_start[keys + 1] - starts
+        slots = np.minimum(np.searchsorted(self.bin_keys, keys), len(self.bin_keys) - 1)
+        starts = self.bin_start[slots]
+        counts = np.where(self.bin_keys[slots] == keys, self.bin_start[slots + 1] - starts, 0)
+        return starts, counts
+
+    def _bin_coords(self, values, limit):
+        return np.clip(np.floor(values / self.cell_size), 0, limit - 1).astype(np.intp)
+
+    def _keys(self, cols, rows):
+        return rows.astype(np.int64) * self.cols + cols
+
+class GrassIndex:
+    """Indeks spasial untuk petak rumput yang bisa diperbarui satu per satu.
+
+    Setiap rumput menempati satu slot. Memakan rumput dan menumbuhkan penggantinya cukup
+    mengganti isi slot (O(1)), tanpa list.remove. Slot juga bisa dikosongkan (None) selama rumput
+    tumbuh ulang lalu diisi lagi, sehingga jumlah slot tetap dan tidak ada alokasi ulang.
+    Untuk kueri per sel dipakai petak dict; untuk kueri seluruh populasi dipakai SpatialHash
+    yang dibangun ulang hanya jika ada perubahan.
+    """
+    def __init__(self, patches=(), expected_count=JUMLAH_RUMPUT, width=LEBAR_DUNIA, height=TINGGI_DUNIA):
+        self.width, self.height = width, height
+        self.patches = []
+        self.xs, self.ys, self.radii = [], [], []
+        self._slot_of = {}
+        self._vacant = set()
+        # Slot untuk setiap titik di _grid jika ada slot kosong (None = titik ke-i adalah slot i)
+        self._grid_slots = None
+        self._resize(expected_count)
+        for grass in patches:
+            self.add(grass)
+
+    def _resize(self, expected_count):
+        # Ukuran petak dipilih agar rata-rata ada ~2 rumput per petak, tapi tetap cukup
+        # besar untuk kueri tabrakan sel dengan rumput
+        self.expected_count = max(expected_count, 1)
+        area_per_patch = self.width * self.height / self.expected_count
+        self.cell_size = max(math.sqrt(2 * area_per_patch), RADIUS_SEL + RADIUS_RUMPUT)
+        self.cols = int(self.width // self.cell_size) + 1
+        self.rows = int(self.height // self.cell_size) + 1
+        self._bins = {}
+        for slot, grass in enumerate(self.patches):
+            if grass is not None:
+                self._bins.setdefault(self._bin_of(grass.x, grass.y), []).append(slot)
+        self._grid = SpatialHash(self.cell_size, self.width, self.height)
+        self._grid_dirty = True
+
+    def __len__(self):
+        """Jumlah rumput yang ada (slot kosong tidak dihitung)."""
+        return len(self.patches) - len(self._vacant)
+
+    def __iter__(self):
+        return (grass for grass in self.patches if grass is not None)
+
+    @property
+    def slot_count(self):
+        return len(self.patches)
+
+    def add(self, grass):
+        """Menambah rumput ke slot kosong terkecil, atau ke slot baru jika tidak ada yang kosong."""
+        return self.place(min(self._vacant) if self._vacant else len(self.patches), grass)
+
+    def place(self, slot, grass):
+        """Mengisi slot kosong tertentu; slot di luar jumlah slot saat ini dibuat (kosong) dulu."""
+        while len(self.patches) <= slot:
+            self._vacant.add(len(self.patches))
+            self.patches.append(None)
+            self.xs.append(0)
+            self.ys.append(0)
+            self.radii.append(0)
+        if self.patches[slot] is not None:
+            raise ValueError(f"Slot rumput {slot} masih terisi.")
+        self._vacant.discard(slot)
+        self._fill(slot, grass)
+        # Jauh lebih banyak rumput dari perkiraan: petak dibagi ulang agar setiap petak tetap berisi sedikit
+        if len(self.patches) > 4 * self.expected_count:
+            self._resize(len(self.patches))
+        return slot
+
+    def replace(self, old_grass, new_grass):
+        """Mengganti rumput yang dimakan dengan rumput baru di slot yang sama."""
+        slot = self._release(old_grass)
+        self._fill(slot, new_grass)
+        return slot
+
+    def remove(self, grass):
+        """Mengosongkan slot rumput yang dimakan sampai diisi lagi dengan place(); mengembalikan slotnya."""
+        slot = self._release(grass)
+        self.patches[slot] = None
+        self._vacant.add(slot)
+        return slot
+
+    def _fill(self, slot, grass):
+        self.patches[slot] = grass
+        self.xs[slot], self.ys[slot], self.radii[slot] = grass.x, grass.y, grass.radius
+        self._slot_of[grass] = slot
+        self._bins.setdefault(self._bin_of(grass.x, grass.y), []).append(slot)
+        self._grid_dirty = True
+
+    def _release(self, grass):
+        slot = self._slot_of.pop(grass)
+        self._bins[self._bin_of(grass.x, grass.y)].remove(slot)
+        self._grid_dirty = True
+        return slot
+
+    def nearest(self, x, y):
+        """Rumput terdekat dari (x, y), dicari melingkar dari petak terdekat ke luar."""
+        if not len(self):
+            return None
+        col, row = self._bin_of(x, y)
+        best_slot, best_dist = None, math.inf
+        for ring in range(max(self.cols, self.rows) + 1):
+            for c, r in self._ring(col, row, ring):
+                for slot in self._bins.get((c, r), ()):
+                    dist = math.hypot(self.xs[slot] - x, self.ys[slot] - y)
+                    if dist < best_dist:
+                        best_slot, best_dist = slot, dist
+            # Semua petak di cincin berikutnya berjarak minimal ring * cell_size
+            if best_slot is not None and best_dist <= ring * self.cell_size:
+                break
+        return self.patches[best_slot]
+
+    def first_overlapping(self, x, y, radius):
+        """Rumput pertama yang bersentuhan dengan lingkaran (x, y, radius), atau None."""
+        col, row = self._bin_of(x, y)
+        for c, r in self._ring(col, row, 1, filled=True):
+            for slot in self._bins.get((c, r), ()):
+                if math.hypot(x - self.xs[slot], y - self.ys[slot]) < radius + self.radii[slot]:
+                    return self.patches[slot]
+        return None
+
+    def nearest_slots(self, xs, ys):
+        """Versi vektor dari nearest(): indeks slot rumput terdekat untuk setiap titik."""
+        grid = self._get_grid()
+        xs, ys = np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)
+        nearest = np.full(len(xs), -1, dtype=np.intp)
+        if not len(self):
+            return nearest
+        queries, slots = grid.query_pairs(xs, ys, self.cell_size)
+        if len(queries):
+            d2 = (grid.xs[slots] - xs[queries]) ** 2 + (grid.ys[slots] - ys[queries]) ** 2
+            # Urutkan per kueri lalu per jarak; baris pertama setiap kueri adalah yang terdekat
+            order = np.lexsort((slots, d2, queries))
+            queries, slots = queries[order], slots[order]
+            first = np.ones(len(queries), dtype=bool)
+            first[1:] = queries[1:] != queries[:-1]
+            nearest[queries[first]] = slots[first]
+
+        # Titik tanpa rumput dalam jarak cell_size: periksa semua rumput (jarang terjadi)
+        missing = np.nonzero(nearest < 0)[0]
+        for start in range(0, len(missing), 256):
+            rows = missing[start:start + 256]
+            d2 = (grid.xs[None, :] - xs[rows, None]) ** 2 + (grid.ys[None, :] - ys[rows, None]) ** 2
+            nearest[rows] = np.argmin(d2, axis=1)
+        return nearest if self._grid_slots is None else self._grid_slots[nearest]
+
+    def overlap_pairs(self, xs, ys, radius):
+        """Pasangan (indeks titik, slot) untuk setiap rumput yang bersentuhan dengan lingkaran titik."""
+        if not len(self):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        grid = self._get_grid()
+        radii = np.asarray(self.radii, dtype=np.float64)
+        queries, points = grid.query_pairs(xs, ys, radius + radii.max())
+        slots = points if self._grid_slots is None else self._grid_slots[points]
+        dx = grid.xs[points] - np.asarray(xs)[queries]
+        dy = grid.ys[points] - np.asarray(ys)[queries]
+        touching = np.hypot(dx, dy) < radius + radii[slots]
+        return queries[touching], slots[touching]
+
+    def _get_grid(self):
+        if self._grid_dirty:
+            if self._vacant:
+                # Slot kosong tidak ikut dimasukkan ke grid; hasil kueri dipetakan balik ke slot
+                live = np.ones(len(self.patches), dtype=bool)
+                live[list(self._vacant)] = False
+                self._grid_slots = np.flatnonzero(live)
+                self._grid.rebuild(np.take(self.xs, self._grid_slots), np.take(self.ys, self._grid_slots))
+            else:
+                self._grid_slots = None
+                self._grid.rebuild(self.xs, self.ys)
+            self._grid_dirty = False
+        return self._grid
+
+    def _bin_of(self, x, y):
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    @staticmethod
+    def _ring(col, row, ring, filled=False):
+        """Koordinat petak pada jarak Chebyshev == ring (atau <= ring jika filled)."""
+        for r in range(row - ring, row + ring + 1):
+            for c in range(col - ring, col + ring + 1):
+                if filled or max(abs(c - col), abs(r - row)) == ring:
+                    yield c, r
@@ -0,0 +1,104 @@
+# src/utils/world_file.py
+
+import os
+import json
+import struct
+import numpy as np
+
+# Tata letak file (little-endian):
+#   [magic 8 byte][versi uint32][panjang header uint32][header JSON][padding s.d. kelipatan 64]
+#   [raster biome uint8 (width, height)]   <- tidak ada untuk dunia berpetak (hanya parameter)
+MAGIC = b'AIWORLD\x00'
+FORMAT_VERSION = 1
+PREFIX = struct.Struct('<8sII')
+DATA_ALIGN = 64
+BIOME_DTYPE = np.dtype('u1')
+
+def _align(offset, alignment):
+    return -(-offset // alignment) * alignment
+
+class WorldFile:
+    """Parameter pembuatan dunia (seed, skala, oktaf, ambang biome) beserta raster ID biome-nya.
+
+    Raster disimpan apa adanya (uint8, urutan [x, y]) sehingga saat dimuat cukup di-memmap,
+    tanpa membuat ulang noise maupun men-decode gambar. biome_map None berarti hanya parameter
+    yang disimpan (dunia berpetak dibuat ulang dari seed).
+    """
+    def __init__(self, width, height, seed, scale, octaves, thresholds, biome_map=None):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.scale = scale
+        self.octaves = octaves
+        self.thresholds = [float(t) for t in thresholds]
+        self.biome_map = biome_map
+
+    def matches(self, scale, octaves, thresholds, width=None, height=None, seed=None):
+        """True jika dunia ini dibuat dengan parameter yang sama (width/height/seed None = bebas)."""
+        return (self.scale == scale and self.octaves == octaves
+                and self.thresholds == [float(t) for t in thresholds]
+                and (width is None or self.width == width)
+                and (height is None or self.height == height)
+                and (seed is None or self.seed == seed))
+
+    def save(self, filepath):
+        """Menulis file dunia secara atomik (file sementara lalu rename). Mengembalikan True jika berhasil."""
+        header = json.dumps({
+            'width': self.width,
+            'height': self.height,
+            'seed': None if self.seed is None else int(self.seed),
+            'scale': self.scale,
+            'octaves': self.octaves,
+            'thresholds': self.thresholds,
+            'has_raster': self.biome_map is not None,
+        }).encode('utf-8')
+        data_offset = _align(PREFIX.size + len(header), DATA_ALIGN)
+        directory = os.path.dirname(filepath)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = filepath + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+                f.write(header)
+                if self.biome_map is not None:
+                    f.write(b'\x00' * (data_offset - PREFIX.size - len(header)))
+                    f.write(np.ascontiguousarray(self.biome_map, dtype=BIOME_DTYPE).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+            return True
+        except OSError as e:
+            print(f"❌ Gagal menyimpan dunia: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    @classmethod
+    def load(cls, filepath, mmap=True):
+        """Memuat file dunia; mengembalikan None jika file tidak ada atau rusak."""
+        if not os.path.exists(filepath):
+            return None
+        try:
+            with open(filepath, 'rb') as f:
+                magic, version, header_length = PREFIX.unpack(f.read(PREFIX.size))
+                if magic != MAGIC:
+                    print(f"❌ {filepath} bukan file dunia.")
+                    return None
+                if version != FORMAT_VERSION:
+                    print(f"❌ Versi file dunia {version} tidak didukung (diharapkan {FORMAT_VERSION}).")
+                    return None
+                header = json.loads(f.read(header_length).decode('utf-8'))
+            width, height = header['width'], header['height']
+            biome_map = None
+            if header['has_raster']:
+                data_offset = _align(PREFIX.size + header_length, DATA_ALIGN)
+                if mmap:
+                    biome_map = np.memmap(filepath, dtype=BIOME_DTYPE, mode='r', offset=data_offset, shape=(width, height))
+                else:
+                    biome_map = np.fromfile(filepath, dtype=BIOME_DTYPE, count=width * height, offset=data_offset)
+                    biome_map = biome_map.reshape(width, height)
+            return cls(width, height, header['seed'], header['scale'], header['octaves'], header['thresholds'], biome_map)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"❌ Gagal memuat dunia dari file: {e}")
+            return None
@@ -2,85 +2,345 @@
 
 import pygame
 import numpy as np
-from perlin_noise import PerlinNoise
 import os
+import threading
+from collections import OrderedDict
 from settings import *
+from src.utils.noise import generate_perlin, perlin_tile
+from src.utils.world_file import WorldFile
+
+# ID biome pada raster biome_map, urut sesuai ambang batas ketinggian
+BIOMES = ['air', 'pasir', 'rumput', 'hutan', 'batu']
+BIOME_AIR, BIOME_PASIR, BIOME_RUMPUT, BIOME_HUTAN, BIOME_BATU = range(len(BIOMES))
+BIOME_THRESHOLDS = np.array([TINGKAT_AIR, TINGKAT_PASIR, TINGKAT_RUMPUT, TINGKAT_HUTAN])
+
+# Tabel pencarian per ID biome (pengganti lookup dict berbasis string)
+SPEED_MULTIPLIER = np.array([PENGARUH_TERRAIN[b]['speed_multiplier'] for b in BIOMES])
+ENERGY_COST = np.array([PENGARUH_TERRAIN[b]['energy_cost'] for b in BIOMES])
+SENSOR_VALUE = np.array([NILAI_SENSOR_TERRAIN.get(b, 0.0) for b in BIOMES])
+BIOME_COLORS = np.array([WARNA_TERRAIN[b] for b in BIOMES], dtype=np.uint8)
+OUTSIDE_COLOR = tuple(BIOME_COLORS[BIOME_BATU].tolist())
+
+# Jumlah titik sampel per sumbu untuk menaksir rentang noise seluruh dunia berpetak
+NORMALIZE_SAMPLES = 256
+# Peta ketinggian float64 format lama; dikonversi sekali ke WORLD_FILE jika masih ada
+LEGACY_WORLD_FILE = 'data/world.npy'
 
 class Terrain:
-    def __init__(self, width, height, scale=TERRAIN_SCALE, octaves=6, seed=None):
+    def __init__(self, width, height, scale=TERRAIN_SCALE, octaves=6, seed=None, headless=False, use_cache=True):
         self.width = width
         self.height = height
         self.scale = scale
         self.octaves = octaves
-        self.seed = seed if seed is not None else np.random.randint(0, 100)
-
-        self.terrain_map = self.load_map_data(WORLD_FILE)
-        self.terrain_surface = self.load_map_image(WORLD_IMAGE_FILE)
+        self.headless = headless
 
-        if self.terrain_map is None or self.terrain_surface is None:
+        # use_cache=False: dunia dibuat dari seed di memori, tanpa membaca/menulis file dunia
+        world = self.load_world(WORLD_FILE, seed) if use_cache else None
+        if world is not None:
+            # Raster uint8 di-memmap: 1 byte per piksel, tanpa noise maupun decode gambar
+            self.seed = world.seed
+            self.biome_map = world.biome_map
+        else:
             print("Membuat data terrain baru (mungkin perlu beberapa saat)...")
-            self.terrain_map = self.generate_world()
-            self.terrain_surface = self.create_terrain_surface_optimized()
-            self.save_world()
+            self.seed = seed if seed is not None else np.random.randint(1, 100)
+            self.biome_map = self.create_biome_map(self.generate_world())
+            if use_cache:
+                self.save_world()
+        # Tanpa layar, surface tidak bisa di-convert() dan memang tidak dibutuhkan
+        self.terrain_surface = None if headless else self.create_terrain_surface_optimized()
 
-    # vvv FUNGSI DIPERBAIKI vvv
-    def generate_world(self):
-        """Membuat peta noise. Kembali menggunakan loop karena .map tidak ada."""
-        noise = PerlinNoise(octaves=self.octaves, seed=self.seed)
-        world = np.zeros((self.width, self.height))
-        # Perulangan ini memang lebih lambat, tapi hanya dijalankan sekali
-        for i in range(self.width):
-            for j in range(self.height):
-                world[i][j] = noise([i / self.scale, j / self.scale])
-        
+    def generate_world(self, workers=None):
+        """Membuat peta noise dengan operasi array (dunia besar dibagi per petak ke beberapa proses)."""
+        world = generate_perlin(self.width, self.height, self.scale, self.octaves, self.seed, workers=workers)
         world = (world - np.min(world)) / (np.max(world) - np.min(world))
         return world
-    # ^^^ FUNGSI DIPERBAIKI ^^^
+
+    @staticmethod
+    def create_biome_map(terrain_map):
+        """Mengubah peta ketinggian menjadi raster ID biome (uint8) satu kali di awal."""
+        return np.digitize(terrain_map, BIOME_THRESHOLDS).astype(np.uint8)
 
     def create_terrain_surface_optimized(self):
-        """Membuat surface menggunakan NumPy (Sangat Cepat)."""
-        image_array = np.zeros((self.width, self.height, 3), dtype=np.uint8)
-        image_array[self.terrain_map < TINGKAT_AIR] = WARNA_TERRAIN['air']
-        image_array[(self.terrain_map >= TINGKAT_AIR) & (self.terrain_map < TINGKAT_PASIR)] = WARNA_TERRAIN['pasir']
-        image_array[(self.terrain_map >= TINGKAT_PASIR) & (self.terrain_map < TINGKAT_RUMPUT)] = WARNA_TERRAIN['rumput']
-        image_array[(self.terrain_map >= TINGKAT_RUMPUT) & (self.terrain_map < TINGKAT_HUTAN)] = WARNA_TERRAIN['hutan']
-        image_array[self.terrain_map >= TINGKAT_HUTAN] = WARNA_TERRAIN['batu']
-        return pygame.surfarray.make_surface(image_array)
+        """Membuat surface langsung dari raster biome dengan tabel warna NumPy (Sangat Cepat)."""
+        surface = pygame.surfarray.make_surface(BIOME_COLORS[self.biome_map])
+        return surface.convert() if pygame.display.get_surface() else surface
 
     def get_biome_at(self, x, y):
         """Mendapatkan tipe biome pada koordinat x, y."""
+        return BIOMES[self.get_biome_id_at(x, y)]
+
+    def get_biome_id_at(self, x, y):
+        """Mendapatkan ID biome (indeks ke BIOMES) pada koordinat x, y."""
         if 0 <= x < self.width and 0 <= y < self.height:
-            val = self.terrain_map[int(x)][int(y)]
-            if val < TINGKAT_AIR: return 'air'
-            if val < TINGKAT_PASIR: return 'pasir'
-            if val < TINGKAT_RUMPUT: return 'rumput'
-            if val < TINGKAT_HUTAN: return 'hutan'
-            return 'batu'
-        return 'batu' # Default jika di luar batas
+            return int(self.biome_map[int(x), int(y)])
+        return BIOME_BATU # Default jika di luar batas
+
+    def get_biome_ids(self, xs, ys):
+        """Versi vektor dari get_biome_id_at untuk banyak titik sekaligus."""
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        ix = np.where(inside, xs, 0).astype(np.intp)
+        iy = np.where(inside, ys, 0).astype(np.intp)
+        return np.where(inside, self.biome_map[ix, iy], BIOME_BATU)
 
     def draw(self, screen):
         screen.blit(self.terrain_surface, (0, 0))
 
+    def blit_region(self, target, rect, dest=(0, 0)):
+        """Menggambar area rect (koordinat dunia) dari terrain ke target pada posisi dest."""
+        target.blit(self.terrain_surface, dest, rect)
+
     def save_world(self):
-        if not os.path.exists('data'):
-            os.makedirs('data')
-        np.save(WORLD_FILE, self.terrain_map)
-        pygame.image.save(self.terrain_surface, WORLD_IMAGE_FILE)
-        print(f"Dunia (data & gambar) berhasil disimpan.")
-
-    def load_map_data(self, filename):
-        if os.path.exists(filename):
-            return np.load(filename)
-        return None
-
-    def load_map_image(self, filename):
-        if os.path.exists(filename):
-            print(f"Memuat gambar peta dari {filename} (CEPAT)...")
-            return pygame.image.load(filename).convert()
-        return None
+        world = WorldFile(self.width, self.height, self.seed, self.scale, self.octaves, BIOME_THRESHOLDS, self.biome_map)
+        if world.save(WORLD_FILE):
+            print(f"Dunia berhasil disimpan ke {WORLD_FILE}.")
+
+    def load_world(self, filename, seed=None):
+        """Memuat raster biome dari file dunia jika dibuat dengan parameter yang sama; selain itu None."""
+        if not os.path.exists(filename):
+            return self._convert_legacy_world(LEGACY_WORLD_FILE) if seed is None else None
+        world = WorldFile.load(filename)
+        if world is None:
+            return None
+        if not world.matches(self.scale, self.octaves, BIOME_THRESHOLDS, self.width, self.height, seed) or world.biome_map is None:
+            print(f"Info: File dunia {filename} dibuat dengan pengaturan lain, dunia dibuat ulang.")
+            return None
+        print(f"Memuat dunia dari {filename} (CEPAT)...")
+        return world
+
+    def _convert_legacy_world(self, filename):
+        # Peta ketinggian lama (float64) cukup dikuantisasi; seed aslinya tidak tercatat
+        if not os.path.exists(filename):
+            return None
+        terrain_map = np.load(filename)
+        if terrain_map.shape != (self.width, self.height):
+            return None
+        print(f"Mengonversi dunia format lama {filename} ke {WORLD_FILE}...")
+        world = WorldFile(self.width, self.height, None, self.scale, self.octaves, BIOME_THRESHOLDS,
+                          self.create_biome_map(terrain_map))
+        world.save(WORLD_FILE)
+        return world
+
+    def release_world_file(self):
+        """Menyalin raster ke memori dan melepas memmap file dunia agar file itu boleh ditimpa."""
+        if isinstance(self.biome_map, np.memmap):
+            self.biome_map = np.array(self.biome_map)
 
     @classmethod
-    def create_new_world(cls, width, height):
-        if os.path.exists(WORLD_FILE): os.remove(WORLD_FILE)
-        if os.path.exists(WORLD_IMAGE_FILE): os.remove(WORLD_IMAGE_FILE)
-        return cls(width, height)
\ No newline at end of file
+    def create_new_world(cls, width, height, previous=None):
+        # Di Windows os.replace gagal jika file dunia masih di-memmap, jadi terrain lama dilepas dulu
+        if previous is not None:
+            previous.release_world_file()
+        if os.path.exists(LEGACY_WORLD_FILE): os.remove(LEGACY_WORLD_FILE)
+        terrain = cls(width, height, use_cache=False)
+        terrain.save_world()
+        return terrain
+
+class TileCache:
+    """Cache LRU berukuran tetap untuk petak terrain; petak yang paling lama tidak dipakai dibuang."""
+    def __init__(self, max_tiles):
+        self.max_tiles = max(1, max_tiles)
+        self.tiles = OrderedDict()
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def get(self, key, create):
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = create(key)
+            self.tiles[key] = tile
+            if len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return tile
+
+class BiomeTilePool:
+    """Petak biome dalam satu array uint8 (slot, tile_size, tile_size) berukuran tetap, dengan penggusuran LRU.
+
+    Banyak titik sekaligus cukup dipetakan ke slot petaknya lalu dibaca dengan satu indeks NumPy,
+    tanpa loop per petak. Memori selalu max_tiles x tile_size^2 byte, berapa pun luas dunianya.
+    """
+    def __init__(self, max_tiles, tile_size, create):
+        self.max_tiles = max(1, max_tiles)
+        self.tiles = np.zeros((self.max_tiles, tile_size, tile_size), dtype=np.uint8)
+        self.last_used = np.zeros(self.max_tiles, dtype=np.int64)
+        self.create = create
+        self.slot_of = {}
+        self.key_of = [None] * self.max_tiles
+        self.clock = 0
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def slots(self, keys):
+        """Slot untuk setiap kunci (paling banyak max_tiles kunci unik); petak yang belum ada dibuat."""
+        self.clock += 1
+        slots = np.array([self.slot_of.get(key, -1) for key in keys], dtype=np.intp)
+        # Tandai dulu petak yang sudah ada agar tidak tergusur oleh petak baru di panggilan yang sama
+        self.last_used[slots[slots >= 0]] = self.clock
+        for i in np.flatnonzero(slots < 0).tolist():
+            slots[i] = self._load(keys[i])
+        return slots
+
+    def _load(self, key):
+        if len(self.slot_of) < self.max_tiles:
+            slot = len(self.slot_of)
+        else:
+            slot = int(np.argmin(self.last_used))
+            del self.slot_of[self.key_of[slot]]
+        tile = self.create(key)
+        self.tiles[slot, :tile.shape[0], :tile.shape[1]] = tile
+        self.slot_of[key] = slot
+        self.key_of[slot] = key
+        self.last_used[slot] = self.clock
+        return slot
+
+class ChunkedTerrain:
+    """Terrain untuk dunia yang jauh lebih besar dari layar (mis. 20k x 20k).
+
+    Dunia dibagi menjadi petak tile_size x tile_size yang dibuat dari seed saat pertama kali
+    dibutuhkan. Petak biome (uint8) dan petak surface siap-blit disimpan di cache LRU berukuran
+    tetap, sehingga memori tidak bergantung pada luas dunia. Antarmukanya sama dengan Terrain,
+    kecuali tidak ada terrain_surface/biome_map untuk seluruh dunia.
+
+    Cache biome harus muat semua petak di sekitar sel (posisi + sensor); jika sel tersebar lebih
+    luas dari itu, petak terus dibuat ulang dan simulasi melambat (naikkan MAKS_PETAK_BIOME).
+    """
+    def __init__(self, width, height, scale=TERRAIN_SCALE, octaves=6, seed=None, headless=False, use_cache=True,
+                 tile_size=UKURAN_PETAK_TERRAIN, max_biome_tiles=MAKS_PETAK_BIOME, max_surface_tiles=MAKS_PETAK_GAMBAR):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.octaves = octaves
+        self.headless = headless
+        self.tile_size = tile_size
+        self.tiles_y = -(-height // tile_size)
+
+        # Hanya parameter (tanpa raster) yang disimpan; dunia yang sama selalu bisa dibuat ulang dari seed
+        saved_seed = self.load_seed(CHUNKED_WORLD_FILE) if use_cache and seed is None else None
+        # Seed 0 adalah seed yang sah, jadi yang dicek None, bukan nilai falsy
+        if seed is not None:
+            self.seed = seed
+        elif saved_seed is not None:
+            self.seed = saved_seed
+        else:
+            self.seed = np.random.randint(1, 100)
+        if use_cache and saved_seed is None:
+            self.save_world()
+
+        # Min/max per petak akan membuat batas petak tidak menyambung, jadi rentang normalisasi
+        # diambil sekali dari sampel kasar seluruh dunia
+        self.low, self.high = self._noise_range()
+        self.biome_tiles = BiomeTilePool(max_biome_tiles, tile_size, self._create_biome_tile)
+        self.surface_tiles = TileCache(max_surface_tiles)
+        # Petak bisa diminta thread simulasi dan thread UI bersamaan
+        self.lock = threading.RLock()
+
+    def _noise_range(self):
+        # Noise pada skala scale/stride di piksel i sama dengan noise dunia di piksel i*stride
+        stride = max(1.0, max(self.width, self.height) / NORMALIZE_SAMPLES)
+        samples = perlin_tile(0, 0, int(self.width / stride) + 1, int(self.height / stride) + 1,
+                              self.scale / stride, self.octaves, self.seed)
+        return float(samples.min()), float(samples.max())
+
+    def _create_biome_tile(self, key):
+        tx, ty = divmod(key, self.tiles_y)
+        x0, y0 = tx * self.tile_size, ty * self.tile_size
+        width, height = min(self.tile_size, self.width - x0), min(self.tile_size, self.height - y0)
+        heights = (perlin_tile(x0, y0, width, height, self.scale, self.octaves, self.seed) - self.low) / (self.high - self.low)
+        return np.digitize(heights, BIOME_THRESHOLDS).astype(np.uint8)
+
+    def _create_surface_tile(self, key):
+        surface = pygame.surfarray.make_surface(BIOME_COLORS[self.biome_tile(*key)])
+        return surface if self.headless or not pygame.display.get_surface() else surface.convert()
+
+    def biome_tile(self, tx, ty):
+        """Salinan raster ID biome (uint8) petak (tx, ty); slot di pool bisa ditimpa thread lain."""
+        with self.lock:
+            slot = self.biome_tiles.slots([tx * self.tiles_y + ty])[0]
+            width = min(self.tile_size, self.width - tx * self.tile_size)
+            height = min(self.tile_size, self.height - ty * self.tile_size)
+            return self.biome_tiles.tiles[slot, :width, :height].copy()
+
+    def surface_tile(self, tx, ty):
+        with self.lock:
+            return self.surface_tiles.get((tx, ty), self._create_surface_tile)
+
+    def get_biome_at(self, x, y):
+        """Mendapatkan tipe biome pada koordinat x, y."""
+        return BIOMES[self.get_biome_id_at(x, y)]
+
+    def get_biome_id_at(self, x, y):
+        """Mendapatkan ID biome (indeks ke BIOMES) pada koordinat x, y."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            ix, iy = int(x), int(y)
+            with self.lock:
+                slot = self.biome_tiles.slots([(ix // self.tile_size) * self.tiles_y + iy // self.tile_size])[0]
+                return int(self.biome_tiles.tiles[slot, ix % self.tile_size, iy % self.tile_size])
+        return BIOME_BATU # Default jika di luar batas
+
+    def get_biome_ids(self, xs, ys):
+        """Versi vektor dari get_biome_id_at; setiap petak unik hanya dicari sekali di cache."""
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        points = np.flatnonzero(inside)
+        ix = xs.ravel()[points].astype(np.intp)
+        iy = ys.ravel()[points].astype(np.intp)
+        keys, inverse = np.unique((ix // self.tile_size) * self.tiles_y + iy // self.tile_size, return_inverse=True)
+        lx, ly = ix % self.tile_size, iy % self.tile_size
+
+        result = np.full(inside.size, BIOME_BATU, dtype=np.uint8)
+        pool = self.biome_tiles
+        with self.lock:
+            # Petak unik diproses per kelompok yang muat di pool agar tidak saling menggusur
+            for start in range(0, len(keys), pool.max_tiles):
+                slots = pool.slots(keys[start:start + pool.max_tiles].tolist())
+                chunk = np.flatnonzero((inverse >= start) & (inverse < start + len(slots)))
+                result[points[chunk]] = pool.tiles[slots[inverse[chunk] - start], lx[chunk], ly[chunk]]
+        return result.reshape(inside.shape)
+
+    def blit_region(self, target, rect, dest=(0, 0)):
+        """Menggambar area rect (koordinat dunia) dari terrain ke target pada posisi dest."""
+        rect = pygame.Rect(rect)
+        world = rect.clip(pygame.Rect(0, 0, self.width, self.height))
+        if world != rect:
+            target.fill(OUTSIDE_COLOR, (dest, rect.size))
+        if not world.width or not world.height:
+            return
+        size = self.tile_size
+        for tx in range(world.left // size, (world.right - 1) // size + 1):
+            for ty in range(world.top // size, (world.bottom - 1) // size + 1):
+                tile_rect = pygame.Rect(tx * size, ty * size, size, size)
+                part = tile_rect.clip(world)
+                target.blit(self.surface_tile(tx, ty), (dest[0] + part.x - rect.x, dest[1] + part.y - rect.y),
+                            part.move(-tile_rect.x, -tile_rect.y))
+
+    def draw(self, screen):
+        self.blit_region(screen, screen.get_rect())
+
+    def save_world(self):
+        world = WorldFile(self.width, self.height, self.seed, self.scale, self.octaves, BIOME_THRESHOLDS)
+        if world.save(CHUNKED_WORLD_FILE):
+            print(f"Parameter dunia berpetak (seed {self.seed}) berhasil disimpan.")
+
+    def load_seed(self, filename):
+        # Seed lama hanya berlaku jika bentuk noise dan ambang biome-nya sama; ukuran dunia boleh berubah
+        world = WorldFile.load(filename)
+        if world is None or not world.matches(self.scale, self.octaves, BIOME_THRESHOLDS):
+            return None
+        return world.seed
+
+    @classmethod
+    def create_new_world(cls, width, height, previous=None):
+        # Petak dibuat dari noise, tidak ada file dunia yang di-memmap untuk dilepas
+        terrain = cls(width, height, use_cache=False)
+        terrain.save_world()
+        return terrain
+
+def create_terrain(width=LEBAR_DUNIA, height=TINGGI_DUNIA, **kwargs):
+    """Terrain seukuran layar disimpan utuh (Terrain); dunia yang lebih besar dibuat berpetak."""
+    if width > LEBAR_LAYAR or height > TINGGI_LAYAR:
+        return ChunkedTerrain(width, height, **kwargs)
+    return Terrain(width, height, **kwargs)
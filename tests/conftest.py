@@ -0,0 +1,8 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Modul proyek diimpor dari akar repo (seperti main.py); pygame tidak perlu jendela sungguhan
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
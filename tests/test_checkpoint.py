@@ -0,0 +1,51 @@
+# tests/test_checkpoint.py
+
+import numpy as np
+from settings import NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS
+from neural_network import NeuralNetwork, random_genomes
+from src.utils.checkpoint import BrainCheckpoint
+
+def test_save_load_round_trip(tmp_path):
+    rng = np.random.default_rng(4)
+    genomes = random_genomes(12, rng)
+    fitness = rng.uniform(0, 100, 12)
+    checkpoint = BrainCheckpoint.from_population(genomes, fitness, generation=7, parents=3, rng=rng)
+    path = str(tmp_path / 'brains.bin')
+    assert checkpoint.save(path)
+
+    for mmap in (True, False):
+        loaded = BrainCheckpoint.load(path, mmap=mmap)
+        order = np.argsort(-fitness, kind='stable')
+        np.testing.assert_array_equal(loaded.genomes, genomes[order])
+        np.testing.assert_array_equal(loaded.fitness, fitness[order])
+        assert (loaded.generation, loaded.parents) == (7, 3)
+        assert len(loaded.parent_genomes) == 3
+        assert loaded.rng_state == rng.bit_generator.state
+        assert loaded.best_fitness == fitness.max()
+        del loaded
+
+def test_load_missing_file_returns_none(tmp_path):
+    assert BrainCheckpoint.load(str(tmp_path / 'tidak_ada.bin')) is None
+
+def test_load_legacy_npz(tmp_path):
+    rng = np.random.default_rng(5)
+    brains = [NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS, rng) for _ in range(4)]
+    path = tmp_path / 'legacy.npz'
+    arrays = {}
+    for i, brain in enumerate(brains):
+        arrays[f'w_ih_{i}'] = brain.weights_ih
+        arrays[f'w_ho_{i}'] = brain.weights_ho
+    np.savez(path, **arrays)
+
+    # Nama .bin yang belum ada jatuh kembali ke file .npz lama dengan nama yang sama
+    loaded = BrainCheckpoint.load(str(tmp_path / 'legacy.bin'))
+    assert len(loaded) == 4 and loaded.parents == 4 and loaded.generation == 0
+    inputs = rng.uniform(-1, 1, NUM_INPUTS)
+    for i, brain in enumerate(brains):
+        np.testing.assert_array_equal(loaded.genomes[i], brain.to_genome())
+        np.testing.assert_array_equal(loaded.brain(i).predict(inputs), brain.predict(inputs))
+
+def test_legacy_npz_with_wrong_topology_is_rejected(tmp_path):
+    path = tmp_path / 'legacy.npz'
+    np.savez(path, w_ih_0=np.zeros((2, 2)), w_ho_0=np.zeros((1, 2)))
+    assert BrainCheckpoint.load(str(path)) is None
@@ -0,0 +1,37 @@
+# tests/test_genome_metrics.py
+
+import numpy as np
+from neural_network import random_genomes, GENOME_LENGTH
+from src.utils.genome_metrics import generation_metrics, genome_distances, sample_indices
+
+def test_genome_distances_match_rms_difference():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(4, 10)), rng.normal(size=(3, 10))
+    expected = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).mean(axis=2))
+    np.testing.assert_allclose(genome_distances(a, b), expected, atol=1e-9)
+
+def test_sample_always_contains_fittest():
+    fitness = np.arange(1000.0)
+    sample = sample_indices(fitness, 16, np.random.default_rng(1))
+    assert len(sample) == 16 and 999 in sample
+
+def test_collapsed_population_has_fewer_species_than_random():
+    rng = np.random.default_rng(2)
+    random_population = random_genomes(300, rng)
+    parent = random_genomes(1, rng)
+    collapsed = (parent + rng.normal(0, 0.01, (300, GENOME_LENGTH))).astype(np.float32)
+    fitness = rng.random(300)
+
+    diverse = generation_metrics(random_population, fitness, 1, np.random.default_rng(3))
+    clones = generation_metrics(collapsed, fitness, 1, np.random.default_rng(3))
+    assert diverse['species_count'] == diverse['sampled']
+    assert clones['species_count'] == 1
+    assert clones['clone_fraction'] == 1.0
+    assert sum(s['size'] for s in clones['species']) == 300
+
+def test_sampling_depends_on_rng_not_generation():
+    rng = np.random.default_rng(4)
+    genomes, fitness = random_genomes(600, rng), rng.random(600)
+    a = generation_metrics(genomes, fitness, 7, np.random.default_rng(10), sample_size=32)
+    b = generation_metrics(genomes, fitness, 7, np.random.default_rng(11), sample_size=32)
+    assert a['distance'] != b['distance']
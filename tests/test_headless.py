@@ -0,0 +1,26 @@
+# tests/test_headless.py
+
+from settings import JUMLAH_SEL_AWAL
+from terrain import create_terrain
+from src.simulation.headless import HeadlessTrainer
+from src.utils.checkpoint import BrainCheckpoint
+
+def test_save_checkpoint_before_run(tmp_path):
+    brain_file = str(tmp_path / 'brains.bin')
+    trainer = HeadlessTrainer(create_terrain(seed=3, headless=True, use_cache=False), brain_file=brain_file, seed=1)
+    try:
+        trainer.save_checkpoint()
+    finally:
+        trainer.close()
+    assert trainer.writer is None
+    checkpoint = BrainCheckpoint.load(brain_file)
+    assert checkpoint is not None and len(checkpoint) == JUMLAH_SEL_AWAL
+
+def test_run_writes_final_checkpoint(tmp_path):
+    brain_file = str(tmp_path / 'brains.bin')
+    trainer = HeadlessTrainer(create_terrain(seed=3, headless=True, use_cache=False), brain_file=brain_file,
+                              seed=1, save_every=0, save_seconds=0, log_every=0)
+    trainer.run(max_generations=1)
+    checkpoint = BrainCheckpoint.load(brain_file)
+    assert trainer.generations_done == 1 and trainer.writer is None
+    assert checkpoint is not None and checkpoint.generation >= 1
@@ -0,0 +1,58 @@
+# tests/test_population.py
+
+import numpy as np
+import pytest
+from neural_network import NeuralNetwork, BrainBank
+from settings import NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS
+from terrain import create_terrain
+from src.entity.cell import Cell
+from src.simulation import base_simulation
+from src.simulation.base_simulation import BaseSimulation
+
+@pytest.fixture(scope='module')
+def terrain():
+    # Dunia dari seed tetap, tanpa membaca/menulis file dunia di data/
+    return create_terrain(seed=3, headless=True, use_cache=False)
+
+def test_brain_bank_matches_per_object_predict():
+    rng = np.random.default_rng(0)
+    brains = [NeuralNetwork(NUM_INPUTS, NUM_HIDDEN, NUM_OUTPUTS, rng=rng) for _ in range(32)]
+    inputs = rng.uniform(-1, 1, (32, NUM_INPUTS))
+    expected = np.array([brain.predict(x) for brain, x in zip(brains, inputs)])
+    np.testing.assert_array_equal(BrainBank(brains).predict(inputs), expected)
+
+def _trajectory(terrain, monkeypatch, vectorized, ticks=200):
+    monkeypatch.setattr(base_simulation, 'GUNAKAN_MESIN_VEKTOR', vectorized)
+    simulation = BaseSimulation(headless=True, seed=5)
+    simulation.terrain = terrain
+    simulation.cells = [Cell(rng=simulation.random)]
+    simulation._spawn_initial_grass()
+    trajectory = []
+    for _ in range(ticks):
+        simulation.tick()
+        simulation.sync_cells()
+        if not simulation.cells:
+            break
+        cell = simulation.cells[0]
+        trajectory.append((cell.x, cell.y, cell.angle, cell.energy, cell.fitness, cell.state))
+    return trajectory
+
+def test_vector_engine_matches_scalar_engine_for_one_cell(terrain, monkeypatch):
+    scalar = _trajectory(terrain, monkeypatch, vectorized=False)
+    vector = _trajectory(terrain, monkeypatch, vectorized=True)
+    assert scalar and scalar == vector
+
+def test_dead_cells_keep_their_final_fitness(terrain, monkeypatch):
+    monkeypatch.setattr(base_simulation, 'GUNAKAN_MESIN_VEKTOR', True)
+    simulation = BaseSimulation(headless=True, seed=6)
+    simulation.terrain = terrain
+    cells = [Cell(rng=simulation.random) for _ in range(5)]
+    simulation.cells = list(cells)
+    for _ in range(3):
+        simulation.tick()
+    population = simulation.population
+    final_fitness = float(population.fitness[0])
+    population.energy[0] = 0.0
+    population.remove_dead()
+    assert cells[0] not in simulation.cells
+    assert final_fitness > 0 and cells[0].fitness == final_fitness
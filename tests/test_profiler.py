@@ -0,0 +1,35 @@
+# tests/test_profiler.py
+
+import threading
+from src.utils.profiler import Profiler
+
+def test_stats_reports_percentiles_per_phase():
+    profiler = Profiler(enabled=True, window=10)
+    for ms in range(1, 21):
+        profiler.add('sim.total', ms / 1000)
+        profiler.end_frame('sim')
+    (name, p50, p95, p99), = profiler.stats()
+    # Hanya 10 frame terakhir (11..20 ms) yang tersisa di jendela
+    assert name == 'sim.total' and 15 <= p50 <= 16 and p99 <= 20
+
+def test_stats_is_safe_while_another_thread_ends_frames():
+    profiler = Profiler(enabled=True, window=50)
+    stop = threading.Event()
+
+    def simulate():
+        frame = 0
+        while not stop.is_set():
+            # Fase baru terus muncul, seperti scope yang pertama kali dipakai di tengah jalan
+            profiler.add(f'sim.phase{frame % 100}', 0.001)
+            profiler.end_frame('sim')
+            frame += 1
+
+    thread = threading.Thread(target=simulate)
+    thread.start()
+    try:
+        for _ in range(50):
+            for _, p50, p95, p99 in profiler.stats():
+                assert p50 <= p95 <= p99
+    finally:
+        stop.set()
+        thread.join()
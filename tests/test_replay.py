@@ -0,0 +1,89 @@
+# tests/test_replay.py
+
+import math
+import numpy as np
+import pytest
+from terrain import create_terrain
+from src.entity.cell import Cell
+from src.simulation import base_simulation
+from src.simulation.base_simulation import BaseSimulation
+from src.simulation.replay import ReplayRecorder, ReplayPlayer
+from src.simulation.stepper import CellSnapshot
+
+KEYFRAME_INTERVAL = 10
+
+@pytest.fixture(scope='module')
+def terrain():
+    return create_terrain(seed=3, headless=True, use_cache=False)
+
+@pytest.fixture
+def recording(terrain, tmp_path, monkeypatch):
+    """Merekam 45 tick dan mengembalikan (path, {tick: (snapshot, rumput)}) sebagai acuan."""
+    monkeypatch.setattr(base_simulation, 'GUNAKAN_MESIN_VEKTOR', True)
+    simulation = BaseSimulation(headless=True, seed=9)
+    simulation.terrain = terrain
+    simulation.cells = [Cell(rng=simulation.random) for _ in range(30)]
+    simulation._spawn_initial_grass()
+    path = str(tmp_path / 'replay.bin')
+    simulation.recorder = ReplayRecorder(path, simulation.seed, terrain, keyframe_interval=KEYFRAME_INTERVAL)
+    expected = {}
+    for tick in range(45):
+        if tick in (4, 17):
+            # Beberapa sel mati di tengah interval keyframe (rekaman tick membuang indeksnya)
+            simulation.population.energy[tick % 7::9] = 0.0
+        simulation.tick()
+        grass = [None if g is None else (g.x, g.y, g.seed) for g in simulation.grass_patches.patches]
+        expected[simulation.tick_count] = (CellSnapshot.capture(simulation.cells, simulation.population), grass)
+    simulation.stop_recording()
+    return path, expected
+
+def _assert_matches(player, expected):
+    snapshot, grass = expected[player.tick]
+    actual = player.snapshot
+    assert len(actual) == len(snapshot)
+    for name in ('x', 'y', 'fitness'):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(snapshot, name).astype(np.float32))
+    # Keyframe menyimpan sudut apa adanya, rekaman tick dalam [0, 2pi): bandingkan arahnya saja
+    angle_diff = np.mod(actual.angle - snapshot.angle + math.pi, 2 * math.pi) - math.pi
+    np.testing.assert_allclose(angle_diff, 0, atol=1e-2)
+    np.testing.assert_allclose(actual.speed, snapshot.speed, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(actual.energy, snapshot.energy, rtol=1e-3, atol=1e-3)
+    np.testing.assert_array_equal(actual.male, snapshot.male)
+    assert player.grass == grass
+
+def test_seek_matches_recorded_ticks_in_any_order(recording):
+    path, expected = recording
+    player = ReplayPlayer.load(path)
+    try:
+        assert (player.first_tick, player.last_tick) == (min(expected), max(expected))
+        assert len(player.keyframes) > 2
+        # Mundur, maju dalam satu interval, melewati keyframe, dan tick yang sama dua kali
+        for tick in (45, 1, 26, 8, 8, 9, 10, 11, 33, 18, 45):
+            player.seek(tick)
+            assert player.tick == tick and player.changed_slots is None
+            _assert_matches(player, expected)
+    finally:
+        player.close()
+
+def test_step_after_seek_follows_recording(recording):
+    path, expected = recording
+    player = ReplayPlayer.load(path)
+    try:
+        player.seek(15)
+        while player.step():
+            _assert_matches(player, expected)
+        assert player.tick == player.last_tick
+    finally:
+        player.close()
+
+def test_seek_clamps_to_recorded_range(recording):
+    path, expected = recording
+    player = ReplayPlayer.load(path)
+    try:
+        player.seek(10 ** 6)
+        assert player.tick == player.last_tick
+        player.seek(-5)
+        assert player.tick == player.first_tick
+        _assert_matches(player, expected)
+    finally:
+        player.close()
@@ -0,0 +1,136 @@
+# tests/test_spatial.py
+
+import math
+import numpy as np
+import pytest
+from settings import RADIUS_SEL, RADIUS_RUMPUT
+from src.utils import spatial
+from src.utils.spatial import SpatialHash, GrassIndex
+
+WIDTH, HEIGHT = 400, 300
+
+def _points(seed, count):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, WIDTH, count), rng.uniform(0, HEIGHT, count)
+
+def _brute_force(xs, ys, x, y, radius, skip=()):
+    return sorted(i for i in range(len(xs)) if i not in skip and math.hypot(x - xs[i], y - ys[i]) < radius)
+
+def test_discard_hides_point_from_queries_and_counts():
+    xs, ys = _points(4, 200)
+    grid = SpatialHash(20, WIDTH, HEIGHT)
+    grid.rebuild(xs, ys)
+    removed = {3, 17, 150}
+    for index in removed:
+        grid.discard(index)
+        grid.discard(index)
+
+    for x, y in zip(*_points(5, 30)):
+        assert sorted(grid.query(x, y, 20)) == _brute_force(xs, ys, x, y, 20, removed)
+    queries, found = grid.query_pairs(xs, ys, 20)
+    assert not set(found.tolist()) & removed
+
+    keys = grid.keys_at(xs, ys)
+    expected = np.array([sum(1 for j in range(len(xs)) if j not in removed and keys[j] == key) for key in keys])
+    np.testing.assert_array_equal(grid.counts_in(keys), expected)
+
+    grid.rebuild(xs, ys)
+    assert grid.counts_in(keys).sum() == sum(np.sum(keys == key) for key in keys)
+
+class _Grass:
+    """Pengganti Grass: GrassIndex hanya membaca x, y, dan radius."""
+    def __init__(self, x, y, radius):
+        self.x, self.y, self.radius = x, y, radius
+
+def _queries(seed, count):
+    # Termasuk titik tepat di tepi dan di luar dunia
+    xs, ys = _points(seed, count)
+    return (np.concatenate((xs, [0, WIDTH, -15, WIDTH + 15, 200])),
+            np.concatenate((ys, [0, HEIGHT, -15, 150, HEIGHT + 15])))
+
+@pytest.fixture(params=['dense', 'sparse'])
+def grid_mode(request, monkeypatch):
+    if request.param == 'sparse':
+        monkeypatch.setattr(spatial, 'MAX_DENSE_BINS', 0)
+    return request.param
+
+def test_queries_match_brute_force(grid_mode):
+    xs, ys = _points(1, 300)
+    xs[:2], ys[:2] = (0, WIDTH), (HEIGHT, 0)
+    grid = SpatialHash(25, WIDTH, HEIGHT)
+    assert grid.dense == (grid_mode == 'dense')
+    grid.rebuild(xs, ys, items=[f'sel{i}' for i in range(len(xs))])
+
+    qx, qy = _queries(2, 60)
+    pair_queries, found = grid.query_pairs(qx, qy, 25)
+    pairs = sorted(zip(pair_queries.tolist(), found.tolist()))
+    expected = sorted((q, i) for q in range(len(qx)) for i in _brute_force(xs, ys, qx[q], qy[q], 25))
+    assert pairs == expected
+    for q in range(len(qx)):
+        assert sorted(grid.query(qx[q], qy[q], 25)) == sorted(f'sel{i}' for i in _brute_force(xs, ys, qx[q], qy[q], 25))
+
+    keys = grid.keys_at(qx, qy)
+    point_keys = grid.keys_at(xs, ys)
+    expected_counts = [0 if key < 0 else int(np.sum(point_keys == key)) for key in keys]
+    np.testing.assert_array_equal(grid.counts_in(keys), expected_counts)
+
+def test_empty_grid_returns_nothing(grid_mode):
+    grid = SpatialHash(25, WIDTH, HEIGHT)
+    grid.rebuild([], [])
+    queries, found = grid.query_pairs([10.0], [10.0], 25)
+    assert len(queries) == len(found) == 0
+    assert grid.query(10.0, 10.0, 25) == []
+    np.testing.assert_array_equal(grid.counts_in(grid.keys_at([10.0], [10.0])), [0])
+
+def _grass_index(seed, count, expected_count):
+    rng = np.random.default_rng(seed)
+    index = GrassIndex(expected_count=expected_count, width=WIDTH, height=HEIGHT)
+    for x, y, r in zip(rng.uniform(0, WIDTH, count), rng.uniform(0, HEIGHT, count), rng.uniform(2, RADIUS_RUMPUT, count)):
+        index.add(_Grass(x, y, r))
+    # Kosongkan sebagian slot, ganti sebagian, lalu isi lagi satu slot kosong
+    for slot in range(0, count, 5):
+        index.remove(index.patches[slot])
+    for slot in range(1, count, 7):
+        if index.patches[slot] is not None:
+            index.replace(index.patches[slot], _Grass(*rng.uniform(0, HEIGHT, 2), RADIUS_RUMPUT))
+    index.place(10, _Grass(WIDTH, HEIGHT, RADIUS_RUMPUT))
+    return index
+
+def _live(index):
+    return [(slot, grass) for slot, grass in enumerate(index.patches) if grass is not None]
+
+@pytest.mark.parametrize('expected_count', [80, 10])
+def test_grass_index_matches_brute_force(expected_count):
+    # expected_count 10 memaksa pembagian ulang petak saat rumput ditambahkan
+    index = _grass_index(3, 80, expected_count)
+    live = _live(index)
+    assert len(index) == len(live) == len(list(index))
+    qx, qy = _queries(4, 80)
+
+    nearest = index.nearest_slots(qx, qy)
+    for q, slot in enumerate(nearest.tolist()):
+        distances = [math.hypot(g.x - qx[q], g.y - qy[q]) for _, g in live]
+        best = live[int(np.argmin(distances))]
+        assert slot == best[0]
+        assert index.nearest(qx[q], qy[q]) is best[1]
+
+    rows, slots = index.overlap_pairs(qx, qy, RADIUS_SEL)
+    expected = sorted((q, slot) for q in range(len(qx)) for slot, g in live
+                      if math.hypot(g.x - qx[q], g.y - qy[q]) < RADIUS_SEL + g.radius)
+    assert sorted(zip(rows.tolist(), slots.tolist())) == expected
+    for q in range(len(qx)):
+        touching = {slot for row, slot in expected if row == q}
+        grass = index.first_overlapping(qx[q], qy[q], RADIUS_SEL)
+        assert (grass is None) if not touching else index.patches.index(grass) in touching
+
+def test_grass_index_without_grass():
+    index = GrassIndex(expected_count=10, width=WIDTH, height=HEIGHT)
+    grass = _Grass(50.0, 50.0, RADIUS_RUMPUT)
+    index.add(grass)
+    assert index.remove(grass) == 0 and not index
+    np.testing.assert_array_equal(index.nearest_slots([50.0], [50.0]), [-1])
+    assert index.nearest(50.0, 50.0) is None
+    assert len(index.overlap_pairs([50.0], [50.0], RADIUS_SEL)[0]) == 0
+    index.place(0, grass)
+    with pytest.raises(ValueError):
+        index.place(0, _Grass(60.0, 60.0, RADIUS_RUMPUT))
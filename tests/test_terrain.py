@@ -0,0 +1,11 @@
+# tests/test_terrain.py
+
+import numpy as np
+from terrain import ChunkedTerrain
+
+def test_chunked_terrain_keeps_explicit_seed_zero():
+    first = ChunkedTerrain(512, 384, seed=0, headless=True, use_cache=False)
+    second = ChunkedTerrain(512, 384, seed=0, headless=True, use_cache=False)
+    assert first.seed == 0
+    xs, ys = np.meshgrid(np.arange(0, 512, 7), np.arange(0, 384, 7))
+    np.testing.assert_array_equal(first.get_biome_ids(xs, ys), second.get_biome_ids(xs, ys))
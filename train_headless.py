@@ -0,0 +1,96 @@
+# train_headless.py
+
+import argparse
+import sys
+import os
+
+# Sama seperti main.py: pastikan impor 'from src...' berfungsi
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from settings import LEBAR_DUNIA, TINGGI_DUNIA, BRAIN_FILE, JUMLAH_SEL_AWAL, AUTOSAVE_SETIAP_GENERASI, AUTOSAVE_SETIAP_DETIK, \
+    CATAT_METRIK, METRICS_FILE
+from terrain import create_terrain
+from src.simulation.headless import HeadlessTrainer
+from src.simulation.parallel import ParallelTrainer
+from src.simulation.islands import IslandTrainer
+from src.utils.profiler import PROFILER
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Latihan evolusi sel tanpa jendela (headless) dan tanpa batas frame rate.")
+    parser.add_argument("--generations", type=int, default=0, help="Jumlah generasi yang dilatih (0 = tanpa batas, hentikan dengan Ctrl+C).")
+    parser.add_argument("--continue", dest="resume", action="store_true", help="Lanjutkan latihan dari file otak yang tersimpan.")
+    parser.add_argument("--save-every", type=int, default=AUTOSAVE_SETIAP_GENERASI, help="Simpan checkpoint otak setiap N generasi (0 = nonaktif).")
+    parser.add_argument("--save-seconds", type=float, default=AUTOSAVE_SETIAP_DETIK, help="Simpan checkpoint otak setiap T detik (0 = nonaktif). Checkpoint selalu disimpan di akhir.")
+    parser.add_argument("--log-every", type=int, default=1, help="Cetak kecepatan latihan setiap N generasi.")
+    parser.add_argument("--brain-file", default=BRAIN_FILE, help="Lokasi file checkpoint otak.")
+    parser.add_argument("--workers", type=int, default=0, help="Evaluasi paralel dengan N proses worker (0 = satu proses).")
+    parser.add_argument("--population", type=int, default=JUMLAH_SEL_AWAL, help="Ukuran populasi total untuk mode paralel/pulau.")
+    parser.add_argument("--world-seed", type=int, default=None, help="Mode paralel/pulau: worker/pulau ke-i memakai dunia dari seed+i (default: dunia tersimpan).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed generator acak evolusi agar latihan bisa diulang.")
+    parser.add_argument("--islands", type=int, default=0, help="Evolusi model pulau dengan K subpopulasi (0 = nonaktif).")
+    parser.add_argument("--migration-interval", type=int, default=5, help="Mode pulau: migrasi setiap M generasi.")
+    parser.add_argument("--migrants", type=int, default=2, help="Mode pulau: jumlah otak terbaik yang bermigrasi per pulau.")
+    parser.add_argument("--record", default=None, metavar="FILE", help="Rekam replay setiap tick ke FILE (hanya latihan satu proses).")
+    parser.add_argument("--metrics", default=METRICS_FILE if CATAT_METRIK else None, metavar="FILE",
+                        help="Tambahkan metrik keragaman genom & spesies setiap generasi ke FILE (JSON Lines).")
+    parser.add_argument("--profile", default=None, metavar="FILE", help="Tulis waktu setiap fase setiap tick ke FILE (CSV) dan cetak p50/p95/p99 di akhir (hanya latihan satu proses).")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.record and (args.islands > 0 or args.workers > 0):
+        print("Info: --record hanya berlaku untuk latihan satu proses; tidak ada replay yang direkam.")
+    if args.profile and (args.islands > 0 or args.workers > 0):
+        print("Info: --profile hanya berlaku untuk latihan satu proses; tidak ada profil yang direkam.")
+    if args.islands > 0:
+        trainer = IslandTrainer(population_size=args.population,
+                                islands=args.islands,
+                                migration_interval=args.migration_interval,
+                                migrants=args.migrants,
+                                workers=args.workers or None,
+                                world_seed=args.world_seed,
+                                start_from_scratch=not args.resume,
+                                save_every=args.save_every,
+                                save_seconds=args.save_seconds,
+                                log_every=args.log_every,
+                                brain_file=args.brain_file,
+                                seed=args.seed,
+                                metrics_file=args.metrics)
+        trainer.run(max_generations=args.generations)
+        return
+
+    if args.workers > 0:
+        trainer = ParallelTrainer(population_size=args.population,
+                                  workers=args.workers,
+                                  world_seed=args.world_seed,
+                                  start_from_scratch=not args.resume,
+                                  save_every=args.save_every,
+                                  save_seconds=args.save_seconds,
+                                  log_every=args.log_every,
+                                  brain_file=args.brain_file,
+                                  seed=args.seed,
+                                  metrics_file=args.metrics)
+        trainer.run(max_generations=args.generations)
+        return
+
+    terrain = create_terrain(LEBAR_DUNIA, TINGGI_DUNIA, headless=True)
+    trainer = HeadlessTrainer(terrain,
+                              start_from_scratch=not args.resume,
+                              save_every=args.save_every,
+                              save_seconds=args.save_seconds,
+                              log_every=args.log_every,
+                              brain_file=args.brain_file,
+                              seed=args.seed,
+                              record_file=args.record,
+                              metrics_file=args.metrics)
+    if args.profile:
+        PROFILER.start_trace(args.profile)
+    try:
+        trainer.run(max_generations=args.generations)
+    finally:
+        if args.profile:
+            PROFILER.stop_trace()
+            PROFILER.print_summary()
+
+if __name__ == "__main__":
+    main()